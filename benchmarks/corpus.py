@@ -0,0 +1,84 @@
+"""Synthetic fixture corpus for the audio benchmarks.
+
+Clips are speech-like (a gliding harmonic voice chopped into syllables, with
+leading/trailing silence and a low noise floor) so VAD and the codecs behave
+roughly as they do on real recordings. They are generated on demand into
+benchmarks/corpus/, which is not committed.
+"""
+import io
+import os
+import wave
+
+import numpy as np
+from pydub import AudioSegment
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+
+SAMPLE_RATE = 16000
+CLIP_SECONDS = {"short": 1.5, "medium": 5, "long": 15, "max": 60}
+SILENCE_SECONDS = 0.5
+
+# how the clients upload: web records webm/opus, the apps record m4a/aac
+UPLOAD_EXPORT_ARGS = {
+    "webm": {"format": "webm", "codec": "libopus"},
+    "m4a": {"format": "ipod", "codec": "aac"},
+}
+
+
+def synthesize_speech(seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    f0 = 160 + 40 * np.sin(2 * np.pi * 0.7 * t + rng.uniform(0, np.pi))
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 0.5
+    signal = 0.3 * voice * syllables
+    silence = np.zeros(int(SILENCE_SECONDS * SAMPLE_RATE))
+    signal = np.concatenate([silence, signal, silence])
+    signal += rng.normal(0, 0.002, len(signal))
+    return (np.clip(signal, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def wav_bytes(pcm):
+    output_io = io.BytesIO()
+    with wave.open(output_io, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm)
+    return output_io.getvalue()
+
+
+def clip_path(name, extension):
+    return os.path.join(CORPUS_DIR, f"{name}.{extension}")
+
+
+def generate(force=False):
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    for seed, (name, seconds) in enumerate(CLIP_SECONDS.items()):
+        if not force and all(os.path.exists(clip_path(name, ext)) for ext in ["wav", *UPLOAD_EXPORT_ARGS]):
+            continue
+        pcm = synthesize_speech(seconds, seed)
+        with open(clip_path(name, "wav"), "wb") as f:
+            f.write(wav_bytes(pcm))
+        segment = AudioSegment(data=pcm, sample_width=2, frame_rate=SAMPLE_RATE, channels=1)
+        for extension, export_args in UPLOAD_EXPORT_ARGS.items():
+            segment.export(clip_path(name, extension), **export_args)
+
+
+def read_clip(name, extension):
+    with open(clip_path(name, extension), "rb") as f:
+        return f.read()
+
+
+def read_pcm(name):
+    with wave.open(clip_path(name, "wav"), "rb") as f:
+        return f.readframes(f.getnframes())
+
+
+def clip_seconds(name):
+    return CLIP_SECONDS[name] + 2 * SILENCE_SECONDS
+
+
+if __name__ == "__main__":
+    generate(force=True)
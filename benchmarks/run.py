@@ -0,0 +1,154 @@
+"""Run the audio-pipeline benchmarks.
+
+    python -m benchmarks.run                      # all stages, all clips
+    python -m benchmarks.run --save-baseline      # record benchmarks/results/baseline.json
+    python -m benchmarks.run --compare            # fail if p50 or peak RSS regress
+
+Every stage x clip runs in a fresh child process so its peak RSS is its own.
+Timings only compare on the same machine, so baselines are per-machine and
+kept out of git (benchmarks/results/ is ignored): record one on the branch
+point with --save-baseline, then --compare on the change. Without a
+baseline --compare reports nothing and exits 0.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import traceback
+from datetime import datetime
+
+from benchmarks import corpus
+from benchmarks.stages import STAGES
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_OUTPUT = os.path.join(RESULTS_DIR, "latest.json")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_stage(stage_name, clip_name, repeat, conn):
+    try:
+        setup, run = STAGES[stage_name]
+        payload = setup(clip_name)
+        run(payload)  # warm up imports and codec initialisation
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(payload)
+            timings.append(time.perf_counter() - start)
+        conn.send({"timings": timings, "peak_rss_mb": _peak_rss_mb()})
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()})
+    finally:
+        conn.close()
+
+
+def measure(stage_name, clip_name, repeat):
+    context = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_run_stage, args=(stage_name, clip_name, repeat, child_conn))
+    process.start()
+    child_conn.close()
+    try:
+        result = parent_conn.recv()
+    except EOFError:
+        result = {"error": f"child exited with code {process.exitcode}"}
+    process.join()
+    if "error" in result:
+        return result
+    timings = sorted(result["timings"])
+    audio_seconds = corpus.clip_seconds(clip_name)
+    p50 = statistics.median(timings)
+    return {
+        "audio_seconds": audio_seconds,
+        "repeat": repeat,
+        "mean": statistics.fmean(timings),
+        "p50": p50,
+        "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "min": timings[0],
+        # seconds of audio processed per wall-clock second
+        "throughput": audio_seconds / p50 if p50 > 0 else float("inf"),
+        "peak_rss_mb": result["peak_rss_mb"],
+    }
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous or "error" in current or "error" in previous:
+            continue
+        for metric in ["p50", "peak_rss_mb"]:
+            if previous[metric] > 0 and current[metric] > previous[metric] * (1 + threshold):
+                regressions.append(f"{key} {metric}: {previous[metric]:.4f} -> {current[metric]:.4f}")
+    return regressions
+
+
+def print_table(results):
+    print(f"{'stage/clip':<34s} {'p50 ms':>9s} {'p95 ms':>9s} {'x realtime':>11s} {'rss MB':>8s}")
+    for key, result in results.items():
+        if "error" in result:
+            print(f"{key:<34s} ERROR {result['error']}")
+            continue
+        print(
+            f"{key:<34s} {result['p50'] * 1000:9.2f} {result['p95'] * 1000:9.2f} "
+            f"{result['throughput']:11.1f} {result['peak_rss_mb']:8.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stages", nargs="*", default=list(STAGES), choices=list(STAGES))
+    parser.add_argument("--clips", nargs="*", default=list(corpus.CLIP_SECONDS), choices=list(corpus.CLIP_SECONDS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--regenerate-corpus", action="store_true")
+    args = parser.parse_args()
+
+    corpus.generate(force=args.regenerate_corpus)
+    results = {}
+    for stage_name in args.stages:
+        for clip_name in args.clips:
+            results[f"{stage_name}/{clip_name}"] = measure(stage_name, clip_name, args.repeat)
+    print_table(results)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    for path in [args.output] + ([args.baseline] if args.save_baseline else []):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}, nothing to compare; record one on this machine with --save-baseline")
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
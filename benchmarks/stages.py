@@ -0,0 +1,101 @@
+"""Benchmark stages of the audio path.
+
+Each stage is `setup(clip_name) -> payload` plus `run(payload)`; only `run`
+is timed. Imports happen inside the stage so one missing backend only fails
+its own stages.
+"""
+import asyncio
+import io
+
+from benchmarks import corpus
+
+STREAM_CHUNK_SIZE = 4096
+
+
+def _pcm_audio(clip_name):
+    from echo_journey.audio.pcm_audio import PcmAudio
+
+    return PcmAudio(corpus.read_pcm(clip_name))
+
+
+def decode_webm_setup(clip_name):
+    return corpus.read_clip(clip_name, "webm")
+
+
+def decode_webm(audio_bytes):
+    from echo_journey.audio.pcm_audio import PcmAudio
+
+    PcmAudio.decode(audio_bytes, "web")
+
+
+def decode_m4a_setup(clip_name):
+    return corpus.read_clip(clip_name, "m4a")
+
+
+def decode_m4a(audio_bytes):
+    from echo_journey.audio.pcm_audio import PcmAudio
+
+    PcmAudio.decode(audio_bytes, "ios")
+
+
+def stream_decode_webm(audio_bytes):
+    from echo_journey.audio.streaming import PcmRingBuffer, StreamingUtterance
+
+    async def upload():
+        utterance = StreamingUtterance("web", PcmRingBuffer())
+        for start in range(0, len(audio_bytes), STREAM_CHUNK_SIZE):
+            await utterance.feed(audio_bytes[start:start + STREAM_CHUNK_SIZE])
+        await utterance.finish()
+
+    asyncio.run(upload())
+
+
+def vad_trim(audio):
+    from echo_journey.audio.vad import trim_silence
+
+    trim_silence(audio)
+
+
+def wav_upload_body(audio):
+    # what the ASR backends stream into the multipart request
+    stream = audio.wav_stream()
+    while stream.read(64 * 1024):
+        pass
+
+
+def tts_wav_setup(clip_name):
+    return corpus.read_clip(clip_name, "wav")
+
+
+def _tts_encode(platform, opus_bitrate=None):
+    def run(wav_bytes):
+        from echo_journey.audio.text_to_speech.encoding import encode_for_platform
+
+        encode_for_platform(wav_bytes, platform, opus_bitrate)
+
+    return run
+
+
+def _archive_export(archive_format):
+    def run(audio):
+        from echo_journey.audio.archiver import FORMAT_TO_EXPORT_ARGS
+
+        audio.to_audio_segment().export(io.BytesIO(), **FORMAT_TO_EXPORT_ARGS[archive_format])
+
+    return run
+
+
+STAGES = {
+    "decode_webm": (decode_webm_setup, decode_webm),
+    "decode_m4a": (decode_m4a_setup, decode_m4a),
+    "stream_decode_webm": (decode_webm_setup, stream_decode_webm),
+    "vad_trim": (_pcm_audio, vad_trim),
+    "wav_upload_body": (_pcm_audio, wav_upload_body),
+    "tts_encode_webm": (tts_wav_setup, _tts_encode("web")),
+    "tts_encode_m4a": (tts_wav_setup, _tts_encode("ios")),
+    "tts_encode_wav": (tts_wav_setup, _tts_encode("web-ios")),
+    "tts_encode_opus_16k": (tts_wav_setup, _tts_encode("web", 16)),
+    "tts_encode_opus_24k": (tts_wav_setup, _tts_encode("web", 24)),
+    "archive_flac": (_pcm_audio, _archive_export("flac")),
+    "archive_opus": (_pcm_audio, _archive_export("opus")),
+}
@@ -1,25 +1,67 @@
 import logging
+import os
+import types
+import uuid
 
 from echo_journey.api.proto.downward_message_wrapper import (
     wrap_downward_message,
 )
-from echo_journey.api.proto.downward_pb2 import SentenceCorrectMessage, TutorMessage, WordCorrectMessage
+from echo_journey.api.proto.downward_pb2 import (
+    SentenceCorrectMessage,
+    TutorAudioMessage,
+    TutorMessage,
+    TutorPartialTextMessage,
+    TutorSpeechMessage,
+    WordCorrectMessage,
+)
+from echo_journey.audio.text_to_speech.encoding import get_output_format, negotiate_opus_bitrate
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
 
 logger = logging.getLogger(__name__)
 
+config = types.SimpleNamespace(
+    **{
+        # 0 sends the audio of a text-first TutorMessage in one TutorAudioMessage
+        "audio_chunk_bytes": int(os.getenv("TUTOR_AUDIO_CHUNK_BYTES", "16384")),
+    }
+)
+
+
+def _add_timeline(timeline_messages, timeline):
+    for item in timeline:
+        timeline_message = timeline_messages.add()
+        timeline_message.text = item.text
+        timeline_message.start_time = int(item.start_time)
+        timeline_message.end_time = int(item.end_time)
+
 
 class DownwardProtocolHandler:
 
-    def __init__(self, websocket, manager):
+    def __init__(self, websocket, manager, stream_speech=False, opus_bitrate=None, text_first=False, stream_text=False):
         self.websocket = websocket
         self.manager = manager
+        # clients that opt in get the teacher's reply spoken sentence by sentence
+        self.stream_speech = stream_speech
+        # clients that opt in get TutorMessage text before its audio is synthesized
+        self.text_first = text_first
+        # clients that opt in see the teacher text grow while the reply is generated
+        self.stream_text = stream_text
+        # kbps of Ogg Opus TTS audio the client asked for, None keeps the platform default
+        self.opus_bitrate = negotiate_opus_bitrate(opus_bitrate)
 
+    def output_format(self, platform):
+        return get_output_format(platform, self.opus_bitrate)
 
     @staticmethod
     def build_tutor_message(
         text,
         expected_messages = None,
         audio_bytes = None,
+        timeline = None,
+        audio_format = None,
+        message_id = None,
+        audio_pending = False,
     ):
         teacher_message = TutorMessage()
         teacher_message.text = text
@@ -27,14 +69,111 @@ class DownwardProtocolHandler:
             teacher_message.expected_messages.extend(expected_messages)
         if audio_bytes:
             teacher_message.audio = audio_bytes
+            if audio_format:
+                teacher_message.audio_format = audio_format
+        if timeline:
+            _add_timeline(teacher_message.timeline, timeline)
+        if message_id:
+            teacher_message.message_id = message_id
+        teacher_message.audio_pending = audio_pending
         return teacher_message
 
-    async def send_tutor_message(self, text, expected_messages = None, audio_bytes = None):
-        tutor_msg = self.build_tutor_message(text, expected_messages, audio_bytes)
+    async def send_tutor_message(self, text, expected_messages = None, audio_bytes = None, timeline = None, audio_format = None, message_id = None):
+        tutor_msg = self.build_tutor_message(text, expected_messages, audio_bytes, timeline, audio_format, message_id)
         await self.send_websocket_downward_message(
             wrap_downward_message(tutor_msg)
         )
         
+    async def send_tutor_message_with_speech(self, text, expected_messages, speech_task, audio_format = None, message_id = None):
+        """Send a TutorMessage whose audio is still being synthesized by `speech_task`.
+
+        In text-first mode the text goes out at once and the audio follows as
+        TutorAudioMessages; otherwise the task is awaited and sent bundled.
+        """
+        if not self.text_first:
+            speech = await speech_task
+            await self.send_tutor_message(text, expected_messages, speech.audio, speech.timeline, audio_format, message_id)
+            return
+        message_id = message_id or uuid.uuid4().hex
+        tutor_msg = self.build_tutor_message(text, expected_messages, message_id=message_id, audio_pending=True)
+        await self.send_websocket_downward_message(wrap_downward_message(tutor_msg))
+        try:
+            speech = await speech_task
+        except Exception as e:
+            # the text is already shown, tell the client to stop waiting for audio
+            logger.error(f"Error occur when synthesizing audio of tutor message {message_id} : {e}")
+            await self.send_tutor_audio_message(message_id, 0, None, is_last=True)
+            return
+        await self.send_tutor_audio(message_id, speech.audio, speech.timeline, audio_format)
+
+    @staticmethod
+    def build_tutor_audio_message(message_id, chunk_index, audio_bytes=None, is_last=False, audio_format=None, timeline=None):
+        audio_message = TutorAudioMessage()
+        audio_message.message_id = message_id
+        audio_message.chunk_index = chunk_index
+        if audio_bytes:
+            audio_message.audio = audio_bytes
+        audio_message.is_last = is_last
+        if audio_format:
+            audio_message.audio_format = audio_format
+        if timeline:
+            _add_timeline(audio_message.timeline, timeline)
+        return audio_message
+
+    async def send_tutor_audio_message(self, message_id, chunk_index, audio_bytes=None, is_last=False, audio_format=None, timeline=None):
+        audio_msg = self.build_tutor_audio_message(message_id, chunk_index, audio_bytes, is_last, audio_format, timeline)
+        await self.send_websocket_downward_message(
+            wrap_downward_message(audio_msg)
+        )
+
+    async def send_tutor_audio(self, message_id, audio_bytes, timeline = None, audio_format = None):
+        chunk_size = config.audio_chunk_bytes or len(audio_bytes) or 1
+        offsets = list(range(0, len(audio_bytes or b""), chunk_size)) or [0]
+        for chunk_index, offset in enumerate(offsets):
+            # format and timeline ride on the first chunk so playback set-up can start early
+            await self.send_tutor_audio_message(
+                message_id,
+                chunk_index,
+                audio_bytes[offset:offset + chunk_size] if audio_bytes else None,
+                is_last=chunk_index == len(offsets) - 1,
+                audio_format=audio_format if chunk_index == 0 else None,
+                timeline=timeline if chunk_index == 0 else None,
+            )
+
+    @staticmethod
+    def build_tutor_partial_text_message(message_id, index, text, is_last=False):
+        partial_text_message = TutorPartialTextMessage()
+        partial_text_message.message_id = message_id
+        partial_text_message.index = index
+        partial_text_message.text = text
+        partial_text_message.is_last = is_last
+        return partial_text_message
+
+    async def send_tutor_partial_text_message(self, message_id, index, text, is_last=False):
+        partial_text_msg = self.build_tutor_partial_text_message(message_id, index, text, is_last)
+        await self.send_websocket_downward_message(
+            wrap_downward_message(partial_text_msg)
+        )
+
+    @staticmethod
+    def build_tutor_speech_message(message_id, index, text, audio_bytes=None, is_last=False, audio_format=None):
+        speech_message = TutorSpeechMessage()
+        speech_message.message_id = message_id
+        speech_message.index = index
+        speech_message.text = text
+        if audio_bytes:
+            speech_message.audio = audio_bytes
+            if audio_format:
+                speech_message.audio_format = audio_format
+        speech_message.is_last = is_last
+        return speech_message
+
+    async def send_tutor_speech_message(self, message_id, index, text, audio_bytes=None, is_last=False, audio_format=None):
+        speech_msg = self.build_tutor_speech_message(message_id, index, text, audio_bytes, is_last, audio_format)
+        await self.send_websocket_downward_message(
+            wrap_downward_message(speech_msg)
+        )
+
     @staticmethod
     def build_sentence_correct_message(
         suggestions,
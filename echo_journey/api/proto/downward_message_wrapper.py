@@ -2,14 +2,20 @@ from echo_journey.api.proto.downward_pb2 import (
     DownwardMessageType,
     DownwardMessage,
     SentenceCorrectMessage,
+    TutorAudioMessage,
     TutorMessage,
+    TutorPartialTextMessage,
+    TutorSpeechMessage,
     WordCorrectMessage,
 )
 
 message_type_to_class = {
     DownwardMessageType.TUTOR_MESSAGE: TutorMessage,
     DownwardMessageType.WORD_CORRECT_MESSAGE: WordCorrectMessage,
-    DownwardMessageType.SENTENCE_CORRECT_MESSAGE: SentenceCorrectMessage
+    DownwardMessageType.SENTENCE_CORRECT_MESSAGE: SentenceCorrectMessage,
+    DownwardMessageType.TUTOR_SPEECH_MESSAGE: TutorSpeechMessage,
+    DownwardMessageType.TUTOR_AUDIO_MESSAGE: TutorAudioMessage,
+    DownwardMessageType.TUTOR_PARTIAL_TEXT_MESSAGE: TutorPartialTextMessage,
 
 }
 
@@ -12,10 +12,16 @@ class DownwardMessageType(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
     TUTOR_MESSAGE: _ClassVar[DownwardMessageType]
     WORD_CORRECT_MESSAGE: _ClassVar[DownwardMessageType]
     SENTENCE_CORRECT_MESSAGE: _ClassVar[DownwardMessageType]
+    TUTOR_SPEECH_MESSAGE: _ClassVar[DownwardMessageType]
+    TUTOR_AUDIO_MESSAGE: _ClassVar[DownwardMessageType]
+    TUTOR_PARTIAL_TEXT_MESSAGE: _ClassVar[DownwardMessageType]
 UNKNOWN: DownwardMessageType
 TUTOR_MESSAGE: DownwardMessageType
 WORD_CORRECT_MESSAGE: DownwardMessageType
 SENTENCE_CORRECT_MESSAGE: DownwardMessageType
+TUTOR_SPEECH_MESSAGE: DownwardMessageType
+TUTOR_AUDIO_MESSAGE: DownwardMessageType
+TUTOR_PARTIAL_TEXT_MESSAGE: DownwardMessageType
 
 class DownwardMessage(_message.Message):
     __slots__ = ("type", "payload")
@@ -26,14 +32,76 @@ class DownwardMessage(_message.Message):
     def __init__(self, type: _Optional[_Union[DownwardMessageType, str]] = ..., payload: _Optional[bytes] = ...) -> None: ...
 
 class TutorMessage(_message.Message):
-    __slots__ = ("text", "expected_messages", "audio")
+    __slots__ = ("text", "expected_messages", "audio", "timeline", "audio_format", "message_id", "audio_pending")
     TEXT_FIELD_NUMBER: _ClassVar[int]
     EXPECTED_MESSAGES_FIELD_NUMBER: _ClassVar[int]
     AUDIO_FIELD_NUMBER: _ClassVar[int]
+    TIMELINE_FIELD_NUMBER: _ClassVar[int]
+    AUDIO_FORMAT_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_ID_FIELD_NUMBER: _ClassVar[int]
+    AUDIO_PENDING_FIELD_NUMBER: _ClassVar[int]
     text: str
     expected_messages: _containers.RepeatedCompositeFieldContainer[WordCorrectMessage]
     audio: bytes
-    def __init__(self, text: _Optional[str] = ..., expected_messages: _Optional[_Iterable[_Union[WordCorrectMessage, _Mapping]]] = ..., audio: _Optional[bytes] = ...) -> None: ...
+    timeline: _containers.RepeatedCompositeFieldContainer[AudioTimelineMessage]
+    audio_format: str
+    message_id: str
+    audio_pending: bool
+    def __init__(self, text: _Optional[str] = ..., expected_messages: _Optional[_Iterable[_Union[WordCorrectMessage, _Mapping]]] = ..., audio: _Optional[bytes] = ..., timeline: _Optional[_Iterable[_Union[AudioTimelineMessage, _Mapping]]] = ..., audio_format: _Optional[str] = ..., message_id: _Optional[str] = ..., audio_pending: bool = ...) -> None: ...
+
+class TutorPartialTextMessage(_message.Message):
+    __slots__ = ("message_id", "index", "text", "is_last")
+    MESSAGE_ID_FIELD_NUMBER: _ClassVar[int]
+    INDEX_FIELD_NUMBER: _ClassVar[int]
+    TEXT_FIELD_NUMBER: _ClassVar[int]
+    IS_LAST_FIELD_NUMBER: _ClassVar[int]
+    message_id: str
+    index: int
+    text: str
+    is_last: bool
+    def __init__(self, message_id: _Optional[str] = ..., index: _Optional[int] = ..., text: _Optional[str] = ..., is_last: bool = ...) -> None: ...
+
+class TutorAudioMessage(_message.Message):
+    __slots__ = ("message_id", "chunk_index", "audio", "is_last", "audio_format", "timeline")
+    MESSAGE_ID_FIELD_NUMBER: _ClassVar[int]
+    CHUNK_INDEX_FIELD_NUMBER: _ClassVar[int]
+    AUDIO_FIELD_NUMBER: _ClassVar[int]
+    IS_LAST_FIELD_NUMBER: _ClassVar[int]
+    AUDIO_FORMAT_FIELD_NUMBER: _ClassVar[int]
+    TIMELINE_FIELD_NUMBER: _ClassVar[int]
+    message_id: str
+    chunk_index: int
+    audio: bytes
+    is_last: bool
+    audio_format: str
+    timeline: _containers.RepeatedCompositeFieldContainer[AudioTimelineMessage]
+    def __init__(self, message_id: _Optional[str] = ..., chunk_index: _Optional[int] = ..., audio: _Optional[bytes] = ..., is_last: bool = ..., audio_format: _Optional[str] = ..., timeline: _Optional[_Iterable[_Union[AudioTimelineMessage, _Mapping]]] = ...) -> None: ...
+
+class AudioTimelineMessage(_message.Message):
+    __slots__ = ("text", "start_time", "end_time")
+    TEXT_FIELD_NUMBER: _ClassVar[int]
+    START_TIME_FIELD_NUMBER: _ClassVar[int]
+    END_TIME_FIELD_NUMBER: _ClassVar[int]
+    text: str
+    start_time: int
+    end_time: int
+    def __init__(self, text: _Optional[str] = ..., start_time: _Optional[int] = ..., end_time: _Optional[int] = ...) -> None: ...
+
+class TutorSpeechMessage(_message.Message):
+    __slots__ = ("message_id", "index", "text", "audio", "is_last", "audio_format")
+    MESSAGE_ID_FIELD_NUMBER: _ClassVar[int]
+    INDEX_FIELD_NUMBER: _ClassVar[int]
+    TEXT_FIELD_NUMBER: _ClassVar[int]
+    AUDIO_FIELD_NUMBER: _ClassVar[int]
+    IS_LAST_FIELD_NUMBER: _ClassVar[int]
+    AUDIO_FORMAT_FIELD_NUMBER: _ClassVar[int]
+    message_id: str
+    index: int
+    text: str
+    audio: bytes
+    is_last: bool
+    audio_format: str
+    def __init__(self, message_id: _Optional[str] = ..., index: _Optional[int] = ..., text: _Optional[str] = ..., audio: _Optional[bytes] = ..., is_last: bool = ..., audio_format: _Optional[str] = ...) -> None: ...
 
 class WordCorrectMessage(_message.Message):
     __slots__ = ("word", "initial_consonant", "vowels", "tone", "pinyin")
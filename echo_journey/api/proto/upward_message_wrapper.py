@@ -1,4 +1,5 @@
 from echo_journey.api.proto.upward_pb2 import (
+    AudioChunkMessage,
     AudioMessage,
     StudentMessage,
     UpwardMessageType,
@@ -8,6 +9,7 @@ from echo_journey.api.proto.upward_pb2 import (
 message_type_to_class = {
     UpwardMessageType.STUDENT_MESSAGE: StudentMessage,
     UpwardMessageType.AUDIO_MESSAGE: AudioMessage,
+    UpwardMessageType.AUDIO_CHUNK_MESSAGE: AudioChunkMessage,
 }
 
 class_to_message_type = {v: k for k, v in message_type_to_class.items()}
@@ -10,9 +10,11 @@ class UpwardMessageType(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
     UNKNOWN: _ClassVar[UpwardMessageType]
     STUDENT_MESSAGE: _ClassVar[UpwardMessageType]
     AUDIO_MESSAGE: _ClassVar[UpwardMessageType]
+    AUDIO_CHUNK_MESSAGE: _ClassVar[UpwardMessageType]
 UNKNOWN: UpwardMessageType
 STUDENT_MESSAGE: UpwardMessageType
 AUDIO_MESSAGE: UpwardMessageType
+AUDIO_CHUNK_MESSAGE: UpwardMessageType
 
 class UpwardMessage(_message.Message):
     __slots__ = ("type", "payload")
@@ -35,3 +37,15 @@ class AudioMessage(_message.Message):
     expected_sentence: str
     audio_data: bytes
     def __init__(self, expected_sentence: _Optional[str] = ..., audio_data: _Optional[bytes] = ...) -> None: ...
+
+class AudioChunkMessage(_message.Message):
+    __slots__ = ("expected_sentence", "audio_data", "sequence", "end_of_utterance")
+    EXPECTED_SENTENCE_FIELD_NUMBER: _ClassVar[int]
+    AUDIO_DATA_FIELD_NUMBER: _ClassVar[int]
+    SEQUENCE_FIELD_NUMBER: _ClassVar[int]
+    END_OF_UTTERANCE_FIELD_NUMBER: _ClassVar[int]
+    expected_sentence: str
+    audio_data: bytes
+    sequence: int
+    end_of_utterance: bool
+    def __init__(self, expected_sentence: _Optional[str] = ..., audio_data: _Optional[bytes] = ..., sequence: _Optional[int] = ..., end_of_utterance: bool = ...) -> None: ...
@@ -1,7 +1,13 @@
 import json
 
 from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from echo_journey.audio.pronunciation_assessment.policy import AssessmentPolicy
+from echo_journey.audio.speech_to_text.cache import AsrCache
+from echo_journey.audio.speech_to_text.hedge import AsrHedge
+from echo_journey.audio.text_to_speech.factory import report_tts
+from echo_journey.audio.transcode_pool import TranscodePool
 from echo_journey.common.utils import device_id_var
+from echo_journey.data.llms.response_cache import LlmResponseCache
 from echo_journey.data.learn_situation import HistoryLearnSituation
 
 router = APIRouter()
@@ -22,4 +28,17 @@ async def get_title(deviceId: str = Query(default=None)):
       "description": exercise_title_info,
       "scene": 'exercises',
       "update": should_update,
-    }]
\ No newline at end of file
+    }]
+
+
+@router.get("/stats")
+async def get_stats():
+    """Process-wide cache, hedging and assessment counters."""
+    return {
+        "asr_cache": AsrCache.get_instance().report(),
+        "asr_hedge": AsrHedge.get_instance().report(),
+        "assessment_policy": AssessmentPolicy.get_instance().report(),
+        "tts": report_tts(),
+        "transcode_pool": TranscodePool.get_instance().report(),
+        "llm_cache": LlmResponseCache.get_instance().report(),
+    }
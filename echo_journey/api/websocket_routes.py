@@ -3,7 +3,7 @@ from fastapi import APIRouter, Path, WebSocket, WebSocketDisconnect, Query
 
 from echo_journey.api.downward_protocol_handler import DownwardProtocolHandler
 from echo_journey.api.proto.upward_message_wrapper import unwrap_upward_message_from_bytes
-from echo_journey.api.proto.upward_pb2 import AudioMessage, StudentMessage
+from echo_journey.api.proto.upward_pb2 import AudioChunkMessage, AudioMessage, StudentMessage
 from echo_journey.common.utils import get_connection_manager
 from echo_journey.data.learn_situation import HistoryLearnSituation
 from echo_journey.services.exercise_service import ExerciseService
@@ -20,11 +20,15 @@ async def websocket_error_practise(
     session_id: str = Path(...),
     platform: str = Query(default="web"),
     deviceId: str = Query(default=None),
+    streamSpeech: bool = Query(default=False),
+    opusBitrate: int = Query(default=None),
+    textFirst: bool = Query(default=False),
+    streamText: bool = Query(default=False),
 ):
     session_id_var.set(session_id)
     device_id_var.set(deviceId)
     await manager.connect(websocket)
-    ws_msg_handler = DownwardProtocolHandler(websocket, manager)
+    ws_msg_handler = DownwardProtocolHandler(websocket, manager, stream_speech=streamSpeech, opus_bitrate=opusBitrate, text_first=textFirst, stream_text=streamText)
     exercise_service = ExerciseService(ws_msg_handler)
     await exercise_service.initialize(platform)
     HistoryLearnSituation().set_update_time()
@@ -37,12 +41,16 @@ async def websocket_error_practise(
                 await exercise_service.process_student_message(upward_message, platform)
             elif isinstance(upward_message, AudioMessage):
                 await exercise_service.process_audio_message(upward_message, platform)
+            elif isinstance(upward_message, AudioChunkMessage):
+                await exercise_service.process_audio_chunk(upward_message, platform)
             else:
                 raise ValueError(f"Unknown message type: {upward_message.type}")
     except WebSocketDisconnect:
+        exercise_service.on_ws_disconnect()
         await manager.disconnect(websocket)
     except Exception as e:
         logger.exception(f"Exercide Caught exception: {e}")
+        exercise_service.on_ws_disconnect()
         await manager.disconnect(websocket)
         
         
@@ -52,11 +60,15 @@ async def websocket_talk_practise(
     session_id: str = Path(...),
     platform: str = Query(default="web"),
     deviceId: str = Query(default=None),
+    streamSpeech: bool = Query(default=False),
+    opusBitrate: int = Query(default=None),
+    textFirst: bool = Query(default=False),
+    streamText: bool = Query(default=False),
 ):
     session_id_var.set(session_id)
     device_id_var.set(deviceId)
     await manager.connect(websocket)
-    ws_msg_handler = DownwardProtocolHandler(websocket, manager)
+    ws_msg_handler = DownwardProtocolHandler(websocket, manager, stream_speech=streamSpeech, opus_bitrate=opusBitrate, text_first=textFirst, stream_text=streamText)
     talk_practise_service = TalkPractiseService(ws_msg_handler)
     await talk_practise_service.initialize()
         
@@ -68,6 +80,8 @@ async def websocket_talk_practise(
                 await talk_practise_service.process_student_message(upward_message, platform)
             elif isinstance(upward_message, AudioMessage):
                 await talk_practise_service.process_audio_message(upward_message, platform)
+            elif isinstance(upward_message, AudioChunkMessage):
+                await talk_practise_service.process_audio_chunk(upward_message, platform)
             else:
                 raise ValueError(f"Unknown message type: {upward_message.type}")
     except WebSocketDisconnect:
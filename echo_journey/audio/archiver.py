@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import os
+import queue
+import threading
+import types
+
+from echo_journey.audio.pcm_audio import PcmAudio
+from echo_journey.common.utils import Singleton
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+config = types.SimpleNamespace(
+    **{
+        "enabled": os.getenv("ASR_ARCHIVE_ENABLED", "true").lower() == "true",
+        # wav keeps the asr_data layout readers expect; flac or opus trade CPU for disk
+        "format": os.getenv("ASR_ARCHIVE_FORMAT", "wav"),
+        "opus_bitrate": os.getenv("ASR_ARCHIVE_OPUS_BITRATE", "24k"),
+        "queue_size": int(os.getenv("ASR_ARCHIVE_QUEUE_SIZE", "64")),
+        "drop_on_overload": os.getenv("ASR_ARCHIVE_DROP_ON_OVERLOAD", "true").lower() == "true",
+        "max_bytes_per_dir": int(os.getenv("ASR_ARCHIVE_MAX_BYTES_PER_DIR", str(200 * 1024 * 1024))),
+    }
+)
+
+HASH_LENGTH = 12
+
+FORMAT_TO_EXPORT_ARGS = {
+    "flac": {"format": "flac"},
+    "opus": {"format": "ogg", "codec": "libopus", "bitrate": config.opus_bitrate},
+}
+
+FORMAT_TO_EXTENSION = {
+    "wav": "wav",
+    "flac": "flac",
+    "opus": "ogg",
+}
+
+
+class ArchiveJob:
+    def __init__(self, directory, name, audio: PcmAudio):
+        self.directory = directory
+        self.name = name
+        self.audio = audio
+
+
+class ArchiveDirectory:
+    """What the writer knows about one asr_data directory: content hashes and total size."""
+
+    def __init__(self, path):
+        self.path = path
+        self.hashes = set()
+        self.size = 0
+        for file_name in os.listdir(path):
+            file_hash = _hash_from_file_name(file_name)
+            if file_hash:
+                self.hashes.add(file_hash)
+            self.size += os.path.getsize(os.path.join(path, file_name))
+
+
+def _hash_from_file_name(file_name):
+    stem = os.path.splitext(file_name)[0]
+    candidate = stem.rsplit("_", 1)[-1]
+    if len(candidate) == HASH_LENGTH and all(c in "0123456789abcdef" for c in candidate):
+        return candidate
+    return None
+
+
+class AsrArchiver(Singleton):
+    """Write-behind storage for recognized utterances.
+
+    The request path only enqueues; one daemon thread encodes, deduplicates by
+    PCM content hash and enforces a per-directory size budget. When the queue
+    is full new recordings are dropped (or, with drop_on_overload off, the
+    caller waits in the executor for a free slot).
+    """
+
+    def __init__(self):
+        self.queue: queue.Queue = queue.Queue(maxsize=config.queue_size)
+        self.directories: dict[str, ArchiveDirectory] = {}
+        self.written = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.evicted = 0
+        self.thread = threading.Thread(target=self._run, name="asr-archiver", daemon=True)
+        self.thread.start()
+
+    async def submit(self, directory, name, audio: PcmAudio):
+        if not config.enabled:
+            return False
+        job = ArchiveJob(directory, name, audio)
+        try:
+            self.queue.put_nowait(job)
+            return True
+        except queue.Full:
+            if config.drop_on_overload:
+                self.dropped += 1
+                logger.warning(f"ASR archive queue full, dropped {name} ({self.dropped} dropped so far)")
+                return False
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.queue.put, job)
+        return True
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            try:
+                self._write(job)
+            except Exception as e:
+                logger.error(f"Error occur when AsrArchiver._write {job.name} : {e}")
+            finally:
+                self.queue.task_done()
+
+    def _get_directory(self, path) -> ArchiveDirectory:
+        if path not in self.directories:
+            os.makedirs(path, exist_ok=True)
+            self.directories[path] = ArchiveDirectory(path)
+        return self.directories[path]
+
+    def _write(self, job: ArchiveJob):
+        directory = self._get_directory(job.directory)
+        content_hash = job.audio.digest()[:HASH_LENGTH]
+        if content_hash in directory.hashes:
+            self.duplicates += 1
+            return
+        extension = FORMAT_TO_EXTENSION.get(config.format, "wav")
+        path = os.path.join(directory.path, f"{job.name}_{content_hash}.{extension}")
+        if config.format in FORMAT_TO_EXPORT_ARGS:
+            job.audio.to_audio_segment().export(path, **FORMAT_TO_EXPORT_ARGS[config.format])
+        else:
+            job.audio.write_wav(path)
+        directory.hashes.add(content_hash)
+        directory.size += os.path.getsize(path)
+        self.written += 1
+        self._enforce_retention(directory)
+
+    def _enforce_retention(self, directory: ArchiveDirectory):
+        if directory.size <= config.max_bytes_per_dir:
+            return
+        paths = [os.path.join(directory.path, file_name) for file_name in os.listdir(directory.path)]
+        paths.sort(key=os.path.getmtime)
+        for path in paths:
+            if directory.size <= config.max_bytes_per_dir:
+                break
+            size = os.path.getsize(path)
+            os.remove(path)
+            directory.size -= size
+            directory.hashes.discard(_hash_from_file_name(os.path.basename(path)))
+            self.evicted += 1
@@ -0,0 +1,154 @@
+import hashlib
+import io
+import logging
+import struct
+
+from pydub import AudioSegment
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+CHANNELS = 1
+
+PLATFORM_TO_INPUT_FORMAT = {
+    "web": "webm",
+    "web-android": "webm",
+    "ios": "m4a",
+    "android": "m4a",
+    "web-ios": "m4a",
+}
+
+
+def get_input_format(platform):
+    input_format = PLATFORM_TO_INPUT_FORMAT.get(platform)
+    if input_format is None:
+        raise ValueError(f"Unsupported platform: {platform}")
+    return input_format
+
+
+def build_wav_header(data_size, sample_rate=SAMPLE_RATE, sample_width=SAMPLE_WIDTH, channels=CHANNELS):
+    byte_rate = sample_rate * sample_width * channels
+    block_align = sample_width * channels
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, byte_rate, block_align, sample_width * 8,
+        b"data", data_size,
+    )
+
+
+class PcmAudio:
+    """One utterance decoded once into 16 kHz mono s16le PCM.
+
+    The PCM buffer is shared by every consumer (ASR backends, pronunciation
+    assessment, archiving); WAV containers are produced on demand from a
+    44-byte header plus a view of the buffer instead of a re-encoded copy.
+    """
+
+    def __init__(self, pcm: bytes, sample_rate=SAMPLE_RATE, sample_width=SAMPLE_WIDTH, channels=CHANNELS):
+        self.pcm = pcm
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.channels = channels
+        self._digest = None
+
+    @classmethod
+    def decode(cls, audio_bytes, platform="web"):
+        input_format = get_input_format(platform)
+        # ffmpeg resamples and downmixes in the same pass that decodes the upload
+        audio_segment = AudioSegment.from_file(
+            io.BytesIO(audio_bytes),
+            format=input_format,
+            parameters=["-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE)],
+        )
+        audio_segment = audio_segment.set_channels(CHANNELS).set_frame_rate(SAMPLE_RATE).set_sample_width(SAMPLE_WIDTH)
+        return cls(audio_segment.raw_data)
+
+    def __len__(self):
+        return len(self.pcm)
+
+    @property
+    def duration(self):
+        return len(self.pcm) / (self.sample_rate * self.sample_width * self.channels)
+
+    def digest(self):
+        if self._digest is None:
+            self._digest = hashlib.sha1(self.pcm, usedforsecurity=False).hexdigest()
+        return self._digest
+
+    def trim(self, start_sample, end_sample):
+        bytes_per_sample = self.sample_width * self.channels
+        start, end = start_sample * bytes_per_sample, end_sample * bytes_per_sample
+        if start <= 0 and end >= len(self.pcm):
+            return self
+        return PcmAudio(self.pcm[start:end], self.sample_rate, self.sample_width, self.channels)
+
+    def view(self):
+        return memoryview(self.pcm)
+
+    def wav_header(self):
+        return build_wav_header(len(self.pcm), self.sample_rate, self.sample_width, self.channels)
+
+    def wav_stream(self, name="SpeechRecognition_audio.wav"):
+        stream = WavStream(self.wav_header(), self.view())
+        stream.name = name
+        return stream
+
+    def write_wav(self, path):
+        with open(path, "wb") as f:
+            f.write(self.wav_header())
+            f.write(self.view())
+
+    def to_audio_segment(self):
+        return AudioSegment(
+            data=self.pcm,
+            sample_width=self.sample_width,
+            frame_rate=self.sample_rate,
+            channels=self.channels,
+        )
+
+
+class WavStream(io.RawIOBase):
+    """Read-only file object over a WAV header followed by a PCM view."""
+
+    def __init__(self, header: bytes, pcm: memoryview):
+        self._parts = [memoryview(header), pcm]
+        self._size = len(header) + len(pcm)
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self._size + offset
+        self._pos = max(0, min(self._pos, self._size))
+        return self._pos
+
+    def readinto(self, buffer):
+        target = memoryview(buffer).cast("B")
+        written = 0
+        offset = self._pos
+        for part in self._parts:
+            if offset >= len(part):
+                offset -= len(part)
+                continue
+            chunk = part[offset:offset + len(target) - written]
+            target[written:written + len(chunk)] = chunk
+            written += len(chunk)
+            offset = 0
+            if written == len(target):
+                break
+        self._pos += written
+        return written
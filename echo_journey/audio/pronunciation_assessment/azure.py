@@ -1,15 +1,16 @@
+import asyncio
 import io
 import logging
 import os
 import types
 
 import speech_recognition as sr
-from pydub import AudioSegment
 
+from echo_journey.audio.pcm_audio import PcmAudio
 from echo_journey.audio.pronunciation_assessment.base import PronunciationAssseement
-from echo_journey.common.utils import Singleton, timed
+from echo_journey.common.utils import Singleton, get_timer, timed
 import azure.cognitiveservices.speech as speechsdk
-import time
+from time import perf_counter
 
 from echo_journey.data.pronunciation_result import PronumciationResult
 from dotenv import find_dotenv, load_dotenv
@@ -22,6 +23,8 @@ config = types.SimpleNamespace(
     **{
         "speech_key": os.getenv("AZURE_ASR_APP_KEY"),
         "region": os.getenv("AZURE_REGION"),
+        "max_concurrency": int(os.getenv("AZURE_ASSESSMENT_MAX_CONCURRENCY", "8")),
+        "timeout": float(os.getenv("AZURE_ASSESSMENT_TIMEOUT", "15")),
     }
 )
 
@@ -30,16 +33,47 @@ class AzureAssessment(PronunciationAssseement, Singleton):
         super().__init__()
         logger.info("Setting up [Azure Speech to Text]...")
         self.recognizer = sr.Recognizer()
-        
-    async def pronunciation_assessment_continuous_from_bytes(self, wav_bytes, reference_text):
+        self._speech_config: speechsdk.SpeechConfig = None
+        self._semaphore: asyncio.Semaphore = None
+        self._semaphore_loop = None
+
+    @property
+    def speech_config(self):
+        # one SpeechConfig per process; recognizers are per utterance because they own the audio stream
+        if self._speech_config is None:
+            self._speech_config = speechsdk.SpeechConfig(subscription=config.speech_key, region=config.region)
+        return self._speech_config
+
+    def _get_semaphore(self):
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(config.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _record_phase(self, phase, started):
+        get_timer().record(f"AzureAssessment.{phase}", perf_counter() - started)
+
+    async def pronunciation_assessment_continuous_from_pcm(self, audio: PcmAudio, reference_text):
+        async def single_chunk():
+            yield audio.pcm
+        return await self.pronunciation_assessment_continuous_from_stream(single_chunk(), reference_text)
+
+    async def pronunciation_assessment_continuous_from_stream(self, pcm_chunks, reference_text):
+        """Assess PCM chunks as they arrive; recognition runs while the student is still speaking."""
+        started = perf_counter()
+        async with self._get_semaphore():
+            self._record_phase("queue", started)
+            return await self._assess_stream(pcm_chunks, reference_text)
+
+    async def _assess_stream(self, pcm_chunks, reference_text):
+        started = perf_counter()
+        loop = asyncio.get_running_loop()
+        session_done = loop.create_future()
         result = PronumciationResult()
-        import difflib
-        import json
-        speech_config = speechsdk.SpeechConfig(subscription=config.speech_key, region=config.region)
+        # the push stream's default format is 16 kHz mono s16le, so the raw PCM needs no container
         audio_stream = speechsdk.audio.PushAudioInputStream()
         audio_config = speechsdk.audio.AudioConfig(stream=audio_stream)
-        audio_stream.write(wav_bytes)
-        audio_stream.close()        
         enable_miscue = True
         enable_prosody_assessment = True
         pronunciation_config = speechsdk.PronunciationAssessmentConfig(
@@ -50,15 +84,18 @@ class AzureAssessment(PronunciationAssseement, Singleton):
         if enable_prosody_assessment:
             pronunciation_config.enable_prosody_assessment()
         language = 'zh-CN'
-        speech_recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, language=language, audio_config=audio_config)
+        speech_recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config, language=language, audio_config=audio_config)
         pronunciation_config.apply_to(speech_recognizer)
-        done = False
+
+        def resolve_session():
+            if not session_done.done():
+                session_done.set_result(None)
 
         def stop_cb(evt: speechsdk.SessionEventArgs):
             """callback that signals to stop continuous recognition upon receiving an event `evt`"""
             logger.info('CLOSING on {}'.format(evt))
-            nonlocal done
-            done = True
+            # SDK callbacks run on its own threads
+            loop.call_soon_threadsafe(resolve_session)
 
         def recognized(evt: speechsdk.SpeechRecognitionEventArgs):
             nonlocal result
@@ -76,42 +113,47 @@ class AzureAssessment(PronunciationAssseement, Singleton):
         speech_recognizer.session_stopped.connect(stop_cb)
         speech_recognizer.canceled.connect(stop_cb)
 
-        speech_recognizer.start_continuous_recognition()
-        while not done:
-            logger.info("pron assessment...")
-            import asyncio
-            await asyncio.sleep(.3)
-
-        speech_recognizer.stop_continuous_recognition()
+        await loop.run_in_executor(None, speech_recognizer.start_continuous_recognition)
+        self._record_phase("setup", started)
+        stream_closed = False
+        try:
+            started = perf_counter()
+            async for chunk in pcm_chunks:
+                audio_stream.write(chunk)
+            audio_stream.close()
+            stream_closed = True
+            self._record_phase("stream", started)
+            started = perf_counter()
+            await asyncio.wait_for(session_done, config.timeout)
+            self._record_phase("drain", started)
+        finally:
+            if not stream_closed:
+                audio_stream.close()
+            started = perf_counter()
+            await loop.run_in_executor(None, speech_recognizer.stop_continuous_recognition)
+            self._record_phase("stop", started)
         return result
 
     @timed
     async def begin(
         self,
-        wav_data,
+        audio: PcmAudio,
         expected_text
     ) -> str:
         try:
-            return await self.pronunciation_assessment_continuous_from_bytes(wav_data, expected_text)    
+            return await self.pronunciation_assessment_continuous_from_pcm(audio, expected_text)    
         except Exception as e:
             logger.error(f"Error occur when Azure.assessment : {e}")
             return None
 
-    def _convert_webm_to_wav(self, webm_data, local=True):
-        webm_audio = AudioSegment.from_file(io.BytesIO(webm_data), format="webm")
-        webm_audio = webm_audio.set_channels(1)
-        webm_audio = webm_audio.set_frame_rate(16000)
-        wav_data = io.BytesIO()
-        webm_audio.export(wav_data, format="s16le", codec="pcm_s16le")
-        return self._convert_bytes_to_wav(wav_data.getvalue(), local=local)
-    
-    def _convert_m4a_to_wav(self, m4a_data, local=True):
-        m4a_audio = AudioSegment.from_file(io.BytesIO(m4a_data), format="m4a")
-        m4a_audio = m4a_audio.set_channels(1)
-        m4a_audio = m4a_audio.set_frame_rate(16000)
-        wav_data = io.BytesIO()
-        m4a_audio.export(wav_data, format="wav", codec="pcm_s16le")
-        return self._convert_bytes_to_wav(wav_data.getvalue(), local=local)
-
-    def _convert_bytes_to_wav(self, audio_bytes, local=True):
-        return sr.AudioData(audio_bytes, 16000, 2)
+    @timed
+    async def begin_stream(
+        self,
+        pcm_chunks,
+        expected_text
+    ) -> str:
+        try:
+            return await self.pronunciation_assessment_continuous_from_stream(pcm_chunks, expected_text)
+        except Exception as e:
+            logger.error(f"Error occur when Azure.assessment : {e}")
+            return None
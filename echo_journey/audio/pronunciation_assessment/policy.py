@@ -0,0 +1,76 @@
+import logging
+import os
+import types
+
+from echo_journey.common.utils import Singleton, parse_pinyin
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+config = types.SimpleNamespace(
+    **{
+        # eager: assess alongside ASR; deferred: assess after ASR only if needed; off: never assess
+        "mode": os.getenv("ASSESSMENT_MODE", "eager"),
+        "skip_on_asr_failure": os.getenv("ASSESSMENT_SKIP_ON_ASR_FAILURE", "true").lower() == "true",
+        "skip_on_exact_match": os.getenv("ASSESSMENT_SKIP_ON_EXACT_MATCH", "true").lower() == "true",
+        "min_duration": float(os.getenv("ASSESSMENT_MIN_DURATION", "0.3")),
+    }
+)
+
+ASSESSMENT_MODES = {"eager", "deferred", "off"}
+
+SKIP_ASR_FAILURE = "asr_failure"
+SKIP_EXACT_MATCH = "exact_match"
+SKIP_TOO_SHORT = "too_short"
+
+
+def pinyin_sequence(text):
+    return [word.pinyin for word in parse_pinyin(text)]
+
+
+class AssessmentPolicy(Singleton):
+    """Decide whether a sentence-mode turn needs the remote pronunciation assessment.
+
+    Eager mode starts the assessment together with ASR and cancels it once ASR
+    shows it is not needed; deferred mode only starts it after ASR, trading
+    latency on assessed turns for no wasted calls.
+    """
+
+    def __init__(self):
+        if config.mode not in ASSESSMENT_MODES:
+            logger.warning(f"Unknown ASSESSMENT_MODE {config.mode}, falling back to eager")
+        self.mode = config.mode if config.mode in ASSESSMENT_MODES else "eager"
+        self.assessed = 0
+        self.skipped: dict[str, int] = {}
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    @property
+    def eager(self):
+        return self.mode == "eager"
+
+    def skip_reason(self, asr_result, expected_text, audio=None):
+        """Return why the assessment can be skipped for this turn, or None to assess."""
+        reason = None
+        if config.skip_on_asr_failure and not asr_result:
+            reason = SKIP_ASR_FAILURE
+        elif audio is not None and audio.duration < config.min_duration:
+            reason = SKIP_TOO_SHORT
+        elif (
+            config.skip_on_exact_match
+            and asr_result
+            and expected_text
+            and pinyin_sequence(asr_result) == pinyin_sequence(expected_text)
+        ):
+            reason = SKIP_EXACT_MATCH
+        if reason:
+            self.skipped[reason] = self.skipped.get(reason, 0) + 1
+        else:
+            self.assessed += 1
+        return reason
+
+    def report(self):
+        return {"mode": self.mode, "assessed": self.assessed, "skipped": dict(self.skipped)}
@@ -1,88 +1,220 @@
-import io
+import asyncio
 import logging
+from time import perf_counter
+from echo_journey.audio.archiver import AsrArchiver
+from echo_journey.audio.pcm_audio import PcmAudio
 from echo_journey.audio.pronunciation_assessment.azure import AzureAssessment
+from echo_journey.audio.pronunciation_assessment.policy import AssessmentPolicy
 from echo_journey.audio.speech_to_text.azure import Azure
+from echo_journey.audio.speech_to_text.cache import AsrCache
+from echo_journey.audio.speech_to_text.hedge import AsrHedge
 from echo_journey.audio.speech_to_text.kanyun import Kanyun
+from echo_journey.audio.streaming import PcmRingBuffer, StreamingUtterance
+from echo_journey.audio.transcode_pool import TranscodePool
+from echo_journey.audio.vad import trim_silence
 from echo_journey.common.utils import parse_pinyin, device_id_var, session_id_var
-import speech_recognition as sr
-from pydub import AudioSegment
 
 from echo_journey.data.practise_progress import PractiseStatus
 
 logger = logging.getLogger(__name__)
+
+
+def is_valid_asr_result(asr_result):
+    if not asr_result:
+        return False
+    try:
+        return len(parse_pinyin(asr_result)) > 0
+    except Exception as e:
+        return False
+
+
 class ASR:
     def __init__(self):
         self.asr = Kanyun.get_instance()
         self.asr_back = Azure.get_instance()
         self.pronunciator = AzureAssessment.get_instance()
-        
-    def _convert_webm_to_wav(self, webm_data, local=True):
-        webm_audio = AudioSegment.from_file(io.BytesIO(webm_data), format="webm")
-        webm_audio = webm_audio.set_channels(1)
-        webm_audio = webm_audio.set_frame_rate(16000)
-        wav_data = io.BytesIO()
-        webm_audio.export(wav_data, format="s16le", codec="pcm_s16le")
-        return self._convert_bytes_to_wav(wav_data.getvalue(), local=local)
-    
-    def _convert_m4a_to_wav(self, m4a_data, local=True):
-        m4a_audio = AudioSegment.from_file(io.BytesIO(m4a_data), format="m4a")
-        m4a_audio = m4a_audio.set_channels(1)
-        m4a_audio = m4a_audio.set_frame_rate(16000)
-        wav_data = io.BytesIO()
-        m4a_audio.export(wav_data, format="wav", codec="pcm_s16le")
-        return self._convert_bytes_to_wav(wav_data.getvalue(), local=local)
-
-    def _convert_bytes_to_wav(self, audio_bytes, local=True):
-        return sr.AudioData(audio_bytes, 16000, 2)
+        self.assessment_policy = AssessmentPolicy.get_instance()
+        self.hedge = AsrHedge.get_instance()
+        self.archiver = AsrArchiver.get_instance()
+        self.cache = AsrCache.get_instance()
+        self.transcode_pool = TranscodePool.get_instance()
+        self.ring_buffer: PcmRingBuffer = None
+
+    async def decode(self, audio_bytes, platform="web") -> PcmAudio:
+        return await self.transcode_pool.decode(audio_bytes, platform)
+
+    def should_assess(self, expected_text, status):
+        return bool(expected_text) and status == PractiseStatus.SENTENCE and self.assessment_policy.enabled
 
     async def transcribe(self, audio_bytes, platform="web", expected_text=None, status=None) -> str:
-        device_id = device_id_var.get()
-        session_id = session_id_var.get()
         try:
-            if platform == "web" or platform == "web-android":
-                audio = self._convert_webm_to_wav(audio_bytes, False)
-            elif platform == "ios" or platform == "android" or platform == "web-ios":
-                audio = self._convert_m4a_to_wav(audio_bytes, False)
-            else:
-                raise ValueError(f"Unsupported platform: {platform}")
-            wav_data = audio.get_wav_data()
-            audio_segment = AudioSegment.from_wav(io.BytesIO(wav_data))
-
-            export_wav_dir_path = f"user_info/{device_id}/asr_data"
-            import os
-            if not os.path.exists(export_wav_dir_path):
-                os.makedirs(export_wav_dir_path)
-            if expected_text and status==PractiseStatus.SENTENCE:
-                import asyncio
-                asr_result, pron_result = await asyncio.gather(self.do_asr(wav_data), self.do_pronunciation_asses(wav_data, expected_text))
-                name = f"{export_wav_dir_path}/SpeechRecognition_audio_{session_id}_{asr_result}_{expected_text}.wav" if asr_result else f"{export_wav_dir_path}/SpeechRecognition_audio_{session_id}_null_{expected_text}.wav"
-                audio_segment.export(name, format="wav")
-                return asr_result, pron_result  
-            else:
-                asr_result = await self.do_asr(wav_data)
-                name = f"{export_wav_dir_path}/SpeechRecognition_audio_{session_id}_{asr_result}.wav" if asr_result else f"{export_wav_dir_path}/SpeechRecognition_audio_{session_id}_null.wav"
-                audio_segment.export(name, format="wav")
-                return asr_result, None
+            audio = await self.decode(audio_bytes, platform)
+            return await self._recognize(audio, expected_text, status)
         except Exception as e:
             logger.error(f"Error occur when ASR.transcribe : {e}")
             return None, None
-        
-    async def do_asr(self, wav_data):
-        asr_result = self.asr.transcribe(wav_data)
+
+    def start_utterance(self, platform="web", expected_text=None, status=None) -> StreamingUtterance:
+        """Begin a chunked upload; assessment starts consuming PCM before the student finishes."""
+        if self.ring_buffer is None:
+            self.ring_buffer = PcmRingBuffer()
+        utterance = StreamingUtterance(platform, self.ring_buffer, expected_text, status)
+        if self.should_assess(expected_text, status) and self.assessment_policy.eager:
+            utterance.pron_task = asyncio.create_task(
+                self.pronunciator.begin_stream(self.ring_buffer.stream(), expected_text)
+            )
+        return utterance
+
+    async def feed_utterance(self, utterance: StreamingUtterance, data) -> bool:
+        """Feed one chunk; False when it could not be decoded and the utterance was cancelled."""
+        if utterance is None:
+            logger.error("Error occur when ASR.feed_utterance : no utterance was started")
+            return False
+        try:
+            await utterance.feed(data)
+            return True
+        except Exception as e:
+            utterance.cancel()
+            logger.error(f"Error occur when ASR.feed_utterance : {e}")
+            return False
+
+    async def finish_utterance(self, utterance: StreamingUtterance):
         try:
-            parse_pinyin(asr_result) 
+            audio = await utterance.finish()
+            return await self._recognize(audio, utterance.expected_text, utterance.status, utterance.pron_task)
         except Exception as e:
+            utterance.cancel()
+            logger.error(f"Error occur when ASR.finish_utterance : {e}")
+            return None, None
+
+    async def _recognize(self, audio: PcmAudio, expected_text=None, status=None, pron_task: asyncio.Task = None):
+        audio = trim_silence(audio)
+        if audio is None:
+            # nothing was said: answer locally instead of paying for a remote round trip
+            if pron_task:
+                pron_task.cancel()
+            return None, None
+        assess = self.should_assess(expected_text, status)
+        cached_pron = await self.cache.get_assessment(audio.digest(), expected_text) if assess else None
+        if cached_pron is not None and pron_task:
+            pron_task.cancel()
+            pron_task = None
+        if pron_task is None and assess and cached_pron is None and self.assessment_policy.eager:
+            pron_task = asyncio.create_task(self.do_pronunciation_asses(audio, expected_text))
+        try:
+            asr_result = await self.do_cached_asr(audio)
+            if cached_pron is not None:
+                pron_result = cached_pron
+            else:
+                pron_result = await self._resolve_assessment(audio, asr_result, expected_text, pron_task) if assess else None
+        except BaseException:
+            if pron_task:
+                pron_task.cancel()
+            raise
+        await self._archive(audio, asr_result, expected_text if assess else None)
+        logger.info(f"ASR cache stats: {self.cache.report()}")
+        return asr_result, pron_result
+
+    async def _resolve_assessment(self, audio: PcmAudio, asr_result, expected_text, pron_task: asyncio.Task = None):
+        """Finish, cancel or (in deferred mode) start the assessment depending on the ASR outcome."""
+        skip_reason = self.assessment_policy.skip_reason(asr_result, expected_text, audio)
+        if skip_reason:
+            logger.info(f"Skip pronunciation assessment ({skip_reason}): {asr_result} / {expected_text}")
+            if pron_task:
+                pron_task.cancel()
+            return None
+        if pron_task is None:
+            pron_result = await self.do_pronunciation_asses(audio, expected_text)
+        else:
+            pron_result = await pron_task
+        if pron_result is not None:
+            self.cache.put_assessment(audio.digest(), expected_text, pron_result)
+        return pron_result
+
+    async def _archive(self, audio: PcmAudio, asr_result, expected_text=None):
+        device_id = device_id_var.get()
+        session_id = session_id_var.get()
+        name = f"SpeechRecognition_audio_{session_id}_{asr_result if asr_result else 'null'}"
+        if expected_text:
+            name = f"{name}_{expected_text}"
+        await self.archiver.submit(f"user_info/{device_id}/asr_data", name, audio)
+
+    async def do_cached_asr(self, audio: PcmAudio):
+        asr_result = await self.cache.get_transcript(audio.digest())
+        if asr_result is not None:
+            logger.info(f"ASR cache hit: {asr_result}")
+            return asr_result
+        asr_result = await self.do_asr(audio)
+        if is_valid_asr_result(asr_result):
+            self.cache.put_transcript(audio.digest(), asr_result)
+        return asr_result
+
+    async def do_asr(self, audio: PcmAudio):
+        if self.hedge.enabled:
+            return await self.do_hedged_asr(audio)
+        asr_result = await self.asr.transcribe(audio)
+        if not is_valid_asr_result(asr_result):
             try:
-                asr_result = self.asr_back.transcribe(wav_data)
+                asr_result = await self.asr_back.transcribe(audio)
             except Exception as e:
                 logger.error(f"Error occur when ASR.do_asr : {e}")
                 return None
         return asr_result
 
-    async def do_pronunciation_asses(self, wav_data, expected_text):
+    async def _timed_transcribe(self, backend, audio: PcmAudio):
+        start = perf_counter()
+        try:
+            return await backend.transcribe(audio)
+        finally:
+            if backend is self.asr:
+                # a cancelled primary still tells us it took at least this long
+                self.hedge.record_latency(perf_counter() - start)
+
+    async def do_hedged_asr(self, audio: PcmAudio):
+        """Start the backup backend if the primary is slower than the hedge delay; first valid result wins."""
+        self.hedge.requests += 1
+        primary = asyncio.create_task(self._timed_transcribe(self.asr, audio))
+        task_2_backend = {primary: self.asr}
+        pending = {primary}
+        winner = None
+        asr_result = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge.delay())
+            while True:
+                for task in done:
+                    stats = self.hedge.backend(type(task_2_backend[task]).__name__)
+                    if task.exception() is not None:
+                        stats.errors += 1
+                        logger.error(f"Error occur when ASR.do_hedged_asr : {task.exception()}")
+                    elif winner is None and is_valid_asr_result(task.result()):
+                        winner = task
+                        asr_result = task.result()
+                    else:
+                        stats.losses += 1
+                if winner is not None:
+                    break
+                if len(task_2_backend) == 1:
+                    # primary is slow or returned nothing usable: hedge with the backup
+                    self.hedge.hedges += 1
+                    backup = asyncio.create_task(self._timed_transcribe(self.asr_back, audio))
+                    task_2_backend[backup] = self.asr_back
+                    pending.add(backup)
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+                self.hedge.backend(type(task_2_backend[task]).__name__).losses += 1
+        if winner is not None:
+            self.hedge.backend(type(task_2_backend[winner]).__name__).wins += 1
+        if len(task_2_backend) > 1:
+            logger.info(f"ASR hedge stats: {self.hedge.report()}")
+        return asr_result
+
+    async def do_pronunciation_asses(self, audio: PcmAudio, expected_text):
         try:
-            return await self.pronunciator.begin(wav_data, expected_text)
+            return await self.pronunciator.begin(audio, expected_text)
         except Exception as e:
             logger.error(f"Error occur when ASR.do_pronunciation_asses : {e}")
             return None
-        
\ No newline at end of file
@@ -1,12 +1,14 @@
-import io
+import asyncio
 import logging
 import os
 import types
-from io import BytesIO
 
+import aiohttp
 import speech_recognition as sr
 
+from echo_journey.audio.pcm_audio import PcmAudio
 from echo_journey.audio.speech_to_text.base import SpeechToText
+from echo_journey.common.http_client import PooledHttpClient
 from echo_journey.common.utils import Singleton, timed
 from dotenv import find_dotenv, load_dotenv
 _ = load_dotenv(find_dotenv())
@@ -17,6 +19,8 @@ config = types.SimpleNamespace(
     **{
         "url": os.getenv("AZURE_ASR_URL"),
         "app_key": os.getenv("AZURE_ASR_APP_KEY"),
+        "max_connections": int(os.getenv("AZURE_ASR_MAX_CONNECTIONS", "16")),
+        "timeout": float(os.getenv("AZURE_ASR_TIMEOUT", "10")),
     }
 )
 
@@ -25,34 +29,42 @@ class Azure(SpeechToText, Singleton):
         super().__init__()
         logger.info("Setting up [Azure Speech to Text]...")
         self.recognizer = sr.Recognizer()
+        self.http_client = PooledHttpClient(
+            "azure_asr",
+            max_connections=config.max_connections,
+            timeout=config.timeout,
+        )
 
     @timed
-    def transcribe(
+    async def transcribe(
         self,
-        wav_data,
+        audio: PcmAudio,
     ) -> str:
-        import requests
-        wav_data_in_io = io.BytesIO(wav_data)
-        wav_data_in_io.name = "SpeechRecognition_audio.wav"
-
-        response = requests.post(
-            config.url,
-            headers={
-                "Ocp-Apim-Subscription-Key": config.app_key,
-                'Accept': 'application/json'
-            },
-            files = {
-                'audio': wav_data_in_io,
-                'definition': (None, '{"locales":["zh-CN"], "profanityFilterMode": "Masked", "channels": [0,1]}', 'application/json')
-            }
+        form = aiohttp.FormData()
+        form.add_field("audio", audio.wav_stream(), filename="SpeechRecognition_audio.wav")
+        form.add_field(
+            "definition",
+            '{"locales":["zh-CN"], "profanityFilterMode": "Masked", "channels": [0,1]}',
+            content_type="application/json",
         )
-
-        if response.status_code != 200:
-            err_msg = f"Error occur when Azure.transcribing audio, statusCode: {response.status_code}, responseContent: {response.text}"
-            logger.error(err_msg)
+        try:
+            async with self.http_client.session.post(
+                config.url,
+                headers={
+                    "Ocp-Apim-Subscription-Key": config.app_key,
+                    'Accept': 'application/json'
+                },
+                data=form,
+            ) as response:
+                if response.status != 200:
+                    err_msg = f"Error occur when Azure.transcribing audio, statusCode: {response.status}, responseContent: {await response.text()}"
+                    logger.error(err_msg)
+                    return None
+                json = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error occur when Azure.transcribing audio : {e!r}")
             return None
 
-        json = response.json()
         result = json["combinedPhrases"][0]["text"]
         logger.info(f"Azure transcript is: {result}")
         return result
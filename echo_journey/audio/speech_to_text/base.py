@@ -6,8 +6,9 @@ from echo_journey.common.utils import timed
 class SpeechToText(ABC):
     @abstractmethod
     @timed
-    def transcribe(
+    async def transcribe(
         self,
-        wav_data,
+        audio,
     ) -> str:
+        """Recognize one utterance without blocking the event loop."""
         pass
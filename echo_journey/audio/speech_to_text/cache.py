@@ -0,0 +1,46 @@
+import os
+import types
+
+from echo_journey.common.cache import LruCache
+from echo_journey.common.utils import Singleton
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+config = types.SimpleNamespace(
+    **{
+        "enabled": os.getenv("ASR_CACHE_ENABLED", "true").lower() == "true",
+        "max_entries": int(os.getenv("ASR_CACHE_MAX_ENTRIES", "2048")),
+        "ttl": float(os.getenv("ASR_CACHE_TTL", str(24 * 3600))),
+        "disk_dir": os.getenv("ASR_CACHE_DIR") or None,
+    }
+)
+
+
+class AsrCache(Singleton):
+    """Process-wide ASR and pronunciation results keyed by the digest of the trimmed PCM."""
+
+    def __init__(self):
+        self.enabled = config.enabled
+        self.transcripts = LruCache("asr", config.max_entries, config.ttl, config.disk_dir)
+        self.assessments = LruCache("pronunciation", config.max_entries, config.ttl, config.disk_dir)
+
+    @staticmethod
+    def assessment_key(digest, expected_text):
+        return f"{digest}:{expected_text}"
+
+    async def get_transcript(self, digest):
+        return await self.transcripts.aget(digest) if self.enabled else None
+
+    def put_transcript(self, digest, asr_result):
+        if self.enabled:
+            self.transcripts.aput(digest, asr_result)
+
+    async def get_assessment(self, digest, expected_text):
+        return await self.assessments.aget(self.assessment_key(digest, expected_text)) if self.enabled else None
+
+    def put_assessment(self, digest, expected_text, pron_result):
+        if self.enabled:
+            self.assessments.aput(self.assessment_key(digest, expected_text), pron_result)
+
+    def report(self):
+        return {"asr": self.transcripts.report(), "pronunciation": self.assessments.report()}
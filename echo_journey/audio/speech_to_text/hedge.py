@@ -0,0 +1,71 @@
+import logging
+import os
+import types
+from collections import deque
+
+from echo_journey.common.utils import Singleton
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+config = types.SimpleNamespace(
+    **{
+        "enabled": os.getenv("ASR_HEDGE_ENABLED", "false").lower() == "true",
+        "percentile": float(os.getenv("ASR_HEDGE_PERCENTILE", "95")),
+        "default_delay": float(os.getenv("ASR_HEDGE_DEFAULT_DELAY", "1.5")),
+        "min_delay": float(os.getenv("ASR_HEDGE_MIN_DELAY", "0.3")),
+        "max_delay": float(os.getenv("ASR_HEDGE_MAX_DELAY", "3.0")),
+        "min_samples": int(os.getenv("ASR_HEDGE_MIN_SAMPLES", "20")),
+        "window": int(os.getenv("ASR_HEDGE_WINDOW", "500")),
+    }
+)
+
+
+class BackendStats:
+    def __init__(self):
+        self.wins = 0
+        self.losses = 0
+        self.errors = 0
+
+    def to_dict(self):
+        return {"wins": self.wins, "losses": self.losses, "errors": self.errors}
+
+
+class AsrHedge(Singleton):
+    """Process-wide hedge delay and win/loss bookkeeping for ASR.do_asr.
+
+    The delay is the configured percentile of recent primary-backend
+    latencies, clamped to [min_delay, max_delay]; until enough samples are
+    seen the default delay is used.
+    """
+
+    def __init__(self):
+        self.enabled = config.enabled
+        self.latencies = deque(maxlen=config.window)
+        self.hedges = 0
+        self.requests = 0
+        self.stats: dict[str, BackendStats] = {}
+
+    def record_latency(self, seconds):
+        self.latencies.append(seconds)
+
+    def delay(self):
+        if len(self.latencies) < config.min_samples:
+            return config.default_delay
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * config.percentile / 100))
+        return min(config.max_delay, max(config.min_delay, ordered[index]))
+
+    def backend(self, name) -> BackendStats:
+        if name not in self.stats:
+            self.stats[name] = BackendStats()
+        return self.stats[name]
+
+    def report(self):
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "delay": self.delay(),
+            "backends": {name: stats.to_dict() for name, stats in self.stats.items()},
+        }
@@ -1,13 +1,14 @@
-import io
+import asyncio
 import logging
 import os
 import types
-from io import BytesIO
 
+import aiohttp
 import speech_recognition as sr
-from pydub import AudioSegment
 
+from echo_journey.audio.pcm_audio import PcmAudio
 from echo_journey.audio.speech_to_text.base import SpeechToText
+from echo_journey.common.http_client import PooledHttpClient
 from echo_journey.common.utils import Singleton, timed
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,8 @@ config = types.SimpleNamespace(
     **{
         "url": os.getenv("KANYUN_ASR_URL"),
         "app_key": os.getenv("KANYUN_ASR_APP_KEY"),
+        "max_connections": int(os.getenv("KANYUN_ASR_MAX_CONNECTIONS", "32")),
+        "timeout": float(os.getenv("KANYUN_ASR_TIMEOUT", "10")),
     }
 )
 
@@ -27,32 +30,36 @@ class Kanyun(SpeechToText, Singleton):
         super().__init__()
         logger.info("Setting up [Kanyun Speech to Text]...")
         self.recognizer = sr.Recognizer()
+        self.http_client = PooledHttpClient(
+            "kanyun_asr",
+            max_connections=config.max_connections,
+            timeout=config.timeout,
+        )
 
     @timed
-    def transcribe(
+    async def transcribe(
         self,
-        wav_data,
+        audio: PcmAudio,
     ) -> str:
-        import requests
-        wav_data_in_io = io.BytesIO(wav_data)
-        wav_data_in_io.name = "SpeechRecognition_audio.wav"
-
-        response = requests.post(
-            config.url,
-            params={
-                "appKey": config.app_key,
-            },
-            files={
-                "audio": wav_data,
-            },
-        )
-
-        if response.status_code != 200:
-            err_msg = f"Error occur when Kanyun.transcribing audio, statusCode: {response.status_code}, responseContent: {response.text}"
-            logger.error(err_msg)
+        form = aiohttp.FormData()
+        form.add_field("audio", audio.wav_stream(), filename="SpeechRecognition_audio.wav")
+        try:
+            async with self.http_client.session.post(
+                config.url,
+                params={
+                    "appKey": config.app_key,
+                },
+                data=form,
+            ) as response:
+                if response.status != 200:
+                    err_msg = f"Error occur when Kanyun.transcribing audio, statusCode: {response.status}, responseContent: {await response.text()}"
+                    logger.error(err_msg)
+                    return None
+                json = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error occur when Kanyun.transcribing audio : {e!r}")
             return None
 
-        json = response.json()
         ret = json["result"]
         logger.info(f"Kanyun transcript is: {ret}")
         return ret
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import os
+import types
+
+from pydub import AudioSegment
+
+from echo_journey.audio.pcm_audio import CHANNELS, SAMPLE_RATE, SAMPLE_WIDTH, PcmAudio, get_input_format
+from echo_journey.audio.transcode_pool import TranscodePool
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+config = types.SimpleNamespace(
+    **{
+        "max_seconds": int(os.getenv("ASR_STREAM_MAX_SECONDS", "60")),
+        "read_size": int(os.getenv("ASR_STREAM_READ_SIZE", "3200")),
+    }
+)
+
+# containers ffmpeg can decode from a pipe as they arrive; m4a keeps its index at the end
+STREAMABLE_INPUT_FORMATS = {"webm"}
+
+
+class PcmRingBuffer:
+    """Fixed-capacity PCM buffer that readers can follow while it is written.
+
+    Offsets are absolute byte positions since the last reset; once more than
+    `capacity` bytes are written the oldest audio is overwritten.
+    """
+
+    def __init__(self, capacity=config.max_seconds * SAMPLE_RATE * SAMPLE_WIDTH * CHANNELS):
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self.reset()
+
+    def reset(self):
+        self._written = 0
+        self._closed = False
+        self._overflowed = False
+        self._data_ready = asyncio.Event()
+
+    @property
+    def written(self):
+        return self._written
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @property
+    def overflowed(self):
+        """True once audio was overwritten since the last reset."""
+        return self._overflowed
+
+    def oldest_offset(self):
+        return max(0, self._written - self.capacity)
+
+    def write(self, data):
+        if self._closed:
+            raise ValueError("write to a closed PcmRingBuffer")
+        data = memoryview(data)
+        if not self._overflowed and self._written + len(data) > self.capacity:
+            self._overflowed = True
+            logger.warning(
+                f"PcmRingBuffer overflowed its {self.capacity / (SAMPLE_RATE * SAMPLE_WIDTH * CHANNELS):.0f}s capacity, "
+                f"dropping the oldest audio (raise ASR_STREAM_MAX_SECONDS for longer utterances)"
+            )
+        if len(data) > self.capacity:
+            self._written += len(data) - self.capacity
+            data = data[-self.capacity:]
+        start = self._written % self.capacity
+        first = min(len(data), self.capacity - start)
+        self._buffer[start:start + first] = data[:first]
+        self._buffer[:len(data) - first] = data[first:]
+        self._written += len(data)
+        self._notify()
+
+    def close(self):
+        self._closed = True
+        self._notify()
+
+    def _notify(self):
+        self._data_ready.set()
+        self._data_ready = asyncio.Event()
+
+    def read(self, offset):
+        """Return (bytes from offset up to the write position, new offset)."""
+        if offset < self.oldest_offset():
+            logger.warning(f"PcmRingBuffer reader fell behind by {self.oldest_offset() - offset} bytes")
+            offset = self.oldest_offset()
+        size = self._written - offset
+        start = offset % self.capacity
+        first = min(size, self.capacity - start)
+        data = bytes(self._buffer[start:start + first]) + bytes(self._buffer[:size - first])
+        return data, self._written
+
+    def snapshot(self):
+        data, _ = self.read(self.oldest_offset())
+        return data
+
+    async def stream(self):
+        """Yield PCM from the oldest retained byte until the buffer is closed."""
+        offset = self.oldest_offset()
+        while True:
+            data_ready = self._data_ready
+            if offset < self._written:
+                data, offset = self.read(offset)
+                yield data
+            elif self._closed:
+                return
+            else:
+                await data_ready.wait()
+
+
+class StreamingDecoder:
+    """Decode upward audio chunks into a PcmRingBuffer while they arrive.
+
+    Streamable containers go through one long-lived ffmpeg process fed over
+    stdin; the rest are collected and decoded in one pass at end of utterance.
+    """
+
+    def __init__(self, platform, ring_buffer: PcmRingBuffer):
+        self.platform = platform
+        self.input_format = get_input_format(platform)
+        self.ring_buffer = ring_buffer
+        self._process = None
+        self._pump_task = None
+        self._pending_chunks = []
+
+    @property
+    def streamable(self):
+        return self.input_format in STREAMABLE_INPUT_FORMATS
+
+    async def _start_process(self):
+        self._process = await asyncio.create_subprocess_exec(
+            AudioSegment.converter,
+            "-loglevel", "error",
+            "-f", self.input_format,
+            "-i", "pipe:0",
+            "-ac", str(CHANNELS),
+            "-ar", str(SAMPLE_RATE),
+            "-f", "s16le",
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        self._pump_task = asyncio.create_task(self._pump())
+
+    async def _pump(self):
+        while True:
+            data = await self._process.stdout.read(config.read_size)
+            if not data:
+                break
+            self.ring_buffer.write(data)
+
+    async def feed(self, data):
+        if not data:
+            return
+        if not self.streamable:
+            self._pending_chunks.append(data)
+            return
+        if self._process is None:
+            await self._start_process()
+        try:
+            self._process.stdin.write(data)
+            await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            # ffmpeg exits on input it cannot decode and takes the pipe with it
+            raise RuntimeError(f"ffmpeg stopped decoding {self.input_format} input") from e
+
+    async def finish(self):
+        try:
+            if self._process is not None:
+                try:
+                    self._process.stdin.close()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                await self._pump_task
+                returncode = await self._process.wait()
+                if returncode != 0:
+                    raise RuntimeError(f"ffmpeg exited with {returncode} decoding {self.input_format} input")
+            elif self._pending_chunks:
+                audio = await TranscodePool.get_instance().decode(b"".join(self._pending_chunks), self.platform)
+                self.ring_buffer.write(audio.pcm)
+        finally:
+            self.ring_buffer.close()
+
+    def cancel(self):
+        if self._pump_task is not None:
+            self._pump_task.cancel()
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+        self.ring_buffer.close()
+
+
+class StreamingUtterance:
+    """One utterance uploaded as AudioChunkMessages."""
+
+    def __init__(self, platform, ring_buffer: PcmRingBuffer, expected_text=None, status=None):
+        ring_buffer.reset()
+        self.ring_buffer = ring_buffer
+        self.decoder = StreamingDecoder(platform, ring_buffer)
+        self.expected_text = expected_text
+        self.status = status
+        self.pron_task: asyncio.Task = None
+        # AudioChunkMessage.sequence the next chunk must carry
+        self.next_sequence = 0
+
+    async def feed(self, data):
+        self.next_sequence += 1
+        await self.decoder.feed(data)
+
+    async def finish(self) -> PcmAudio:
+        await self.decoder.finish()
+        pcm = self.ring_buffer.snapshot()
+        return PcmAudio(pcm[:len(pcm) - len(pcm) % SAMPLE_WIDTH])
+
+    def cancel(self):
+        self.decoder.cancel()
+        if self.pron_task is not None:
+            self.pron_task.cancel()
@@ -15,3 +15,14 @@ class TextAudioTimeline:
         self.text = text
         self.start_time = start_time
         self.end_time = end_time
+
+
+class SynthesizedSpeech:
+    """Audio of one synthesis (canonical PcmAudio or encoded bytes) with its word timeline."""
+
+    def __init__(self, audio, timeline: list[TextAudioTimeline] = None):
+        self.audio = audio
+        self.timeline = timeline or []
+
+    def __len__(self):
+        return len(self.audio)
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import os
+import types
+from abc import abstractmethod
+
+from echo_journey.audio.text_to_speech.base import SynthesizedSpeech, TextToSpeech
+from echo_journey.audio.text_to_speech.encoding import get_output_format
+from echo_journey.audio.transcode_pool import TranscodePool
+from echo_journey.common.cache import LruCache, SingleFlight
+from echo_journey.common.utils import timed
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+config = types.SimpleNamespace(
+    **{
+        "cache_enabled": os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true",
+        "cache_max_entries": int(os.getenv("TTS_CACHE_MAX_ENTRIES", "4096")),
+        "cache_max_bytes": int(os.getenv("TTS_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        "pcm_cache_max_bytes": int(os.getenv("TTS_PCM_CACHE_MAX_BYTES", str(128 * 1024 * 1024))),
+        "cache_dir": os.getenv("TTS_CACHE_DIR", "cache"),
+        "cache_disk_max_bytes": int(os.getenv("TTS_CACHE_DISK_MAX_BYTES", str(1024 * 1024 * 1024))),
+        "batch_concurrency": int(os.getenv("TTS_BATCH_CONCURRENCY", "8")),
+    }
+)
+
+
+class CachedTextToSpeech(TextToSpeech):
+    """TTS provider with one synthesis per sentence shared by every platform.
+
+    Subclasses implement `synthesize`, returning canonical PCM plus its word
+    timeline. Results are cached as such; each container (ipod, webm, wav)
+    is encoded from the PCM on first request and memoized. Concurrent
+    requests for the same sentence or encoding wait on the one in flight.
+    """
+
+    cache_name = "tts"
+    default_speaker = None
+    default_speed_ratio = 1.0
+
+    def __init__(self):
+        super().__init__()
+        cache_dir = config.cache_dir or None
+        # synthesized practise words repeat across sessions and devices
+        self.pcm_cache = LruCache(
+            f"{self.cache_name}_speech",
+            max_entries=config.cache_max_entries,
+            disk_dir=cache_dir,
+            max_bytes=config.pcm_cache_max_bytes,
+            disk_max_bytes=config.cache_disk_max_bytes,
+            sizeof=len,
+        ) if config.cache_enabled else None
+        self.cache = LruCache(
+            self.cache_name,
+            max_entries=config.cache_max_entries,
+            disk_dir=cache_dir,
+            max_bytes=config.cache_max_bytes,
+            disk_max_bytes=config.cache_disk_max_bytes,
+            sizeof=len,
+        ) if config.cache_enabled else None
+        self.synthesis_flight = SingleFlight()
+        self.encoding_flight = SingleFlight()
+        self.transcode_pool = TranscodePool.get_instance()
+
+    def report(self):
+        return {
+            "speech": self.pcm_cache.report() if self.pcm_cache is not None else None,
+            "audio": self.cache.report() if self.cache is not None else None,
+        }
+
+    @abstractmethod
+    async def synthesize(self, text, speaker, speed_ratio) -> SynthesizedSpeech:
+        pass
+
+    @staticmethod
+    def pcm_key(text, speaker, speed_ratio):
+        return f"{speaker}|{speed_ratio}|{text}"
+
+    @staticmethod
+    def cache_key(text, speaker, speed_ratio, output_format):
+        return f"{speaker}|{speed_ratio}|{output_format}|{text}"
+
+    @timed
+    async def generate_audio(self, text, speaker=None, platform="web", speed_ratio=None, output_format=None):
+        """Audio in `output_format`, or in the container `platform` plays by default."""
+        speaker = speaker or self.default_speaker
+        speed_ratio = speed_ratio or self.default_speed_ratio
+        output_format = output_format or get_output_format(platform)
+        key = self.cache_key(text, speaker, speed_ratio, output_format)
+        if self.cache is not None:
+            audio_bytes = await self.cache.aget(key)
+            if audio_bytes is not None:
+                return audio_bytes
+        return await self.encoding_flight.run(
+            key, lambda: self._encode(key, text, speaker, speed_ratio, output_format)
+        )
+
+    async def generate_speech(
+        self, text, speaker=None, platform="web", speed_ratio=None, output_format=None,
+    ) -> SynthesizedSpeech:
+        """Encoded audio together with the word timeline of the synthesis."""
+        audio_bytes = await self.generate_audio(
+            text, speaker=speaker, platform=platform, speed_ratio=speed_ratio, output_format=output_format,
+        )
+        speech = await self.generate_pcm(text, speaker, speed_ratio)
+        return SynthesizedSpeech(audio_bytes, speech.timeline)
+
+    async def generate_audio_batch(
+        self, texts, speaker=None, platform="web", speed_ratio=None, output_format=None,
+        max_concurrency=config.batch_concurrency,
+    ) -> dict[str, bytes]:
+        """Synthesize each distinct text once, at most `max_concurrency` at a time.
+
+        Returns text -> audio bytes; texts whose synthesis failed map to None.
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def generate(text):
+            async with semaphore:
+                return await self.generate_audio(
+                    text, speaker=speaker, platform=platform, speed_ratio=speed_ratio, output_format=output_format,
+                )
+
+        results = await asyncio.gather(*[generate(text) for text in unique_texts], return_exceptions=True)
+        text_2_audio = {}
+        for text, result in zip(unique_texts, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error occur when {type(self).__name__}.generate_audio_batch {text} : {result}")
+                result = None
+            text_2_audio[text] = result
+        return text_2_audio
+
+    async def _encode(self, key, text, speaker, speed_ratio, output_format):
+        speech = await self.generate_pcm(text, speaker, speed_ratio)
+        audio_bytes = await self.transcode_pool.encode(speech.audio, output_format)
+        if self.cache is not None:
+            self.cache.aput(key, audio_bytes)
+        return audio_bytes
+
+    async def generate_pcm(self, text, speaker=None, speed_ratio=None) -> SynthesizedSpeech:
+        speaker = speaker or self.default_speaker
+        speed_ratio = speed_ratio or self.default_speed_ratio
+        key = self.pcm_key(text, speaker, speed_ratio)
+        if self.pcm_cache is not None:
+            speech = await self.pcm_cache.aget(key)
+            if speech is not None:
+                return speech
+        return await self.synthesis_flight.run(key, lambda: self._synthesize(key, text, speaker, speed_ratio))
+
+    async def _synthesize(self, key, text, speaker, speed_ratio):
+        speech = await self.synthesize(text, speaker, speed_ratio)
+        if self.pcm_cache is not None:
+            self.pcm_cache.aput(key, speech)
+        return speech
@@ -0,0 +1,77 @@
+import io
+import os
+import types
+
+from pydub import AudioSegment
+
+from echo_journey.audio.pcm_audio import CHANNELS, SAMPLE_RATE, SAMPLE_WIDTH, PcmAudio
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+config = types.SimpleNamespace(
+    **{
+        # kbps steps a client may negotiate; few steps keep the TTS cache shared between sessions
+        "opus_bitrates": sorted(int(kbps) for kbps in os.getenv("TTS_OPUS_BITRATES", "12,16,24,32,48").split(",")),
+    }
+)
+
+PLATFORM_TO_OUTPUT_FORMAT = {
+    "ios": "ipod",
+    "android": "ipod",
+    "web": "webm",
+    "web-android": "webm",
+    "web-ios": "wav",
+}
+
+
+OPUS_FORMAT_PREFIX = "opus-"
+
+
+def negotiate_opus_bitrate(kbps):
+    """Snap a client requested Opus bitrate to the highest supported step not above it."""
+    if not kbps:
+        return None
+    bitrates = config.opus_bitrates
+    return max((bitrate for bitrate in bitrates if bitrate <= kbps), default=bitrates[0])
+
+
+def get_output_format(platform, opus_bitrate=None):
+    if opus_bitrate:
+        return f"{OPUS_FORMAT_PREFIX}{opus_bitrate}k"
+    output_format = PLATFORM_TO_OUTPUT_FORMAT.get(platform)
+    if output_format is None:
+        raise ValueError(f"Unsupported platform: {platform}")
+    return output_format
+
+
+def wav_to_pcm(wav_bytes) -> PcmAudio:
+    """Normalize a provider wav response into the canonical 16 kHz mono s16le PCM."""
+    audio_segment = AudioSegment.from_file(io.BytesIO(wav_bytes), format="wav")
+    audio_segment = audio_segment.set_frame_rate(SAMPLE_RATE)
+    audio_segment = audio_segment.set_sample_width(SAMPLE_WIDTH)   # 16 bits -> 2 bytes
+    audio_segment = audio_segment.set_channels(CHANNELS)       # Mono
+    return PcmAudio(audio_segment.raw_data)
+
+
+def encode_pcm(audio: PcmAudio, output_format) -> bytes:
+    if output_format == "wav":
+        # a wav container is only a header in front of the canonical PCM
+        return audio.wav_header() + audio.pcm
+    output_io = io.BytesIO()
+    if output_format.startswith(OPUS_FORMAT_PREFIX):
+        # Ogg Opus tuned for speech; 16 kHz mono stays intelligible at 12 kbps
+        audio.to_audio_segment().export(
+            output_io,
+            format="ogg",
+            codec="libopus",
+            bitrate=output_format[len(OPUS_FORMAT_PREFIX):],
+            parameters=["-application", "voip"],
+        )
+    else:
+        audio.to_audio_segment().export(output_io, format=output_format)
+    return output_io.getvalue()
+
+
+def encode_for_platform(wav_bytes, platform, opus_bitrate=None):
+    """Transcode a TTS wav response into the container the client platform plays."""
+    return encode_pcm(wav_to_pcm(wav_bytes), get_output_format(platform, opus_bitrate))
@@ -0,0 +1,36 @@
+import os
+import types
+
+from echo_journey.audio.text_to_speech.cached_tts import CachedTextToSpeech
+from echo_journey.audio.text_to_speech.huoshan_tts import HuoshanTTS
+from echo_journey.audio.text_to_speech.kanyun_tts import KanyunTTS
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+config = types.SimpleNamespace(
+    **{
+        "provider": os.getenv("TTS_PROVIDER", "kanyun"),
+    }
+)
+
+PROVIDER_TO_CLASS = {
+    "kanyun": KanyunTTS,
+    "huoshan": HuoshanTTS,
+}
+
+
+def get_tts(provider=None) -> CachedTextToSpeech:
+    provider = provider or config.provider
+    tts_class = PROVIDER_TO_CLASS.get(provider)
+    if tts_class is None:
+        raise ValueError(f"Unsupported TTS provider: {provider}")
+    return tts_class.get_instance()
+
+
+def report_tts():
+    """Cache counters of the providers this process has used."""
+    return {
+        provider: tts_class.get_instance().report()
+        for provider, tts_class in PROVIDER_TO_CLASS.items()
+        if tts_class.has_instance()
+    }
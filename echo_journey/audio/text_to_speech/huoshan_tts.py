@@ -6,12 +6,14 @@ import os
 import types
 import uuid
 
-import requests
+import aiohttp
 
 from echo_journey.audio.text_to_speech.base import (
-    TextToSpeech,
+    SynthesizedSpeech,
     TextAudioTimeline,
 )
+from echo_journey.audio.text_to_speech.cached_tts import CachedTextToSpeech
+from echo_journey.common.http_client import PooledHttpClient
 from echo_journey.common.utils import Singleton, timed, get_timer
 from dotenv import find_dotenv, load_dotenv
 _ = load_dotenv(find_dotenv())
@@ -27,27 +29,32 @@ config = types.SimpleNamespace(
         "cluster": "volcano_tts",
         "voice_type": "BV406_streaming",
         "api_url": "https://openspeech.bytedance.com/api/v1/tts",
+        "max_connections": int(os.getenv("HUOSHAN_TTS_MAX_CONNECTIONS", "16")),
+        "timeout": float(os.getenv("HUOSHAN_TTS_TIMEOUT", "10")),
+        "max_retries": int(os.getenv("HUOSHAN_TTS_MAX_RETRIES", "2")),
+        "retry_backoff": float(os.getenv("HUOSHAN_TTS_RETRY_BACKOFF", "0.3")),
     }
 )
 
+SUCCESS_CODE = 3000
+
+
+class HuoshanTTS(Singleton, CachedTextToSpeech):
+    cache_name = "huoshan_tts"
+    default_speaker = config.voice_type
+    default_speed_ratio = 1.2
 
-class HuoshanTTS(Singleton, TextToSpeech):
     def __init__(self):
         super().__init__()
         logger.info("Initializing [HUOSHAN Text To Speech] voices...")
+        self.http_client = PooledHttpClient(
+            "huoshan_tts",
+            max_connections=config.max_connections,
+            timeout=config.timeout,
+        )
 
-    @timed
-    async def generate_audio(
-        self, text, language="zh-CN", speaker=None
-    ):
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self.tts_sync, text)
-
-    def tts_sync(self, text):
-        timer.start("HUOSHAN_TTS")
-        header = {"Authorization": f"Bearer;{config.access_token}"}
-
-        request_json = {
+    def build_request(self, text, speaker, speed_ratio):
+        return {
             "app": {
                 "appid": config.app_id,
                 "token": config.access_token,
@@ -55,9 +62,11 @@ class HuoshanTTS(Singleton, TextToSpeech):
             },
             "user": {"uid": "388808087185088"},
             "audio": {
-                "voice_type": config.voice_type,
-                "encoding": "mp3",
-                "speed_ratio": 1.2,
+                "voice_type": speaker,
+                # wav at the canonical rate, so no resampling is needed before caching
+                "encoding": "wav",
+                "rate": 16000,
+                "speed_ratio": speed_ratio,
                 "volume_ratio": 1.0,
                 "pitch_ratio": 0.9,
                 "language": "cn",
@@ -74,23 +83,40 @@ class HuoshanTTS(Singleton, TextToSpeech):
             },
         }
 
-        try:
-            resp = requests.post(
-                config.api_url, json.dumps(request_json), headers=header
-            )
-            timer.log("HUOSHAN_TTS")
-
-            json_data = resp.json()
-            if "data" in json_data:
-                return base64.b64decode(
-                    json_data["data"]
-                ), _get_text_audio_timeline_list(json_data)
-            else:
-                logger.error(f"resp body: \n{resp.text}")
-        except Exception as e:
-            e.with_traceback()
+    @timed
+    async def synthesize(self, text, speaker, speed_ratio) -> SynthesizedSpeech:
+        json_data = await self._post_with_retries(text, speaker, speed_ratio)
+        audio = await self.transcode_pool.wav_to_pcm(base64.b64decode(json_data["data"]))
+        return SynthesizedSpeech(audio, _get_text_audio_timeline_list(json_data))
 
-        return b"", []
+    async def _post_with_retries(self, text, speaker, speed_ratio):
+        header = {"Authorization": f"Bearer;{config.access_token}"}
+        last_error = None
+        for attempt in range(config.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(config.retry_backoff * 2 ** (attempt - 1))
+            try:
+                # a fresh reqid per attempt, the service rejects duplicates
+                request_json = self.build_request(text, speaker, speed_ratio)
+                async with self.http_client.session.post(config.api_url, json=request_json, headers=header) as response:
+                    body = await response.text()
+                    if response.status >= 500:
+                        last_error = f"statusCode: {response.status}, responseContent: {body}"
+                        continue
+                    try:
+                        json_data = json.loads(body)
+                    except ValueError:
+                        raise RuntimeError(
+                            f"Error occur when HuoshanTTS.synthesize, statusCode: {response.status}, non-JSON resp body: {body}"
+                        )
+                    if json_data.get("code") == SUCCESS_CODE and "data" in json_data:
+                        return json_data
+                    # request errors (bad token, text) will not succeed on retry
+                    raise RuntimeError(f"Error occur when HuoshanTTS.synthesize, resp body: {body}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = repr(e)
+                logger.warning(f"HuoshanTTS attempt {attempt + 1} failed : {last_error}")
+        raise RuntimeError(f"Error occur when HuoshanTTS.synthesize after {config.max_retries + 1} attempts : {last_error}")
 
 
 def _get_text_audio_timeline_list(json_data):
@@ -104,8 +130,9 @@ def _get_text_audio_timeline_list(json_data):
                     time_audio_timeline_list.append(
                         TextAudioTimeline(
                             text=item["word"],
-                            start_time=item["start_time"],
-                            end_time=item["end_time"],
+                            # the frontend reports seconds, the protocol milliseconds
+                            start_time=round(item["start_time"] * 1000),
+                            end_time=round(item["end_time"] * 1000),
                         )
                     )
     return time_audio_timeline_list
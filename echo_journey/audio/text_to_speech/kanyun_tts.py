@@ -2,12 +2,9 @@ import asyncio
 import logging
 
 from py_yuntts_client import NacosClient, TtsRequest
-from pydub import AudioSegment
-from echo_journey.audio.text_to_speech.base import (
-    TextToSpeech,
-)
-import io
-from echo_journey.common.utils import Singleton, timed, get_timer
+from echo_journey.audio.text_to_speech.base import SynthesizedSpeech
+from echo_journey.audio.text_to_speech.cached_tts import CachedTextToSpeech
+from echo_journey.common.utils import Singleton, get_timer
 from dotenv import find_dotenv, load_dotenv
 _ = load_dotenv(find_dotenv())
 
@@ -15,18 +12,27 @@ logger = logging.getLogger(__name__)
 
 timer = get_timer()
 
-class KanyunTTS(Singleton, TextToSpeech):
+DEFAULT_SPEED_RATIO = 0.7
+
+
+class KanyunTTS(Singleton, CachedTextToSpeech):
+    cache_name = "kanyun_tts"
+    default_speaker = "podcast-16"
+    default_speed_ratio = DEFAULT_SPEED_RATIO
+
     def __init__(self):
         super().__init__()
         logger.info("Initializing [KANYUN Text To Speech] voices...")
         self.client = NacosClient(service_name="apeman-yuntts")
 
-    @timed
-    async def generate_audio(self, text, speaker="podcast-16", platform="web"):
+    async def synthesize(self, text, speaker, speed_ratio) -> SynthesizedSpeech:
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self.tts_sync, text, speaker, platform)
+        # the rpc blocks on I/O and stays on the thread pool; only the resampling goes to the workers
+        wav_bytes = await loop.run_in_executor(None, self.tts_sync, text, speaker, speed_ratio)
+        audio = await self.transcode_pool.wav_to_pcm(wav_bytes)
+        return SynthesizedSpeech(audio)
 
-    def tts_sync(self, text, speaker, platform):
+    def tts_sync(self, text, speaker, speed_ratio=DEFAULT_SPEED_RATIO) -> bytes:
         timer.start("KANYUN_TTS")
         tts_request = TtsRequest(
             text=text,
@@ -35,22 +41,7 @@ class KanyunTTS(Singleton, TextToSpeech):
             app_id="math-tutor",
             user_id="math-tutor-lab",
             language="zh-CN",
-            speed_ratio=0.7,
+            speed_ratio=speed_ratio,
         )
         tts_response = self.client.tts(tts_request)
-        audio_bytes = bytes.fromhex(tts_response.audio.audio_bytes)
-        audio_segment = AudioSegment.from_file(io.BytesIO(audio_bytes), format="wav")
-        audio_segment = audio_segment.set_frame_rate(16000)
-        audio_segment = audio_segment.set_sample_width(2)   # 16 bits -> 2 bytes
-        audio_segment = audio_segment.set_channels(1)       # Mono
-
-        output_io = io.BytesIO()
-        if platform == "ios" or platform == "android":
-            audio_segment.export(output_io, format="ipod")
-        elif platform == "web" or platform == "web-android":
-            audio_segment.export(output_io, format="webm")
-        elif platform == "web-ios":
-            audio_segment.export(output_io, format="wav")
-        else:
-            raise ValueError(f"Unsupported platform: {platform}")
-        return output_io.getvalue()
+        return bytes.fromhex(tts_response.audio.audio_bytes)
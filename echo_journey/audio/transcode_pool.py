@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import types
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from time import perf_counter
+
+from echo_journey.audio.pcm_audio import PcmAudio
+from echo_journey.audio.text_to_speech.encoding import encode_pcm, wav_to_pcm
+from echo_journey.common.utils import Singleton, get_timer
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+config = types.SimpleNamespace(
+    **{
+        "workers": int(os.getenv("TRANSCODE_POOL_WORKERS", "0")) or os.cpu_count() or 1,
+        "max_pending": int(os.getenv("TRANSCODE_POOL_MAX_PENDING", "0")),
+        "start_method": os.getenv("TRANSCODE_POOL_START_METHOD", "spawn"),
+    }
+)
+
+
+class TranscodeStats:
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        # pools replaced after a worker died
+        self.restarts = 0
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+class TranscodePool(Singleton):
+    """Worker processes reserved for pydub/ffmpeg decoding and encoding.
+
+    Transcodes are CPU bound and used to share the loop's default thread pool
+    with every other blocking call. Here at most `max_pending` jobs are handed
+    to the workers at once; further callers wait on the loop (back-pressure)
+    and are counted as queued.
+    """
+
+    def __init__(self, workers=config.workers, max_pending=config.max_pending):
+        self.workers = workers
+        self.max_pending = max_pending or workers * 2
+        self.stats = TranscodeStats()
+        self._executor: ProcessPoolExecutor = None
+        self._semaphore: asyncio.Semaphore = None
+        self._semaphore_loop = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            logger.info(f"Starting transcode pool with {self.workers} workers")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(config.start_method),
+            )
+        return self._executor
+
+    def _get_semaphore(self):
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def run(self, func, *args):
+        """Run a picklable module-level function in a worker process."""
+        stats = self.stats
+        stats.submitted += 1
+        stats.queued += 1
+        if stats.queued > stats.max_queued:
+            stats.max_queued = stats.queued
+            if stats.running >= self.max_pending:
+                # a new high-water mark of jobs held back by max_pending
+                logger.info(f"TranscodePool queue depth reached {stats.queued}: {self.report()}")
+        started = perf_counter()
+        semaphore = self._get_semaphore()
+        try:
+            await semaphore.acquire()
+        finally:
+            stats.queued -= 1
+        get_timer().record("TranscodePool.queue", perf_counter() - started)
+        stats.running += 1
+        try:
+            return await self._submit(func, *args)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats.failed += 1
+            raise
+        finally:
+            stats.running -= 1
+            semaphore.release()
+
+    async def _submit(self, func, *args):
+        loop = asyncio.get_running_loop()
+        started = perf_counter()
+        try:
+            result = await loop.run_in_executor(self.executor, func, *args)
+        except BrokenProcessPool:
+            # a worker died (e.g. OOM killed); replace the pool so later jobs still run
+            logger.error("Error occur when TranscodePool worker died, restarting the pool")
+            self.stats.restarts += 1
+            self.shutdown(wait=False)
+            raise
+        self.stats.completed += 1
+        get_timer().record(f"TranscodePool.{func.__name__}", perf_counter() - started)
+        return result
+
+    async def decode(self, audio_bytes, platform="web") -> PcmAudio:
+        return await self.run(PcmAudio.decode, audio_bytes, platform)
+
+    async def wav_to_pcm(self, wav_bytes) -> PcmAudio:
+        return await self.run(wav_to_pcm, wav_bytes)
+
+    async def encode(self, audio: PcmAudio, output_format) -> bytes:
+        if output_format == "wav":
+            # header + PCM, not worth the round trip to a worker
+            return encode_pcm(audio, output_format)
+        return await self.run(encode_pcm, audio, output_format)
+
+    def report(self):
+        return {"workers": self.workers, "max_pending": self.max_pending, **self.stats.as_dict()}
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,58 @@
+import logging
+import os
+import types
+
+import numpy as np
+
+from echo_journey.audio.pcm_audio import PcmAudio
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+config = types.SimpleNamespace(
+    **{
+        "enabled": os.getenv("VAD_ENABLED", "true").lower() == "true",
+        "frame_ms": int(os.getenv("VAD_FRAME_MS", "30")),
+        "energy_threshold_dbfs": float(os.getenv("VAD_ENERGY_THRESHOLD_DBFS", "-45")),
+        "relative_threshold_db": float(os.getenv("VAD_RELATIVE_THRESHOLD_DB", "30")),
+        "min_speech_ms": int(os.getenv("VAD_MIN_SPEECH_MS", "150")),
+        "padding_ms": int(os.getenv("VAD_PADDING_MS", "200")),
+    }
+)
+
+
+def frame_energies_dbfs(samples: np.ndarray, frame_size: int) -> np.ndarray:
+    frame_count = len(samples) // frame_size
+    frames = samples[:frame_count * frame_size].reshape(frame_count, frame_size).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1)) / 32768.0
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def trim_silence(audio: PcmAudio):
+    """Cut leading/trailing silence; return None when the clip holds no speech.
+
+    A frame counts as speech when its RMS energy is above both the absolute
+    floor and `relative_threshold_db` below the loudest frame of the clip.
+    """
+    if not config.enabled:
+        return audio
+    frame_size = audio.sample_rate * config.frame_ms // 1000
+    samples = np.frombuffer(audio.pcm, dtype="<i2")
+    if len(samples) < frame_size:
+        return None
+    energies = frame_energies_dbfs(samples, frame_size)
+    threshold = max(config.energy_threshold_dbfs, float(energies.max()) - config.relative_threshold_db)
+    speech_frames = np.flatnonzero(energies > threshold)
+    if len(speech_frames) * config.frame_ms < config.min_speech_ms:
+        logger.info(f"No speech detected, peak energy {energies.max():.1f} dBFS over {audio.duration:.2f}s")
+        return None
+    padding_frames = config.padding_ms // config.frame_ms
+    start_frame = max(0, speech_frames[0] - padding_frames)
+    end_frame = min(len(energies), speech_frames[-1] + 1 + padding_frames)
+    if end_frame == len(energies):
+        # keep the tail that did not fill a whole frame
+        end_sample = len(samples)
+    else:
+        end_sample = end_frame * frame_size
+    return audio.trim(start_frame * frame_size, end_sample)
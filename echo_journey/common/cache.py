@@ -0,0 +1,308 @@
+import asyncio
+import hashlib
+import logging
+import os
+# only loads the private disk tier, see _load
+import pickle  # nosec B403
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+# an over-budget disk tier is trimmed to this fraction of disk_max_bytes, so eviction runs in batches
+DISK_EVICTION_TARGET = 0.9
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def to_dict(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class LruCache:
+    """In-memory LRU with a TTL and an optional pickle-per-entry disk tier.
+
+    A memory miss falls through to `disk_dir` (when set) and promotes the entry
+    back into memory; entries older than `ttl` seconds are treated as misses
+    in both tiers. With `sizeof`, memory is also bounded by `max_bytes`; the
+    disk tier is bounded by `disk_max_bytes` and evicts least recently read
+    files first (reads touch the file's mtime). Eviction runs in a background
+    thread off an in-memory index of the files, rebuilt from the directory at
+    most every `disk_rescan_interval` seconds so that processes sharing
+    `disk_dir` see each other's writes.
+
+    Coroutines use `aget`/`aput`, which keep disk reads and writes off the
+    event loop; `get`/`put` do the same work inline for synchronous callers.
+
+    The disk tier unpickles its files, so `disk_dir` must be a directory only
+    this service can write to (it is created with mode 0700).
+    """
+
+    def __init__(
+        self,
+        name,
+        max_entries=1024,
+        ttl: Optional[float] = None,
+        disk_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        disk_max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+        disk_rescan_interval: float = 60,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_dir = os.path.join(disk_dir, name) if disk_dir else None
+        self.max_bytes = max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.sizeof = sizeof
+        self.disk_rescan_interval = disk_rescan_interval
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._size = 0
+        self._disk_size = 0
+        # disk reads and write-behind stores run in worker threads
+        self._disk_lock = threading.RLock()
+        self._pending_stores: set[asyncio.Task] = set()
+        # path -> size of the files on disk, least recently used first
+        self._disk_index: OrderedDict[str, int] = OrderedDict()
+        self._disk_scanned_at = 0.0
+        self._eviction_thread: threading.Thread = None
+        if self.disk_dir:
+            # only this service writes here; keep the directory private to its user
+            os.makedirs(self.disk_dir, mode=0o700, exist_ok=True)
+            self._rescan_disk()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _expired(self, stored_at):
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def _get_from_memory(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        stored_at, value = entry
+        if self._expired(stored_at):
+            self._forget(key)
+            return _MISSING
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def _promote(self, key, loaded, default):
+        if loaded is _MISSING:
+            self.stats.misses += 1
+            return default
+        stored_at, value = loaded
+        self.stats.hits += 1
+        self.stats.disk_hits += 1
+        # keep the age of the file, a promoted entry must not outlive its ttl
+        self._remember(key, value, stored_at)
+        return value
+
+    def get(self, key: str, default=None):
+        value = self._get_from_memory(key)
+        if value is not _MISSING:
+            return value
+        return self._promote(key, self._load(key), default)
+
+    async def aget(self, key: str, default=None):
+        value = self._get_from_memory(key)
+        if value is not _MISSING:
+            return value
+        loaded = await asyncio.to_thread(self._load, key) if self.disk_dir else _MISSING
+        return self._promote(key, loaded, default)
+
+    def put(self, key: str, value):
+        self._remember(key, value, time.time())
+        self._store(key, value)
+
+    def aput(self, key: str, value):
+        """Put into memory now; the disk copy is written behind in a worker thread."""
+        self._remember(key, value, time.time())
+        if not self.disk_dir:
+            return
+        task = asyncio.ensure_future(asyncio.to_thread(self._store, key, value))
+        self._pending_stores.add(task)
+        task.add_done_callback(self._pending_stores.discard)
+
+    async def flush(self):
+        """Wait for the disk writes started by `aput`."""
+        if self._pending_stores:
+            await asyncio.gather(*self._pending_stores)
+
+    def _entry_size(self, value):
+        return self.sizeof(value) if self.sizeof else 0
+
+    def _remember(self, key, value, stored_at):
+        if key in self._entries:
+            self._forget(key)
+        self._entries[key] = (stored_at, value)
+        self._size += self._entry_size(value)
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._size > self.max_bytes and len(self._entries) > 1
+        ):
+            self._forget(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def _forget(self, key):
+        _, value = self._entries.pop(key)
+        self._size -= self._entry_size(value)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(key.encode("utf-8"), usedforsecurity=False).hexdigest() + ".pkl")
+
+    def _load(self, key):
+        if not self.disk_dir:
+            return _MISSING
+        path = self._disk_path(key)
+        try:
+            stored_at = os.path.getmtime(path)
+            if self._expired(stored_at):
+                self._remove_file(path)
+                return _MISSING
+            with open(path, "rb") as f:
+                # trusted: files are only ever written by _store of this service into its own private cache dir
+                value = pickle.load(f)  # nosec B301
+            if self.ttl is None:
+                # mtime doubles as the recency used by disk eviction
+                os.utime(path)
+                with self._disk_lock:
+                    if path in self._disk_index:
+                        self._disk_index.move_to_end(path)
+            return stored_at, value
+        except FileNotFoundError:
+            return _MISSING
+        except Exception as e:
+            logger.error(f"Error occur when LruCache({self.name})._load : {e}")
+            return _MISSING
+
+    def _store(self, key, value):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+            with self._disk_lock:
+                self._disk_size += size - self._disk_index.pop(path, 0)
+                self._disk_index[path] = size
+        except Exception as e:
+            logger.error(f"Error occur when LruCache({self.name})._store : {e}")
+            return
+        self._schedule_disk_eviction()
+
+    def _remove_file(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # another process sharing the directory got there first
+            pass
+        with self._disk_lock:
+            self._disk_size -= self._disk_index.pop(path, 0)
+
+    def _rescan_disk(self):
+        files = []
+        for file_name in os.listdir(self.disk_dir):
+            if not file_name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.disk_dir, file_name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, path, stat.st_size))
+        files.sort()
+        with self._disk_lock:
+            self._disk_index = OrderedDict((path, size) for _, path, size in files)
+            self._disk_size = sum(self._disk_index.values())
+            self._disk_scanned_at = time.monotonic()
+
+    def _schedule_disk_eviction(self):
+        if self.disk_max_bytes is None:
+            return
+        index_stale = time.monotonic() - self._disk_scanned_at > self.disk_rescan_interval
+        with self._disk_lock:
+            if self._disk_size <= self.disk_max_bytes and not index_stale:
+                return
+            if self._eviction_thread is not None and self._eviction_thread.is_alive():
+                return
+            self._eviction_thread = threading.Thread(
+                target=self._evict_disk, name=f"LruCache({self.name}).evict", daemon=True
+            )
+            self._eviction_thread.start()
+
+    def _evict_disk(self):
+        try:
+            if time.monotonic() - self._disk_scanned_at > self.disk_rescan_interval:
+                self._rescan_disk()
+            if self._disk_size <= self.disk_max_bytes:
+                return
+            target = self.disk_max_bytes * DISK_EVICTION_TARGET
+            evicted = 0
+            while True:
+                with self._disk_lock:
+                    if self._disk_size <= target or not self._disk_index:
+                        break
+                    path = next(iter(self._disk_index))
+                    self.stats.evictions += 1
+                self._remove_file(path)
+                evicted += 1
+            logger.info(f"LruCache({self.name}) evicted {evicted} disk files: {self.report()}")
+        except Exception as e:
+            logger.error(f"Error occur when LruCache({self.name})._evict_disk : {e}")
+
+    def clear(self):
+        self._entries.clear()
+        self._size = 0
+
+    def report(self):
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "disk_bytes": self._disk_size,
+            **self.stats.to_dict(),
+        }
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one execution.
+
+    Waiters share the result (or exception) of the first call; a cancelled
+    waiter does not cancel the shared work.
+    """
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def __len__(self):
+        return len(self._inflight)
+
+    async def run(self, key: str, factory: Callable[[], Awaitable[Any]]):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
@@ -0,0 +1,53 @@
+import asyncio
+import logging
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class PooledHttpClient:
+    """Keep-alive aiohttp session shared by every request to one backend.
+
+    The session is created lazily on the running loop (and recreated if that
+    loop changes), with a per-backend connection limit and request timeout.
+    """
+
+    _clients: list["PooledHttpClient"] = []
+
+    def __init__(self, name, max_connections=32, timeout=10.0, connect_timeout=3.0, keepalive_timeout=60.0):
+        self.name = name
+        self.max_connections = max_connections
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self.keepalive_timeout = keepalive_timeout
+        self._session: aiohttp.ClientSession = None
+        self._loop = None
+        PooledHttpClient._clients.append(self)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            logger.info(f"Opening http pool [{self.name}] with {self.max_connections} connections")
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._loop = loop
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    @classmethod
+    async def close_all(cls):
+        for client in cls._clients:
+            try:
+                await client.close()
+            except Exception as e:
+                logger.error(f"Error occur when closing http pool [{client.name}] : {e}")
@@ -31,6 +31,10 @@ class Singleton:
 
         return cls._instances[cls]
 
+    @classmethod
+    def has_instance(cls):
+        return cls in cls._instances
+
     @classmethod
     def initialize(cls, *args, **kwargs):
         """Static access method."""
@@ -84,13 +88,16 @@ class Timer(Singleton):
         if id in self.start_time:
             elapsed_time = perf_counter() - self.start_time[id]
             del self.start_time[id]
-            if id in self.elapsed_time:
-                self.elapsed_time[id].append(elapsed_time)
-            else:
-                self.elapsed_time[id] = [elapsed_time]
+            self.record(id, elapsed_time)
             if callback:
                 callback()
 
+    def record(self, id: str, elapsed_time: float):
+        if id in self.elapsed_time:
+            self.elapsed_time[id].append(elapsed_time)
+        else:
+            self.elapsed_time[id] = [elapsed_time]
+
     def report(self):
         for id, t in self.elapsed_time.items():
             self.logger.info(
@@ -1,13 +1,87 @@
 import yaml
 
+from echo_journey.data.llms.tokens import message_token_count
+
+
+def _parse_prefix_messages(text):
+    try:
+        return yaml.safe_load(text) or [], True
+    except Exception as e:
+        return [], False
+
+
 class AssistantContent:
-    def __init__(self, content: dict):
-        self.system_prompt = content.get("system_prompt", "")
-        self.user_prompt_prefix = content.get("user_prompt_prefix", "")
-        self.prefix_messages = content.get("prefix_messages", "[]")
-        self.commit_last_n_rounds = content.get("commit_last_n_rounds", False)
-        self.keep_round_nums = content.get("keep_round_nums", 0)
-        self.json_mode = content.get("json_mode", True)
+    """Parsed prompt of one assistant, shared read-only by every session using it.
+
+    Instances are immutable; per-session changes such as a personalized
+    system prompt go through `derive`, which returns a new layer that reuses
+    everything it does not override (prefix messages are parsed only once).
+    """
+
+    FIELDS = (
+        "system_prompt",
+        "user_prompt_prefix",
+        "prefix_messages",
+        "commit_last_n_rounds",
+        "keep_round_nums",
+        "json_mode",
+        "response_cache",
+        "max_prompt_tokens",
+    )
+
+    def __init__(self, content: dict, _prefix_messages_in_list=None, _prefix_messages_valid=True):
+        values = {
+            "system_prompt": content.get("system_prompt", ""),
+            "user_prompt_prefix": content.get("user_prompt_prefix", ""),
+            "prefix_messages": content.get("prefix_messages", "[]"),
+            "commit_last_n_rounds": content.get("commit_last_n_rounds", False),
+            "keep_round_nums": content.get("keep_round_nums", 0),
+            "json_mode": content.get("json_mode", True),
+            # true, or {"ttl": ..., "max_entries": ...}: reuse replies to identical temperature 0 requests
+            "response_cache": content.get("response_cache", False),
+            # token budget of a request; None falls back to LLM_MAX_PROMPT_TOKENS, 0 disables trimming
+            "max_prompt_tokens": content.get("max_prompt_tokens", None),
+        }
+        if _prefix_messages_in_list is None:
+            _prefix_messages_in_list, _prefix_messages_valid = _parse_prefix_messages(values["prefix_messages"])
+        values["prefix_messages_in_list"] = _prefix_messages_in_list
+        values["prefix_messages_valid"] = _prefix_messages_valid
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"AssistantContent is immutable, use derive({key}=...) instead")
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def derive(self, **overrides) -> "AssistantContent":
+        unknown = set(overrides) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown AssistantContent fields: {sorted(unknown)}")
+        if "prefix_messages" in overrides:
+            return AssistantContent({**self.to_dict(), **overrides})
+        return AssistantContent(
+            {**self.to_dict(), **overrides},
+            _prefix_messages_in_list=self.prefix_messages_in_list,
+            _prefix_messages_valid=self.prefix_messages_valid,
+        )
+
+    def prompt_token_count(self):
+        """Tokens of the system prompt and prefix messages, counted once per content."""
+        token_count = self.__dict__.get("_prompt_token_count")
+        if token_count is None:
+            token_count = message_token_count({"role": "system", "content": self.system_prompt}) + sum(
+                message_token_count(msg) for msg in self.prefix_messages_in_list
+            )
+            object.__setattr__(self, "_prompt_token_count", token_count)
+        return token_count
 
     def is_empty(self):
         return (
@@ -15,18 +89,3 @@ class AssistantContent:
             and not self.user_prompt_prefix
             and not self.prefix_messages_in_list
         )
-
-    @property
-    def prefix_messages(self):
-        return self._prefix_messages
-
-    @prefix_messages.setter
-    def prefix_messages(self, text):
-        self._prefix_messages = text
-        try:
-            self.prefix_messages_in_list = yaml.safe_load(self.prefix_messages)
-        except Exception as e:
-            self.prefix_messages_in_list = []
-
-        if not self.prefix_messages_in_list:
-            self.prefix_messages_in_list = []
\ No newline at end of file
@@ -5,7 +5,8 @@ import random
 import time
 
 from pypinyin import Style, pinyin
-from echo_journey.audio.text_to_speech.kanyun_tts import KanyunTTS
+from echo_journey.audio.text_to_speech.cached_tts import CachedTextToSpeech
+from echo_journey.audio.text_to_speech.factory import get_tts
 from echo_journey.common.utils import chinese_to_pinyin, device_id_var, generate_diff, parse_pinyin
 from datetime import datetime
 
@@ -75,7 +76,7 @@ class HistoryLearnSituation:
             self.scene_2_timestamp = {}
         
         self.data: list[LearnSituation] = []
-        self.tts: KanyunTTS = KanyunTTS.get_instance()
+        self.tts: CachedTextToSpeech = get_tts()
         files = self._get_all_files(storage_dir)
         for file_path in files:
             with open(file_path, 'r') as f:
@@ -113,22 +114,25 @@ class HistoryLearnSituation:
                 latest_timestamp = timestamp
         return latest_practise_scene
                                                 
-    def build_wrong_pronunciation_book(self, platform):
-        result = {"initials": {}, "finals": {}}
+    async def build_wrong_pronunciation_book(self, platform):
+        words = []
         for learn_situation in self.data:
             for _, word_2_wrong_pron_list in learn_situation.scene_2_word_2_wrong_pron_list.items():
-                for word in word_2_wrong_pron_list.keys():
-                    word_msg_list = parse_pinyin(word)
-                    audio_bytes = self.tts.generate_audio(word, platform=platform)
-                    for word_msg in word_msg_list:
-                        if word_msg.initial_consonant:
-                            if word_msg.initial_consonant not in result["initials"]:
-                                result["initials"][word_msg.initial_consonant] = []
-                            result["initials"][word_msg.initial_consonant].append([word_msg_list, audio_bytes])
-                        if word_msg.vowels:
-                            if word_msg.vowels not in result["finals"]:
-                                result["finals"][word_msg.vowels] = []
-                            result["finals"][word_msg.vowels].append([word_msg_list, audio_bytes])
+                words.extend(word_2_wrong_pron_list.keys())
+        word_2_audio = await self.tts.generate_audio_batch(words, platform=platform)
+        result = {"initials": {}, "finals": {}}
+        for word in words:
+            word_msg_list = parse_pinyin(word)
+            audio_bytes = word_2_audio.get(word)
+            for word_msg in word_msg_list:
+                if word_msg.initial_consonant:
+                    if word_msg.initial_consonant not in result["initials"]:
+                        result["initials"][word_msg.initial_consonant] = []
+                    result["initials"][word_msg.initial_consonant].append([word_msg_list, audio_bytes])
+                if word_msg.vowels:
+                    if word_msg.vowels not in result["finals"]:
+                        result["finals"][word_msg.vowels] = []
+                    result["finals"][word_msg.vowels].append([word_msg_list, audio_bytes])
         return result
     
     async def generate_title_info(self):
@@ -0,0 +1,131 @@
+ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class JsonFieldStream:
+    """Pull top-level string fields out of a JSON object as it streams in.
+
+    `feed` takes raw chunks of the LLM's JSON reply and returns the newly
+    decoded characters of each of `fields` seen in that chunk, so e.g. the
+    "teacher" text can be shown and spoken before "skip" or "new_practise"
+    are generated. Everything else is scanned but ignored; `complete` turns
+    true once the top-level object is closed.
+    """
+
+    def __init__(self, fields):
+        self.fields = set(fields)
+        self.done_fields = set()
+        self.complete = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._unicode_digits = None
+        self._high_surrogate = None
+        self._string_chars = []
+        self._expect_key = False
+        self._is_key = False
+        self._last_key = None
+        self._value_pending = None
+        self._capturing = None
+
+    def feed(self, chunk) -> dict[str, str]:
+        output = {}
+        for char in chunk:
+            if self._in_string:
+                self._feed_string_char(char, output)
+            else:
+                self._feed_structural_char(char)
+        return {field: "".join(chars) for field, chars in output.items()}
+
+    def _feed_structural_char(self, char):
+        if char.isspace():
+            return
+        if self._value_pending:
+            field, self._value_pending = self._value_pending, None
+            if char == '"':
+                self._start_string(is_key=False, capture=None if field in self.done_fields else field)
+                return
+        if char == '"':
+            is_key = self._depth == 1 and self._expect_key
+            self._start_string(is_key=is_key, capture=None)
+            if is_key:
+                self._expect_key = False
+        elif char in "{[":
+            self._depth += 1
+            self._expect_key = char == "{" and self._depth == 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self.complete = True
+        elif char == "," and self._depth == 1:
+            self._expect_key = True
+        elif char == ":" and self._depth == 1 and self._last_key in self.fields:
+            self._value_pending = self._last_key
+            self._last_key = None
+
+    def _start_string(self, is_key, capture):
+        self._in_string = True
+        self._is_key = is_key
+        self._capturing = capture
+        self._string_chars = []
+
+    def _emit(self, text, output):
+        if self._capturing:
+            output.setdefault(self._capturing, []).append(text)
+        elif self._is_key:
+            self._string_chars.append(text)
+
+    def _feed_string_char(self, char, output):
+        if self._unicode_digits is not None:
+            self._unicode_digits += char
+            if len(self._unicode_digits) == 4:
+                code = int(self._unicode_digits, 16)
+                self._unicode_digits = None
+                if 0xD800 <= code < 0xDC00:
+                    self._high_surrogate = code
+                elif 0xDC00 <= code < 0xE000 and self._high_surrogate is not None:
+                    combined = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+                    self._high_surrogate = None
+                    self._emit(chr(combined), output)
+                else:
+                    self._emit(chr(code), output)
+        elif self._escape:
+            self._escape = False
+            if char == "u":
+                self._unicode_digits = ""
+            else:
+                self._emit(ESCAPES.get(char, char), output)
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            if self._capturing:
+                self.done_fields.add(self._capturing)
+                self._capturing = None
+            elif self._is_key:
+                self._last_key = "".join(self._string_chars)
+        else:
+            self._emit(char, output)
+
+
+class JsonStringFieldStream(JsonFieldStream):
+    """JsonFieldStream of a single field; `feed` returns just that field's new text."""
+
+    def __init__(self, field):
+        super().__init__([field])
+        self.field = field
+
+    @property
+    def done(self):
+        return self.field in self.done_fields
+
+    def feed(self, chunk) -> str:
+        return super().feed(chunk).get(self.field, "")
@@ -1,4 +1,5 @@
 import abc
+from collections.abc import Mapping
 
 class LLM(abc.ABC):
 
@@ -14,6 +15,20 @@ class LLM(abc.ABC):
     def get_config_name(self):
         pass
 
+    def cache_identity(self) -> dict:
+        """What determines the model's output, for response cache keys."""
+        return {"config_name": self.get_config_name()}
+
+    async def acomplete(self, messages, **kwargs) -> str:
+        """Whole reply content; backends with a non-streamed call should override this."""
+        accumulator = DeltaAccumulator()
+        async for delta, is_restart_commit in self.acommit(messages, **kwargs):
+            if is_restart_commit:
+                accumulator = DeltaAccumulator()
+                continue
+            accumulator.add(delta)
+        return accumulator.content
+
 
 def merge_deltas(original, delta):
     """
@@ -34,3 +49,71 @@ def merge_deltas(original, delta):
             else:
                 original[key] = value
     return original
+
+
+
+class DeltaAccumulator:
+    """One assistant message rebuilt from streamed deltas in linear time.
+
+    Content fragments are appended to a list and joined only when the
+    content is read; the remaining keys (role, function_call) are few and
+    still go through merge_deltas.
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self.has_content = False
+        self._content = ""
+        self._parts = []
+
+    def add(self, delta):
+        for key, value in delta.items():
+            if key == "content":
+                self.has_content = True
+                if value:
+                    self._parts.append(value)
+            elif value is not None:
+                merge_deltas(self.fields, {key: value})
+
+    @property
+    def role(self):
+        return self.fields.get("role")
+
+    @property
+    def content(self):
+        if self._parts:
+            self._content += "".join(self._parts)
+            self._parts.clear()
+        return self._content
+
+    def view(self) -> "AccumulatedMessage":
+        return AccumulatedMessage(self)
+
+
+class AccumulatedMessage(Mapping):
+    """Live read-only view of the message a DeltaAccumulator is building.
+
+    Streaming consumers mostly only read the delta, so the content is joined
+    when (and only if) the view is read rather than once per token.
+    """
+
+    KEYS = ("role", "content")
+
+    def __init__(self, accumulator: DeltaAccumulator):
+        self._accumulator = accumulator
+
+    def __getitem__(self, key):
+        if key == "role":
+            return self._accumulator.role
+        if key == "content":
+            return self._accumulator.content
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return repr(dict(self))
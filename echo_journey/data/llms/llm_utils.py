@@ -1,7 +1,25 @@
+import copy
+import logging
+import os
+import threading
+import time
+import types
+
+from echo_journey.common.utils import Singleton
 from .llm import LLM
 from .openai import OpenaiLLM
 import yaml
-import os
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+config = types.SimpleNamespace(
+    **{
+        # seconds between checks of llm_configs.yaml for edits
+        "reload_interval": float(os.getenv("LLM_CONFIG_RELOAD_INTERVAL", "5")),
+    }
+)
 
 
 def _get_config_path() -> str:
@@ -15,23 +33,72 @@ def _get_config_path() -> str:
     return os.path.join(current_dir, "llm_configs.yaml")
 
 
-def create_llm(config_name: str) -> LLM:
-    llm_config = get_llm_config(config_name)
+class LLMRegistry(Singleton):
+    """llm_configs.yaml parsed once per process, and one shared LLM client per config name.
+
+    The file's mtime is checked at most every `reload_interval` seconds; when
+    it changes the configs are re-read and clients whose config differs are
+    rebuilt on next use. Clients hold no per-session state, so every
+    WholeContext using a config name shares the same instance.
+    """
+
+    def __init__(self, path=None, reload_interval=config.reload_interval):
+        self.path = path or _get_config_path()
+        self.reload_interval = reload_interval
+        self._configs: dict[str, dict] = {}
+        self._mtime = None
+        self._checked_at = None
+        self._llms: dict[str, LLM] = {}
+        self._lock = threading.Lock()
 
-    if llm_config["api_type"] in ["azure", "openai"]:
-        return OpenaiLLM(config_name, **llm_config)
-    else:
-        raise ValueError(f"Unknown api_type: {llm_config['api_type']}")
+    def configs(self) -> dict[str, dict]:
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.reload_interval:
+            with self._lock:
+                self._checked_at = now
+                self._reload_if_changed()
+        return self._configs
+
+    def _reload_if_changed(self):
+        mtime = os.stat(self.path).st_mtime
+        if mtime == self._mtime:
+            return
+        with open(self.path, "r") as yaml_file:
+            yaml_data: dict = yaml.safe_load(yaml_file) or {}
+        if self._mtime is not None:
+            logger.info(f"Reloaded LLM configs from {self.path}")
+        for config_name in list(self._llms):
+            if yaml_data.get(config_name) != self._configs.get(config_name):
+                del self._llms[config_name]
+        self._configs = yaml_data
+        self._mtime = mtime
+
+    def get_config(self, config_name) -> dict:
+        return copy.deepcopy(self.configs()[config_name])
+
+    def get(self, config_name) -> LLM:
+        configs = self.configs()
+        llm = self._llms.get(config_name)
+        if llm is None:
+            llm = self._build(config_name, configs[config_name])
+            self._llms[config_name] = llm
+        return llm
+
+    @staticmethod
+    def _build(config_name, llm_config) -> LLM:
+        if llm_config["api_type"] in ["azure", "openai"]:
+            return OpenaiLLM(config_name, **llm_config)
+        else:
+            raise ValueError(f"Unknown api_type: {llm_config['api_type']}")
+
+
+def create_llm(config_name: str) -> LLM:
+    return LLMRegistry.get_instance().get(config_name)
 
 
 def get_llm_config(config_name):
-    with open(_get_config_path(), "r") as yaml_file:
-        yaml_data: dict = yaml.safe_load(yaml_file)
-    llm_config = yaml_data[config_name]
-    return llm_config
+    return LLMRegistry.get_instance().get_config(config_name)
 
 
 def get_llm_names() -> list[str]:
-    with open(_get_config_path(), "r") as yaml_file:
-        yaml_data: dict = yaml.safe_load(yaml_file)
-    return list(yaml_data.keys())
\ No newline at end of file
+    return list(LLMRegistry.get_instance().configs().keys())
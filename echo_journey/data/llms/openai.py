@@ -1,13 +1,30 @@
 import asyncio
 import copy
 import logging
+import os
 import time
 
 import openai
 
+from echo_journey.common.http_client import PooledHttpClient
 from .llm import LLM
 logger = logging.getLogger(__name__)
 
+# one keep-alive pool for every streamed completion; openai opens a session per request otherwise
+http_client = PooledHttpClient(
+    "openai",
+    max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "64")),
+    timeout=float(os.getenv("LLM_TIMEOUT", "600")),
+)
+
+MAX_MESSAGES_CHARS = 100 * 1000
+
+
+def check_messages_size(messages: list[dict]):
+    # assert message["content"]的总长度小于100K
+    assert sum([len(message["content"]) for message in messages]) < MAX_MESSAGES_CHARS
+
+
 class OpenaiLLM(LLM):
     def __init__(self, config_name="OpenaiLLM", **kwargs):
         self.api_key = kwargs.get("api_key", None)
@@ -30,6 +47,11 @@ class OpenaiLLM(LLM):
     def get_config_name(self):
         return self.config_name
 
+    def cache_identity(self):
+        config_dict = self._to_config_dict()
+        config_dict.pop("api_key", None)
+        return config_dict
+
     def commit(
         self,
         messages: list[dict],
@@ -71,7 +93,7 @@ class OpenaiLLM(LLM):
                     sleep_list = [0, 60, 120, 180]
                     time.sleep(sleep_list[retry_count])
 
-    async def acommit(
+    async def acomplete(
         self,
         messages: list[dict],
         functions: list[dict] = None,
@@ -79,9 +101,43 @@ class OpenaiLLM(LLM):
         json_mode=True,
         **kwargs,
     ):
+        check_messages_size(messages)
+        config_dict = self._to_config_dict()
+        if functions:
+            config_dict["functions"] = functions
 
-        # assert message["content"]的总长度小于100K
-        assert sum([len(message["content"]) for message in messages]) < 100 * 1000
+        extra_control_params = dict()
+        if json_mode:
+            extra_control_params["response_format"] = {"type": "json_object"}
+
+        session_token = openai.aiosession.set(http_client.session)
+        try:
+            response = await openai.ChatCompletion.acreate(
+                messages=messages,
+                temperature=temperature,
+                stream=False,
+                **extra_control_params,
+                **config_dict,
+            )
+        except Exception as e:
+            logger.exception(
+                "complete_with_llm_async failed, messages: {}",
+                messages,
+            )
+            raise e
+        finally:
+            openai.aiosession.reset(session_token)
+        return response.choices[0]["message"].get("content") or ""
+
+    async def acommit(
+        self,
+        messages: list[dict],
+        functions: list[dict] = None,
+        temperature=0,
+        json_mode=True,
+        **kwargs,
+    ):
+        check_messages_size(messages)
 
         while True:
             try:
@@ -93,13 +149,17 @@ class OpenaiLLM(LLM):
                 if json_mode:
                     extra_control_params["response_format"] = {"type": "json_object"}
 
-                response = await openai.ChatCompletion.acreate(
-                    messages=messages,
-                    temperature=temperature,
-                    stream=True,
-                    **extra_control_params,
-                    **config_dict,
-                )
+                session_token = openai.aiosession.set(http_client.session)
+                try:
+                    response = await openai.ChatCompletion.acreate(
+                        messages=messages,
+                        temperature=temperature,
+                        stream=True,
+                        **extra_control_params,
+                        **config_dict,
+                    )
+                finally:
+                    openai.aiosession.reset(session_token)
 
                 async for chunk in response:
                     if (
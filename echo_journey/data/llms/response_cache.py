@@ -0,0 +1,60 @@
+import hashlib
+import json
+import os
+import types
+
+from echo_journey.common.cache import LruCache
+from echo_journey.common.utils import Singleton
+from .llm import LLM
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+config = types.SimpleNamespace(
+    **{
+        "enabled": os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true",
+        "max_entries": int(os.getenv("LLM_CACHE_MAX_ENTRIES", "4096")),
+        "ttl": float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+        "disk_dir": os.getenv("LLM_CACHE_DIR") or None,
+    }
+)
+
+
+class LlmResponseCache(Singleton):
+    """Replies of deterministic assistants, one LruCache per assistant that opted in.
+
+    An assistant opts in with `"response_cache": true` in its prompt file, or
+    a dict overriding `ttl` / `max_entries`. Keys hash the exact messages
+    sent together with the model identity and sampling parameters.
+    """
+
+    def __init__(self):
+        self.enabled = config.enabled
+        self.caches: dict[str, LruCache] = {}
+
+    def cache_for(self, assistant_name, settings) -> LruCache:
+        if not self.enabled or not settings:
+            return None
+        cache = self.caches.get(assistant_name)
+        if cache is None:
+            settings = settings if isinstance(settings, dict) else {}
+            cache = LruCache(
+                f"llm_{assistant_name}",
+                max_entries=int(settings.get("max_entries", config.max_entries)),
+                ttl=float(settings.get("ttl", config.ttl)),
+                disk_dir=config.disk_dir,
+            )
+            self.caches[assistant_name] = cache
+        return cache
+
+    @staticmethod
+    def key(messages: list[dict], llm: LLM, params: dict) -> str:
+        canonical = json.dumps(
+            {"messages": messages, "llm": llm.cache_identity(), "params": params},
+            ensure_ascii=False,
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def report(self):
+        return {name: cache.report() for name, cache in self.caches.items()}
@@ -0,0 +1,57 @@
+import functools
+import logging
+import re
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+ENCODING_NAME = "cl100k_base"
+# role/name framing the chat format adds around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+# low detail image cost
+IMAGE_TOKENS = 85
+
+_CJK = re.compile(r"[　-鿿가-힯＀-￯]")
+
+
+@functools.lru_cache(maxsize=None)
+def get_encoding():
+    """The tokenizer, loaded once per process; None when it cannot be loaded (e.g. offline)."""
+    try:
+        return tiktoken.get_encoding(ENCODING_NAME)
+    except Exception as e:
+        logger.error(f"Error occur when loading tiktoken {ENCODING_NAME}, estimating token counts : {e}")
+        return None
+
+
+def count_tokens(text) -> int:
+    if not text:
+        return 0
+    encoding = get_encoding()
+    if encoding is None:
+        # roughly one token per CJK character and per four other characters
+        cjk_chars = len(_CJK.findall(text))
+        return cjk_chars + (len(text) - cjk_chars + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def message_token_count(msg: dict) -> int:
+    content = msg.get("content")
+    if isinstance(content, list):
+        tokens = sum(
+            count_tokens(part.get("text", "")) if part.get("type") == "text" else IMAGE_TOKENS
+            for part in content
+        )
+    else:
+        tokens = count_tokens(content)
+    return tokens + count_tokens(msg.get("name")) + MESSAGE_OVERHEAD_TOKENS
+
+
+def cached_token_count(msg: dict) -> int:
+    """Token count stored on the message itself, so each message is encoded only once."""
+    token_count = msg.get("token_count")
+    if token_count is None:
+        token_count = message_token_count(msg)
+        msg["token_count"] = token_count
+    return token_count
@@ -1,3 +1,4 @@
+import copy
 from enum import Enum
 import logging
 
@@ -55,6 +56,22 @@ class PractiseProgress:
             self.current_practise = None
         return self.current_practise
     
+    def upcoming_practises(self, n):
+        """The next n practise items, without advancing the progress."""
+        if not self.sentences_list or self.current_status not in (PractiseStatus.WORD, PractiseStatus.SENTENCE):
+            return []
+        lookahead = copy.copy(self)
+        result = []
+        while len(result) < n:
+            try:
+                practise = lookahead.get_next_practise()
+            except IndexError:
+                break
+            if not practise:
+                break
+            result.append(practise)
+        return result
+
     def get_current_practise(self):
         return self.current_practise if self.current_practise else "无"
     
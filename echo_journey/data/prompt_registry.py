@@ -0,0 +1,68 @@
+import json
+import logging
+import os
+import threading
+import time
+import types
+
+import yaml
+
+from echo_journey.common.utils import Singleton
+from .assistant_content import AssistantContent
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+config = types.SimpleNamespace(
+    **{
+        # seconds between checks of a prompt file for edits
+        "reload_interval": float(os.getenv("PROMPT_RELOAD_INTERVAL", "5")),
+    }
+)
+
+LOADERS = {
+    "json": json.load,
+    "yaml": yaml.safe_load,
+}
+
+
+class PromptEntry:
+    def __init__(self, content: AssistantContent, mtime, checked_at):
+        self.content = content
+        self.mtime = mtime
+        self.checked_at = checked_at
+
+
+class PromptRegistry(Singleton):
+    """Assistant prompt files parsed once per process into shared AssistantContent.
+
+    A file is stat'ed at most every `reload_interval` seconds and re-parsed
+    only when its mtime changed, so opening a session normally touches
+    neither the disk nor the YAML parser.
+    """
+
+    def __init__(self, reload_interval=config.reload_interval):
+        self.reload_interval = reload_interval
+        self._entries: dict[tuple[str, str], PromptEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path, file_format="json") -> AssistantContent:
+        key = (os.path.abspath(path), file_format)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry.checked_at < self.reload_interval:
+            return entry.content
+        with self._lock:
+            entry = self._entries.get(key)
+            mtime = os.stat(key[0]).st_mtime
+            if entry is None or entry.mtime != mtime:
+                if entry is not None:
+                    logger.info(f"Reloaded prompt {path}")
+                with open(key[0], "r") as f:
+                    content = AssistantContent(content=LOADERS[file_format](f))
+                entry = PromptEntry(content, mtime, now)
+                self._entries[key] = entry
+            else:
+                entry.checked_at = now
+            return entry.content
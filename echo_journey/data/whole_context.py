@@ -1,39 +1,59 @@
 import copy
 import json
+import os
 import time
+import types
 
-import tiktoken
 import yaml
-from echo_journey.data.llms.llm import LLM, merge_deltas
+from echo_journey.data.llms import default_llm_config_name
+from echo_journey.data.llms.llm import LLM, DeltaAccumulator
 from echo_journey.data.llms.llm_utils import create_llm
+from echo_journey.data.llms.response_cache import LlmResponseCache
+from echo_journey.data.llms.tokens import cached_token_count, count_tokens
 from echo_journey.common.utils import (
     encode_image,
     encode_image_bytes,
 )
 from .assistant_meta import AssistantMeta
-from .assistant_content import AssistantContent
+from .prompt_registry import PromptRegistry
 import logging
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
 
 logger = logging.getLogger(__name__)
 
+config = types.SimpleNamespace(
+    **{
+        # split streamed tokens into single characters, for UIs that type the reply out
+        "pace_chars": os.getenv("LLM_STREAM_PACE_CHARS", "false").lower() == "true",
+        # default token budget of one request (system prompt, prefix messages and history); 0 disables
+        "max_prompt_tokens": int(os.getenv("LLM_MAX_PROMPT_TOKENS", "16000")),
+    }
+)
+
 class WholeContext():
     def __init__(self):
         self.cur_visible_assistant: AssistantMeta = None
         self.cur_chat_history: list[dict] = []
-        self.llm = create_llm("gpt4-ptu-online")
+        self.llm = create_llm(default_llm_config_name)
         
     @classmethod
     def generate_context_by_yaml(cls, path, name):
-        content = yaml.safe_load(open(path, "r"))
-        assistant = AssistantMeta(assistant_name=name, content=AssistantContent(content=content))
+        content = PromptRegistry.get_instance().get(path, "yaml")
+        assistant = AssistantMeta(assistant_name=name, content=content)
         return cls.build_from(assistant_meta=assistant)
     
     @classmethod
     def generate_context_by_json(cls, path, name):
-        content = json.load(open(path, "r"))
-        assistant = AssistantMeta(assistant_name=name, content=AssistantContent(content=content))
+        content = PromptRegistry.get_instance().get(path, "json")
+        assistant = AssistantMeta(assistant_name=name, content=content)
         return cls.build_from(assistant_meta=assistant)
 
+    def personalize(self, **overrides):
+        """Override prompt fields for this context only; the shared content is never modified."""
+        assistant = self.cur_visible_assistant
+        assistant.content = assistant.content.derive(**overrides)
+
     def add_user_msg_to_cur(self, user_msg_dict: dict):
         user_msg_dict["timestamp"] = round(time.time(), 3)
         if "raw_pic_paths" in user_msg_dict and user_msg_dict["raw_pic_paths"]:
@@ -61,10 +81,12 @@ class WholeContext():
                 },
             ]
         user_msg_dict["assistant_id"] = self.cur_visible_assistant.get_id()
+        cached_token_count(user_msg_dict)
         self.cur_chat_history.append(user_msg_dict)
 
     def add_assistant_msg_to_cur(self, assistant_msg_dict: dict):
         assistant_msg_dict["timestamp"] = round(time.time(), 3)
+        cached_token_count(assistant_msg_dict)
         self.cur_chat_history.append(assistant_msg_dict)
 
     def get_last_msg_of(self, role):
@@ -91,26 +113,42 @@ class WholeContext():
 
     def format_system_and_history(self):
         system_prompt = self.cur_visible_assistant.content.system_prompt
-        
-        prefix_messages = self.cur_visible_assistant.content.prefix_messages
-        prefix_messages_in_list = yaml.safe_load(prefix_messages)
-        prefix_messages_in_list = (
-            [] if not prefix_messages_in_list else prefix_messages_in_list
-        )
+        # parsed once with the content; shared, so only ever concatenated
+        prefix_messages_in_list = self.cur_visible_assistant.content.prefix_messages_in_list
         return system_prompt, prefix_messages_in_list
 
+    def trim_to_token_budget(self, chat_history: list[dict]):
+        """Drop the oldest rounds of `chat_history` until the request fits the assistant's token budget.
+
+        A round starts at a user message; the newest round is always kept.
+        """
+        content = self.cur_visible_assistant.content
+        budget = config.max_prompt_tokens if content.max_prompt_tokens is None else content.max_prompt_tokens
+        if not budget:
+            return chat_history
+        total = content.prompt_token_count() + sum(cached_token_count(msg) for msg in chat_history)
+        if total <= budget:
+            return chat_history
+        round_starts = [index for index, msg in enumerate(chat_history) if index == 0 or msg["role"] == "user"]
+        start = 0
+        for next_start in round_starts[1:]:
+            if total <= budget:
+                break
+            total -= sum(cached_token_count(msg) for msg in chat_history[start:next_start])
+            start = next_start
+        logger.info(
+            f"{self.cur_visible_assistant.assistant_name} history trimmed by {start} messages "
+            f"to {total} tokens (budget {budget})"
+        )
+        return chat_history[start:]
+
     def submittable_msgs_view(self):
         system_prompt, prefix_messages_in_list = self.format_system_and_history()
         if self.cur_visible_assistant.content.commit_last_n_rounds:
-            chat_history_with_prefix_msgs = (
-                self.user_visible_msgs_view_commit_last_n_rounds(
-                    prefix_messages_in_list
-                )
-            )
+            chat_history = self.user_visible_msgs_view_commit_last_n_rounds([])
         else:
-            chat_history_with_prefix_msgs = (
-                self.user_visible_msgs_view_commit_full_history(prefix_messages_in_list)
-            )
+            chat_history = self.user_visible_msgs_view_commit_full_history([])
+        chat_history_with_prefix_msgs = prefix_messages_in_list + self.trim_to_token_budget(chat_history)
 
         chat_history_with_prefix_and_system_msgs = [
             {
@@ -144,26 +182,30 @@ class WholeContext():
         cls,
         assistant_meta: AssistantMeta,
         chat_history: list[dict] = [],
-        llm: LLM = create_llm("gpt4-ptu-online"),
+        llm: LLM = None,
     ):
         result = WholeContext()
         result.cur_visible_assistant = assistant_meta
         result.cur_chat_history = copy.deepcopy(chat_history)
-        result.llm = llm
+        if llm:
+            result.llm = llm
         return result
 
     def postprocess_after_submit(self):
         pass
 
     def _validate_predix_messages(self):
-        try:
-            yaml.safe_load(self.cur_visible_assistant.content.prefix_messages)
-        except Exception as e:
+        if not self.cur_visible_assistant.content.prefix_messages_valid:
             raise yaml.YAMLError("prefix_messages parse error")
     
-    async def execute(self):
-        async for bot_res, _ in self.submit():
-            pass
+    async def execute(self, on_delta=None):
+        if on_delta is None:
+            # nobody consumes the stream, so skip it
+            bot_res = await self.complete()
+        else:
+            async for bot_res, delta in self.submit():
+                if delta.get("content"):
+                    on_delta(delta["content"])
         try:
             self.add_assistant_msg_to_cur(bot_res[0])
             return json.loads(bot_res[-1]["content"])
@@ -178,73 +220,121 @@ class WholeContext():
             yield bot_res, delta
         self.postprocess_after_submit()
         
-    async def _async_commit_to_llm(
-        self, assistant_meta: AssistantMeta, messages: list[dict]
-    ):
+    async def complete(self):
+        """The reply as one non-streamed request, for callers that only need the final message."""
+        self._validate_predix_messages()
+        submittable_msgs = self.submittable_msgs_view()
+        params = self._commit_params(self.cur_visible_assistant)
+        cache, cache_key = self._response_cache(submittable_msgs, params)
+        content = await self._cached_response(cache, cache_key)
+        if content is None:
+            content = await self.llm.acomplete(submittable_msgs, **params)
+            self._cache_response(cache, cache_key, content)
+        self.postprocess_after_submit()
+        return [
+            {
+                "role": "assistant",
+                "content": content,
+                "assistant_id": self.cur_visible_assistant.get_id(),
+            }
+        ]
+
+    def _commit_params(self, assistant_meta: AssistantMeta):
         temperature = 0
         if assistant_meta.assistant_name == "scene_generate_bot":
             print("scene_generate_bot")
             temperature = 0.5
+        return {"json_mode": assistant_meta.content.json_mode, "temperature": temperature}
+
+    def _response_cache(self, submittable_msgs, params):
+        """The assistant's response cache and the key of this request, or (None, None)."""
+        if params["temperature"] != 0:
+            return None, None
+        cache = LlmResponseCache.get_instance().cache_for(
+            self.cur_visible_assistant.assistant_name, self.cur_visible_assistant.content.response_cache
+        )
+        if cache is None:
+            return None, None
+        return cache, LlmResponseCache.key(submittable_msgs, self.llm, params)
+
+    async def _cached_response(self, cache, cache_key):
+        if cache is None:
+            return None
+        content = await cache.aget(cache_key)
+        logger.info(f"LLM cache stats: {cache.report()}")
+        return content
+
+    def _cache_response(self, cache, cache_key, content):
+        if cache is None or not content:
+            return
+        if self.cur_visible_assistant.content.json_mode:
+            try:
+                json.loads(content)
+            except Exception:
+                # a broken reply would otherwise fail the same way on every hit
+                return
+        cache.aput(cache_key, content)
+
+    async def _async_commit_to_llm(
+        self, assistant_meta: AssistantMeta, messages: list[dict]
+    ):
         async for delta, is_restart_commit in self.llm.acommit(
-            messages,
-            json_mode=assistant_meta.content.json_mode,
-            temperature = temperature,
+            messages, **self._commit_params(assistant_meta)
         ):
             yield delta, is_restart_commit
 
     def split_delta_in_chars(self, delta):
-        result = []
-        if delta.get("content", ""):
-            chars = list(delta["content"])
-            for char in chars:
-                new_delta_per_char = copy.deepcopy(delta)
-                new_delta_per_char["content"] = char
-                result.append(new_delta_per_char)
-        else:
-            result.append(delta)
-        return result
+        content = delta.get("content", "")
+        if not content or len(content) == 1:
+            return [delta]
+        return [{**delta, "content": char} for char in content]
 
-    async def bot_async(self, submittable_msgs: list[dict]):
-        merged_response = {}
+    async def bot_async(self, submittable_msgs: list[dict], pace_chars=config.pace_chars):
+        accumulator = DeltaAccumulator()
+        message = accumulator.view()
         assistant_res = []
 
+        cache, cache_key = self._response_cache(submittable_msgs, self._commit_params(self.cur_visible_assistant))
+        cached = await self._cached_response(cache, cache_key)
+        if cached is not None:
+            delta = {"role": "assistant", "content": cached}
+            yield [{"role": "assistant", "content": cached}], delta
+            yield [
+                {
+                    "role": "assistant",
+                    "content": cached,
+                    "assistant_id": self.cur_visible_assistant.get_id(),
+                }
+            ], {}
+            return
+
         async for delta_in_token, is_restart_commit in self._async_commit_to_llm(
             self.cur_visible_assistant, submittable_msgs
         ):
             if is_restart_commit:
-                merged_response = {}
+                accumulator = DeltaAccumulator()
+                message = accumulator.view()
                 continue
 
-            new_deltas_per_char = self.split_delta_in_chars(delta_in_token)
-            for delta in new_deltas_per_char:
-                merged_response = merge_deltas(merged_response, delta)
-                if (
-                    "content" in merged_response
-                    and "role" in merged_response
-                    and merged_response["role"] == "assistant"
-                ):
-                    yield assistant_res + [
-                        {
-                            "role": "assistant",
-                            "content": merged_response["content"],
-                        }
-                    ], delta
-
-        if "content" not in merged_response:
-            merged_response["content"] = ""
+            deltas = self.split_delta_in_chars(delta_in_token) if pace_chars else [delta_in_token]
+            for delta in deltas:
+                accumulator.add(delta)
+                if accumulator.has_content and accumulator.role == "assistant":
+                    # a live view, the content is only joined if someone reads it
+                    yield assistant_res + [message], delta
 
         assistant_res.append(
             {
                 "role": "assistant",
-                "content": merged_response["content"],
+                "content": accumulator.content,
                 "assistant_id": self.cur_visible_assistant.get_id(),
             }
         )
+        self._cache_response(cache, cache_key, accumulator.content)
         yield assistant_res, {}
 
     def get_token_count(self, text):
-        enc = tiktoken.get_encoding("cl100k_base")
-        return len(enc.encode(text))
+        return count_tokens(text)
 
     def get_id(self):
         return self.cur_visible_assistant.get_id()
@@ -253,6 +343,7 @@ class WholeContext():
         copied_instance = WholeContext()
         for key, value in vars(self).items():
             if key == "llm":
+                # clients are shared through the registry, never copied
                 copied_instance.llm = (
                     create_llm(self.llm.get_config_name()) if self.llm else None
                 )
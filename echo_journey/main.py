@@ -7,6 +7,8 @@ from fastapi.middleware.cors import CORSMiddleware
 import yaml
 from echo_journey.api.restful_routes import router as restful_router
 from echo_journey.api.websocket_routes import router as websocket_router
+from echo_journey.audio.transcode_pool import TranscodePool
+from echo_journey.common.http_client import PooledHttpClient
 from echo_journey.common.utils import ConnectionManager
 from dotenv import find_dotenv, load_dotenv
 
@@ -32,6 +34,19 @@ app.include_router(restful_router)
 app.include_router(websocket_router)
 
 ConnectionManager.initialize()
+
+
+@app.on_event("shutdown")
+async def close_http_pools():
+    await PooledHttpClient.close_all()
+
+
+@app.on_event("shutdown")
+def close_transcode_pool():
+    transcode_pool = TranscodePool.get_instance()
+    logger.info(f"Transcode pool stats: {transcode_pool.report()}")
+    transcode_pool.shutdown()
+
 # suppress deprecation warnings
 warnings.filterwarnings("ignore", module="whisper")
 
@@ -1,8 +1,11 @@
+import asyncio
 import logging
-from echo_journey.audio.text_to_speech.kanyun_tts import KanyunTTS
+from echo_journey.audio.text_to_speech.cached_tts import CachedTextToSpeech
+from echo_journey.audio.text_to_speech.factory import get_tts
 from echo_journey.common.utils import parse_pinyin
 from echo_journey.data.learn_situation import HistoryLearnSituation
 from echo_journey.data.whole_context import WholeContext
+from echo_journey.services.teacher_reply import TeacherReplyStream
 import os
 from dotenv import find_dotenv, load_dotenv
 from echo_journey.common.utils import device_id_var
@@ -18,7 +21,7 @@ class ExerciseBot():
         self.title_generate_context = WholeContext.generate_context_by_json(os.getenv("TitleBotPath"), "title_bot")
         self.personal_context()
         self.ws_msg_handler = ws_msg_handler
-        self.tts: KanyunTTS = KanyunTTS.get_instance()
+        self.tts: CachedTextToSpeech = get_tts()
         self.current_exercise = None
             
     def personal_context(self):
@@ -27,8 +30,10 @@ class ExerciseBot():
         unfamilier_initials_str = ",".join(unfamilier_initials_list) if unfamilier_initials_list else "无"
         unfamilier_finals_list = list(unfamilier_finals_and_initials["finals"].keys())
         unfamilier_finals_str = ",".join(unfamilier_finals_list) if unfamilier_finals_list else "无"
-        self.context.cur_visible_assistant.content.system_prompt = self.context.cur_visible_assistant.content.system_prompt.replace("""{initials}""", unfamilier_initials_str)
-        self.context.cur_visible_assistant.content.system_prompt = self.context.cur_visible_assistant.content.system_prompt.replace("""{finals}""", unfamilier_finals_str)
+        system_prompt = self.context.cur_visible_assistant.content.system_prompt
+        system_prompt = system_prompt.replace("""{initials}""", unfamilier_initials_str)
+        system_prompt = system_prompt.replace("""{finals}""", unfamilier_finals_str)
+        self.context.personalize(system_prompt=system_prompt)
         
     async def send_treating_msg(self, treating_msg, platform):
         self.context.add_user_msg_to_cur({"role": "assistant", "content": treating_msg})
@@ -41,10 +46,10 @@ class ExerciseBot():
         user_msg = self.context.cur_visible_assistant.content.user_prompt_prefix.format(**format_dict)
         return user_msg
     
-    async def generate_practise_reply(self, student_text):
+    async def generate_practise_reply(self, student_text, on_delta=None):
         user_msg = self.build_input_by(student_text)
         self.context.add_user_msg_to_cur({"role": "user", "content": user_msg})
-        teacher_info = await self.context.execute()
+        teacher_info = await self.context.execute(on_delta=on_delta)
         return teacher_info
     
     def add_suggestion_to_context(self, suggestions):
@@ -55,7 +60,16 @@ class ExerciseBot():
         self.context.add_assistant_msg_to_cur({"role": "assistant", "content": assistant_msg})
         
     async def send_practise_msg(self, student_text, platform):
-        teacher_info = await self.generate_practise_reply(student_text)
+        reply_stream = TeacherReplyStream.for_handler(self.tts, self.ws_msg_handler, platform)
+        try:
+            teacher_info = await self.generate_practise_reply(student_text, on_delta=reply_stream.on_delta if reply_stream else None)
+            if reply_stream:
+                await reply_stream.finish()
+        except BaseException:
+            if reply_stream:
+                reply_stream.cancel()
+            raise
+        message_id = reply_stream.message_id if reply_stream else None
         expected_practise = teacher_info.get("new_practise", None)
         if expected_practise:
             self.current_exercise = expected_practise
@@ -64,7 +78,8 @@ class ExerciseBot():
             except Exception as e:
                 logger.error(f"error: {e} expected_practise: {expected_practise}")
                 return 
-            audio_bytes = await self.tts.generate_audio(expected_practise, platform=platform)
-            await self.ws_msg_handler.send_tutor_message(text=teacher_info["teacher"], expected_messages=expected_messages, audio_bytes=audio_bytes)
+            output_format = self.ws_msg_handler.output_format(platform)
+            practise_audio_task = asyncio.create_task(self.tts.generate_speech(expected_practise, output_format=output_format))
+            await self.ws_msg_handler.send_tutor_message_with_speech(teacher_info["teacher"], expected_messages, practise_audio_task, audio_format=output_format, message_id=message_id)
         else:
-            await self.ws_msg_handler.send_tutor_message(text=teacher_info["teacher"])
\ No newline at end of file
+            await self.ws_msg_handler.send_tutor_message(text=teacher_info["teacher"], message_id=message_id)
\ No newline at end of file
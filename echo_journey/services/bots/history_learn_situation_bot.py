@@ -43,5 +43,7 @@ class HistoryLearnSituationBot():
             initials_str = "暂时未发现学生的声母错误"
         if not finals_str:
             finals_str = "暂时未发现学生的韵母错误"
-        self.context.cur_visible_assistant.content.system_prompt =  self.context.cur_visible_assistant.content.system_prompt.replace(r"""{initials}""", initials_str)   
-        self.context.cur_visible_assistant.content.system_prompt =  self.context.cur_visible_assistant.content.system_prompt.replace(r"""{finals}""", finals_str)  
\ No newline at end of file
+        system_prompt = self.context.cur_visible_assistant.content.system_prompt
+        system_prompt = system_prompt.replace(r"""{initials}""", initials_str)
+        system_prompt = system_prompt.replace(r"""{finals}""", finals_str)
+        self.context.personalize(system_prompt=system_prompt)  
\ No newline at end of file
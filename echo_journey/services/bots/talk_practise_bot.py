@@ -1,8 +1,12 @@
+import asyncio
 import logging
-from echo_journey.audio.text_to_speech.kanyun_tts import KanyunTTS
+from echo_journey.audio.text_to_speech.cached_tts import CachedTextToSpeech
+from echo_journey.audio.text_to_speech.factory import get_tts
 from echo_journey.common.utils import parse_pinyin
 from echo_journey.data.whole_context import WholeContext
 from echo_journey.data.practise_progress import PractiseProgress
+from echo_journey.services.practise_prefetcher import PractisePrefetcher
+from echo_journey.services.teacher_reply import TeacherReplyStream
 import os
 from dotenv import find_dotenv, load_dotenv
 _ = load_dotenv(find_dotenv())
@@ -15,7 +19,8 @@ class TalkPractiseBot():
         self.context = WholeContext.generate_context_by_json(os.getenv("TalkPractiseBotPath"), "talk_practise_bot")
         self.practise_progress: PractiseProgress = practise_progress
         self.ws_msg_handler = ws_msg_handler
-        self.tts: KanyunTTS = KanyunTTS.get_instance()
+        self.tts: CachedTextToSpeech = get_tts()
+        self.prefetcher = PractisePrefetcher(self.tts, self.practise_progress)
         
     async def send_treating_msg(self):
         import json
@@ -40,10 +45,10 @@ class TalkPractiseBot():
         user_msg = self.context.cur_visible_assistant.content.user_prompt_prefix.format(**format_dict)
         return user_msg
     
-    async def generate_practise_reply(self, student_status, student_text):
+    async def generate_practise_reply(self, student_status, student_text, on_delta=None):
         user_msg = self.build_input_by(student_status, student_text)
         self.context.add_user_msg_to_cur({"role": "user", "content": user_msg})
-        teacher_info = await self.context.execute()
+        teacher_info = await self.context.execute(on_delta=on_delta)
         return teacher_info
     
     def add_suggestion_to_context(self, suggestions):
@@ -54,15 +59,31 @@ class TalkPractiseBot():
         self.context.add_assistant_msg_to_cur({"role": "assistant", "content": assistant_msg})
         
     async def send_practise_msg(self, student_status, student_text, platform):
-        teacher_info = await self.generate_practise_reply(student_status, student_text)
         expected_practise = self.practise_progress.get_current_practise()
-        if expected_practise and expected_practise != "无":
+        has_practise = expected_practise and expected_practise != "无"
+        # the practise items are known before the reply, so synthesize them while the LLM runs
+        output_format = self.ws_msg_handler.output_format(platform)
+        self.prefetcher.prefetch(output_format)
+        practise_audio_task = asyncio.create_task(self.prefetcher.get_speech(expected_practise, output_format)) if has_practise else None
+        reply_stream = TeacherReplyStream.for_handler(self.tts, self.ws_msg_handler, platform)
+        try:
+            teacher_info = await self.generate_practise_reply(student_status, student_text, on_delta=reply_stream.on_delta if reply_stream else None)
+            if reply_stream:
+                await reply_stream.finish()
+        except BaseException:
+            if reply_stream:
+                reply_stream.cancel()
+            if practise_audio_task:
+                practise_audio_task.cancel()
+            raise
+        message_id = reply_stream.message_id if reply_stream else None
+        if has_practise:
             try:
                 expected_messages = parse_pinyin(expected_practise)
             except Exception as e:
                 logger.error(f"error: {e} expected_practise: {expected_practise}")
+                practise_audio_task.cancel()
                 return 
-            audio_bytes = await self.tts.generate_audio(expected_practise, platform=platform)
-            await self.ws_msg_handler.send_tutor_message(text=teacher_info["teacher"], expected_messages=expected_messages, audio_bytes=audio_bytes)
+            await self.ws_msg_handler.send_tutor_message_with_speech(teacher_info["teacher"], expected_messages, practise_audio_task, audio_format=output_format, message_id=message_id)
         else:
-            await self.ws_msg_handler.send_tutor_message(text=teacher_info["teacher"])
\ No newline at end of file
+            await self.ws_msg_handler.send_tutor_message(text=teacher_info["teacher"], message_id=message_id)
\ No newline at end of file
@@ -3,8 +3,9 @@ import json
 import logging
 from echo_journey.api.downward_protocol_handler import DownwardProtocolHandler
 from echo_journey.api.proto.downward_pb2 import WordCorrectMessage
-from echo_journey.api.proto.upward_pb2 import AudioMessage, StudentMessage
+from echo_journey.api.proto.upward_pb2 import AudioChunkMessage, AudioMessage, StudentMessage
 from echo_journey.audio.speech_to_text.asr import ASR
+from echo_journey.audio.streaming import StreamingUtterance
 from echo_journey.common.utils import parse_pinyin
 
 from echo_journey.services.bots.exercise_bot import ExerciseBot
@@ -18,6 +19,7 @@ class ExerciseService:
     def __init__(self, ws_msg_handler):
         self.ws_msg_handler: DownwardProtocolHandler = ws_msg_handler
         self.asr: ASR = ASR()
+        self.utterance: StreamingUtterance = None
         self.correct_bot = CorrectBot()
         self.exercise_bot = ExerciseBot(ws_msg_handler=self.ws_msg_handler)
         self.history_situation_bot = HistoryLearnSituationBot()
@@ -25,6 +27,14 @@ class ExerciseService:
     async def initialize(self, platform):
         treating_msg = await self.history_situation_bot.generate_treating_msg()
         await self.exercise_bot.send_treating_msg(treating_msg, platform)
+
+    def on_ws_disconnect(self):
+        self._cancel_utterance()
+
+    def _cancel_utterance(self):
+        if self.utterance:
+            self.utterance.cancel()
+            self.utterance = None
                         
     async def _on_message_at_practise(self, student_text, platform):
         await self.exercise_bot.send_practise_msg(student_text, platform)
@@ -45,8 +55,7 @@ class ExerciseService:
                     messages[i] = copy.deepcopy(expected_messages[i])
             return messages, expected_messages
             
-    async def _on_audio_at_practise(self, audio_message: AudioMessage, platform):
-        asr_result, pron_result = await self.asr.transcribe(audio_message.audio_data, platform, self.exercise_bot.current_exercise)
+    async def _on_audio_at_practise(self, asr_result, pron_result, platform):
         logger.info(f"asr_result: {asr_result}, pron_result: {pron_result}")
         if not asr_result:
             await self._on_asr_reg_error()
@@ -73,4 +82,31 @@ class ExerciseService:
             await self.exercise_bot.send_practise_msg(student_text=f"学生已经会读{passed_practise}了", platform=platform)
 
     async def process_audio_message(self, audio_message: AudioMessage, platform):
-        await self._on_audio_at_practise(audio_message, platform)
\ No newline at end of file
+        asr_result, pron_result = await self.asr.transcribe(audio_message.audio_data, platform, self.exercise_bot.current_exercise)
+        await self._on_audio_at_practise(asr_result, pron_result, platform)
+
+    async def process_audio_chunk(self, chunk_message: AudioChunkMessage, platform):
+        if self.utterance and chunk_message.sequence == 0:
+            logger.warning("new utterance started before the previous one ended, dropping it")
+            self._cancel_utterance()
+        elif self.utterance and chunk_message.sequence != self.utterance.next_sequence:
+            logger.warning(
+                f"audio chunk {chunk_message.sequence} arrived while expecting {self.utterance.next_sequence}, dropping the utterance"
+            )
+            self._cancel_utterance()
+            await self._on_asr_reg_error()
+            return
+        if not self.utterance:
+            if chunk_message.sequence != 0:
+                # rest of an utterance that was already dropped
+                return
+            self.utterance = self.asr.start_utterance(platform, expected_text=self.exercise_bot.current_exercise)
+        if not await self.asr.feed_utterance(self.utterance, chunk_message.audio_data):
+            self.utterance = None
+            await self._on_asr_reg_error()
+            return
+        if not chunk_message.end_of_utterance:
+            return
+        utterance, self.utterance = self.utterance, None
+        asr_result, pron_result = await self.asr.finish_utterance(utterance)
+        await self._on_audio_at_practise(asr_result, pron_result, platform)
\ No newline at end of file
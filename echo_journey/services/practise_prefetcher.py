@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import os
+import types
+
+from echo_journey.audio.text_to_speech.base import SynthesizedSpeech
+from echo_journey.data.practise_progress import PractiseProgress
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+config = types.SimpleNamespace(
+    **{
+        "depth": int(os.getenv("PRACTISE_PREFETCH_DEPTH", "2")),
+    }
+)
+
+
+class PractisePrefetcher:
+    """Synthesize the current and next practise items of one session ahead of time.
+
+    Renders are held per session as tasks keyed by text, so advancing to the
+    next word or sentence awaits audio that is already done (or in flight).
+    """
+
+    def __init__(self, tts, practise_progress: PractiseProgress, depth=config.depth):
+        self.tts = tts
+        self.practise_progress = practise_progress
+        self.depth = depth
+        self.output_format = None
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    def prefetch(self, output_format):
+        if output_format != self.output_format:
+            self.cancel()
+            self.output_format = output_format
+        current = self.practise_progress.current_practise
+        wanted = list(dict.fromkeys(([current] if current else []) + self.practise_progress.upcoming_practises(self.depth)))
+        for text in list(self.tasks):
+            if text not in wanted:
+                self.tasks.pop(text).cancel()
+        for text in wanted:
+            if text not in self.tasks:
+                self.tasks[text] = asyncio.create_task(self.tts.generate_speech(text, output_format=output_format))
+
+    async def get_speech(self, text, output_format) -> SynthesizedSpeech:
+        task = self.tasks.get(text) if output_format == self.output_format else None
+        if task is None or task.cancelled():
+            return await self.tts.generate_speech(text, output_format=output_format)
+        try:
+            return await task
+        except Exception as e:
+            logger.error(f"Error occur when PractisePrefetcher.get_speech {text} : {e}")
+            self.tasks.pop(text, None)
+            return await self.tts.generate_speech(text, output_format=output_format)
+
+    def cancel(self):
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
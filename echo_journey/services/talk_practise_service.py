@@ -3,8 +3,9 @@ import json
 import logging
 from echo_journey.api.downward_protocol_handler import DownwardProtocolHandler
 from echo_journey.api.proto.downward_pb2 import WordCorrectMessage
-from echo_journey.api.proto.upward_pb2 import AudioMessage, StudentMessage
+from echo_journey.api.proto.upward_pb2 import AudioChunkMessage, AudioMessage, StudentMessage
 from echo_journey.audio.speech_to_text.asr import ASR
+from echo_journey.audio.streaming import StreamingUtterance
 from echo_journey.common.utils import parse_pinyin
 from enum import Enum
 
@@ -25,6 +26,7 @@ class TalkPractiseService:
         self.scene_generate_bot = SceneGenerateBot()
         self.status = ClassStatus.NOTSTART
         self.asr: ASR = ASR()
+        self.utterance: StreamingUtterance = None
         self.practise_progress = PractiseProgress()
         self.correct_bot = CorrectBot(learn_situation=self.learn_situation, practise_progress=self.practise_progress)
         self.talk_practise_bot = TalkPractiseBot(practise_progress=self.practise_progress, ws_msg_handler=self.ws_msg_handler)
@@ -34,7 +36,17 @@ class TalkPractiseService:
         self.status = ClassStatus.SCENE_GEN
     
     def on_ws_disconnect(self):
-        pass
+        self._cancel_utterance()
+        self.talk_practise_bot.prefetcher.cancel()
+
+    def _reset_practise_progress(self):
+        self.practise_progress.reset()
+        self.talk_practise_bot.prefetcher.cancel()
+
+    def _cancel_utterance(self):
+        if self.utterance:
+            self.utterance.cancel()
+            self.utterance = None
 
     async def _on_message_at_scene_gen(self, student_text, platform):
         logger.info(f"student_text: {student_text}")
@@ -52,7 +64,7 @@ class TalkPractiseService:
         teacher_info = await self.talk_practise_bot.generate_practise_reply(student_status="练习中", student_text=student_text)
         if teacher_info.get("change_scene", False):
             self.status = ClassStatus.SCENE_GEN
-            self.practise_progress.reset()
+            self._reset_practise_progress()
             await self.talk_practise_bot.send_practise_msg(student_status="学生请求更换场景", student_text=student_text, platform=platform)
             return 
 
@@ -64,7 +76,7 @@ class TalkPractiseService:
             else:
                 await self.talk_practise_bot.send_end_class_msg()
                 self.status = ClassStatus.SCENE_GEN
-                self.practise_progress.reset()
+                self._reset_practise_progress()
         else:
             await self.ws_msg_handler.send_tutor_message(text=teacher_info["teacher"])
             
@@ -80,8 +92,7 @@ class TalkPractiseService:
     async def _on_asr_reg_error(self):
         await self.ws_msg_handler.send_tutor_message(text="对不起，我没有听清楚，请再说一遍")
     
-    async def _on_audio_at_scene_gen(self, audio_message: AudioMessage, platform):
-        asr_result, _ = await self.asr.transcribe(audio_message.audio_data, platform)
+    async def _on_audio_at_scene_gen(self, asr_result, platform):
         if not asr_result:
             await self._on_asr_reg_error()
         else:
@@ -96,8 +107,7 @@ class TalkPractiseService:
                     messages[i] = copy.deepcopy(expected_messages[i])
             return messages, expected_messages
             
-    async def _on_audio_at_practise(self, audio_message: AudioMessage, platform):
-        asr_result, pron_result = await self.asr.transcribe(audio_message.audio_data, platform, expected_text=self.practise_progress.get_current_practise(), status=self.practise_progress.current_status)
+    async def _on_audio_at_practise(self, asr_result, pron_result, platform):
         logger.info(f"asr_result: {asr_result}, pron_result: {pron_result}")
         if not asr_result:
             await self._on_asr_reg_error()
@@ -114,7 +124,7 @@ class TalkPractiseService:
         suggestions, score, change_scene, name_2_mp4_url = await self.correct_bot.get_correct_result(expected_messages, messages)
         if change_scene:
             self.status = ClassStatus.SCENE_GEN
-            self.practise_progress.reset()
+            self._reset_practise_progress()
             await self.talk_practise_bot.send_practise_msg(student_status="学生请求更换场景", student_text=asr_result, platform=platform)
             return
         if score <= self.correct_bot.success_score:
@@ -129,12 +139,49 @@ class TalkPractiseService:
             else:
                 await self.talk_practise_bot.send_end_class_msg()
                 self.status = ClassStatus.SCENE_GEN
-                self.practise_progress.reset()
+                self._reset_practise_progress()
 
-    async def process_audio_message(self, audio_message: AudioMessage, platform):
+    def _get_expected_for_audio(self):
+        if self.status == ClassStatus.ING:
+            return self.practise_progress.get_current_practise(), self.practise_progress.current_status
+        return None, None
+
+    async def _on_asr_result(self, asr_result, pron_result, platform):
         if self.status == ClassStatus.SCENE_GEN:
-            await self._on_audio_at_scene_gen(audio_message, platform)
+            await self._on_audio_at_scene_gen(asr_result, platform)
         elif self.status == ClassStatus.ING:
-            await self._on_audio_at_practise(audio_message, platform)
+            await self._on_audio_at_practise(asr_result, pron_result, platform)
         else:
-            raise ValueError(f"Unknown status: {self.status}")
\ No newline at end of file
+            raise ValueError(f"Unknown status: {self.status}")
+
+    async def process_audio_message(self, audio_message: AudioMessage, platform):
+        expected_text, status = self._get_expected_for_audio()
+        asr_result, pron_result = await self.asr.transcribe(audio_message.audio_data, platform, expected_text=expected_text, status=status)
+        await self._on_asr_result(asr_result, pron_result, platform)
+
+    async def process_audio_chunk(self, chunk_message: AudioChunkMessage, platform):
+        if self.utterance and chunk_message.sequence == 0:
+            logger.warning("new utterance started before the previous one ended, dropping it")
+            self._cancel_utterance()
+        elif self.utterance and chunk_message.sequence != self.utterance.next_sequence:
+            logger.warning(
+                f"audio chunk {chunk_message.sequence} arrived while expecting {self.utterance.next_sequence}, dropping the utterance"
+            )
+            self._cancel_utterance()
+            await self._on_asr_reg_error()
+            return
+        if not self.utterance:
+            if chunk_message.sequence != 0:
+                # rest of an utterance that was already dropped
+                return
+            expected_text, status = self._get_expected_for_audio()
+            self.utterance = self.asr.start_utterance(platform, expected_text=expected_text, status=status)
+        if not await self.asr.feed_utterance(self.utterance, chunk_message.audio_data):
+            self.utterance = None
+            await self._on_asr_reg_error()
+            return
+        if not chunk_message.end_of_utterance:
+            return
+        utterance, self.utterance = self.utterance, None
+        asr_result, pron_result = await self.asr.finish_utterance(utterance)
+        await self._on_asr_result(asr_result, pron_result, platform)
\ No newline at end of file
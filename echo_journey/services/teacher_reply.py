@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import uuid
+
+from echo_journey.data.llms.json_stream import JsonStringFieldStream
+from echo_journey.services.teacher_speech import TeacherSpeechPipeline
+
+logger = logging.getLogger(__name__)
+
+
+class TeacherReplyStream:
+    """Deliver the teacher field of one LLM reply while the rest of its JSON is generated.
+
+    `on_delta` is handed to WholeContext.execute. The reply is parsed once;
+    the decoded text is sent as TutorPartialTextMessages when the client asked
+    for streamText and spoken by a TeacherSpeechPipeline when it asked for
+    streamSpeech. Everything shares `message_id` with the final TutorMessage.
+    """
+
+    def __init__(self, tts, ws_msg_handler, platform="web", field="teacher"):
+        self.ws_msg_handler = ws_msg_handler
+        self.message_id = uuid.uuid4().hex
+        self.field_stream = JsonStringFieldStream(field)
+        self.speech = (
+            TeacherSpeechPipeline(tts, ws_msg_handler, platform, message_id=self.message_id)
+            if ws_msg_handler.stream_speech else None
+        )
+        self.index = 0
+        self.texts: asyncio.Queue = None
+        self.sender: asyncio.Task = None
+        if ws_msg_handler.stream_text:
+            self.texts = asyncio.Queue()
+            self.sender = asyncio.create_task(self._send_texts())
+
+    @classmethod
+    def for_handler(cls, tts, ws_msg_handler, platform="web"):
+        """A stream for this reply, or None when the client asked for neither text nor speech streaming."""
+        if ws_msg_handler.stream_text or ws_msg_handler.stream_speech:
+            return cls(tts, ws_msg_handler, platform)
+        return None
+
+    def on_delta(self, content):
+        text = self.field_stream.feed(content)
+        if not text:
+            return
+        if self.texts is not None:
+            self.texts.put_nowait(text)
+        if self.speech:
+            self.speech.on_text(text)
+
+    async def _send_texts(self):
+        finished = False
+        while not finished:
+            parts = [await self.texts.get()]
+            # whatever piled up while the last send was in flight goes out as one message
+            while not self.texts.empty():
+                parts.append(self.texts.get_nowait())
+            finished = parts[-1] is None
+            text = "".join(part for part in parts if part is not None)
+            if text:
+                await self.ws_msg_handler.send_tutor_partial_text_message(self.message_id, self.index, text)
+                self.index += 1
+        await self.ws_msg_handler.send_tutor_partial_text_message(self.message_id, self.index, "", is_last=True)
+
+    async def finish(self):
+        if self.sender:
+            self.texts.put_nowait(None)
+            await self.sender
+        if self.speech:
+            await self.speech.finish()
+
+    def cancel(self):
+        if self.sender:
+            self.sender.cancel()
+        if self.speech:
+            self.speech.cancel()
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import os
+import types
+import uuid
+
+from dotenv import find_dotenv, load_dotenv
+_ = load_dotenv(find_dotenv())
+
+logger = logging.getLogger(__name__)
+
+config = types.SimpleNamespace(
+    **{
+        "min_chars": int(os.getenv("TEACHER_SPEECH_MIN_CHARS", "4")),
+        "max_chars": int(os.getenv("TEACHER_SPEECH_MAX_CHARS", "40")),
+    }
+)
+
+SENTENCE_ENDINGS = set("。！？!?；;…\n")
+CLAUSE_ENDINGS = set("，,、：:")
+
+
+class SentenceChunker:
+    """Cut streamed text into sentences that are worth one TTS request each.
+
+    A chunk ends at sentence punctuation once it has `min_chars`; a run
+    without any is cut at the last clause punctuation after `max_chars`,
+    else at the last space, else right there.
+    """
+
+    def __init__(self, min_chars=config.min_chars, max_chars=config.max_chars):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, text) -> list[str]:
+        chunks = []
+        for char in text:
+            self._buffer += char
+            if char in SENTENCE_ENDINGS and len(self._buffer.strip()) >= self.min_chars:
+                chunks.append(self._take(len(self._buffer)))
+            elif len(self._buffer) >= self.max_chars:
+                cut = max((i for i, c in enumerate(self._buffer) if c in CLAUSE_ENDINGS), default=-1)
+                if cut < 0:
+                    # an unpunctuated run would otherwise wait for the whole reply
+                    cut = self._buffer.rfind(" ")
+                    if cut <= 0:
+                        cut = len(self._buffer) - 1
+                chunks.append(self._take(cut + 1))
+        return [chunk for chunk in chunks if chunk]
+
+    def flush(self) -> str:
+        return self._take(len(self._buffer))
+
+    def _take(self, size):
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk.strip()
+
+
+class TeacherSpeechPipeline:
+    """Speak the teacher text of one LLM reply sentence by sentence while it streams.
+
+    `on_text` receives the decoded teacher text as it grows; every completed
+    sentence is synthesized right away and sent as a TutorSpeechMessage in
+    order, then `finish` flushes the tail and sends an empty `is_last` segment.
+    """
+
+    def __init__(self, tts, ws_msg_handler, platform="web", message_id=None):
+        self.tts = tts
+        self.ws_msg_handler = ws_msg_handler
+        self.platform = platform
+        self.output_format = ws_msg_handler.output_format(platform)
+        self.message_id = message_id or uuid.uuid4().hex
+        self.chunker = SentenceChunker()
+        self.index = 0
+        self.segments: asyncio.Queue = asyncio.Queue()
+        self.sender = asyncio.create_task(self._send_segments())
+
+    def on_text(self, text):
+        for sentence in self.chunker.feed(text):
+            self._submit(sentence)
+
+    def _submit(self, sentence):
+        task = asyncio.create_task(self.tts.generate_audio(sentence, output_format=self.output_format))
+        self.segments.put_nowait((self.index, sentence, task))
+        self.index += 1
+
+    async def _send_segments(self):
+        while True:
+            segment = await self.segments.get()
+            if segment is None:
+                break
+            index, sentence, task = segment
+            try:
+                audio_bytes = await task
+            except Exception as e:
+                logger.error(f"Error occur when TeacherSpeechPipeline synthesize {sentence} : {e}")
+                audio_bytes = None
+            await self.ws_msg_handler.send_tutor_speech_message(
+                self.message_id, index, sentence, audio_bytes, audio_format=self.output_format
+            )
+        await self.ws_msg_handler.send_tutor_speech_message(self.message_id, self.index, "", None, is_last=True)
+
+    async def finish(self):
+        tail = self.chunker.flush()
+        if tail:
+            self._submit(tail)
+        self.segments.put_nowait(None)
+        await self.sender
+
+    def cancel(self):
+        self.sender.cancel()
+        while not self.segments.empty():
+            segment = self.segments.get_nowait()
+            if segment is not None:
+                segment[2].cancel()
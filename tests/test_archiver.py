@@ -0,0 +1,110 @@
+import asyncio
+import os
+import threading
+import wave
+
+import numpy as np
+import pytest
+
+from echo_journey.audio import archiver as archiver_module
+from echo_journey.audio.archiver import HASH_LENGTH, AsrArchiver
+from echo_journey.audio.pcm_audio import PcmAudio
+
+
+@pytest.fixture(autouse=True)
+def archive_config(monkeypatch):
+    monkeypatch.setattr(archiver_module.config, "enabled", True)
+    monkeypatch.setattr(archiver_module.config, "format", "wav")
+    monkeypatch.setattr(archiver_module.config, "queue_size", 64)
+    monkeypatch.setattr(archiver_module.config, "drop_on_overload", True)
+    monkeypatch.setattr(archiver_module.config, "max_bytes_per_dir", 200 * 1024 * 1024)
+
+
+def _audio(seed, samples=1600):
+    rng = np.random.default_rng(seed)
+    return PcmAudio(rng.integers(-3000, 3000, samples).astype("<i2").tobytes())
+
+
+def _submit(archiver, directory, name, audio):
+    submitted = asyncio.run(archiver.submit(str(directory), name, audio))
+    archiver.queue.join()
+    return submitted
+
+
+def _files(directory):
+    return sorted(os.listdir(directory))
+
+
+def test_write_behind_thread_writes_wav(tmp_path):
+    archiver = AsrArchiver()
+    audio = _audio(0)
+    assert _submit(archiver, tmp_path / "asr_data", "utterance", audio)
+    assert _files(tmp_path / "asr_data") == [f"utterance_{audio.digest()[:HASH_LENGTH]}.wav"]
+    with wave.open(str(tmp_path / "asr_data" / _files(tmp_path / "asr_data")[0])) as wav_file:
+        assert wav_file.getframerate() == audio.sample_rate
+        assert wav_file.readframes(wav_file.getnframes()) == audio.pcm
+    assert archiver.written == 1
+
+
+def test_dedups_by_hash_suffix(tmp_path):
+    archiver = AsrArchiver()
+    audio = _audio(0)
+    _submit(archiver, tmp_path, "first", audio)
+    _submit(archiver, tmp_path, "second", PcmAudio(audio.pcm))
+    _submit(archiver, tmp_path, "third", _audio(1))
+    assert len(_files(tmp_path)) == 2
+    assert archiver.duplicates == 1
+    # the hashes already on disk count too, e.g. after a restart
+    restarted = AsrArchiver()
+    _submit(restarted, tmp_path, "fourth", audio)
+    assert len(_files(tmp_path)) == 2
+    assert restarted.duplicates == 1
+
+
+def test_retention_evicts_oldest_files(tmp_path, monkeypatch):
+    archiver = AsrArchiver()
+    audios = [_audio(seed) for seed in range(3)]
+    _submit(archiver, tmp_path, "a", audios[0])
+    file_size = os.path.getsize(tmp_path / _files(tmp_path)[0])
+    monkeypatch.setattr(archiver_module.config, "max_bytes_per_dir", file_size * 2)
+    for name, audio in zip("bc", audios[1:]):
+        # mtimes are coarse on some filesystems, age the earlier files explicitly
+        for file_name in _files(tmp_path):
+            path = tmp_path / file_name
+            os.utime(path, (os.path.getmtime(path) - 10, os.path.getmtime(path) - 10))
+        _submit(archiver, tmp_path, name, audio)
+    assert [file_name.split("_")[0] for file_name in _files(tmp_path)] == ["b", "c"]
+    assert archiver.evicted == 1
+    # the evicted recording is no longer a duplicate
+    _submit(archiver, tmp_path, "a", audios[0])
+    assert archiver.duplicates == 0
+    assert [file_name.split("_")[0] for file_name in _files(tmp_path)] == ["a", "c"]
+
+
+def test_full_queue_drops_recordings(tmp_path, monkeypatch):
+    monkeypatch.setattr(archiver_module.config, "queue_size", 1)
+    archiver = AsrArchiver()
+    writing, release = threading.Event(), threading.Event()
+
+    def blocked_write(job):
+        writing.set()
+        release.wait(timeout=5)
+
+    archiver._write = blocked_write
+
+    async def run():
+        first = await archiver.submit(str(tmp_path), "a", _audio(0))
+        assert writing.wait(timeout=5)
+        return first, await archiver.submit(str(tmp_path), "b", _audio(1)), await archiver.submit(str(tmp_path), "c", _audio(2))
+
+    assert asyncio.run(run()) == (True, True, False)
+    assert archiver.dropped == 1
+    release.set()
+    archiver.queue.join()
+
+
+def test_disabled_archiver_skips_submit(tmp_path, monkeypatch):
+    monkeypatch.setattr(archiver_module.config, "enabled", False)
+    archiver = AsrArchiver()
+    assert not _submit(archiver, tmp_path, "a", _audio(0))
+    assert _files(tmp_path) == []
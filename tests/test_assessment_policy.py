@@ -0,0 +1,38 @@
+import pytest
+
+from echo_journey.audio.pronunciation_assessment import policy as policy_module
+from echo_journey.audio.pronunciation_assessment.policy import (
+    SKIP_ASR_FAILURE,
+    SKIP_EXACT_MATCH,
+    AssessmentPolicy,
+)
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    monkeypatch.setattr(policy_module.config, "skip_on_asr_failure", True)
+    monkeypatch.setattr(policy_module.config, "skip_on_exact_match", True)
+    return AssessmentPolicy()
+
+
+def test_skip_on_exact_match(policy):
+    assert policy.skip_reason("你好。", "你好") == SKIP_EXACT_MATCH
+    assert policy.skip_reason("你号", "你好") is None
+
+
+def test_skip_on_asr_failure(policy):
+    assert policy.skip_reason(None, "你好") == SKIP_ASR_FAILURE
+    assert policy.skip_reason("", "你好") == SKIP_ASR_FAILURE
+
+
+def test_failed_asr_is_assessed_when_not_skipped(policy, monkeypatch):
+    monkeypatch.setattr(policy_module.config, "skip_on_asr_failure", False)
+    monkeypatch.setattr(policy_module, "parse_pinyin", lambda text: pytest.fail("compared a missing text"))
+    assert policy.skip_reason(None, "你好") is None
+    assert policy.skip_reason("", "你好") is None
+
+
+def test_free_talk_without_expected_text(policy, monkeypatch):
+    monkeypatch.setattr(policy_module, "parse_pinyin", lambda text: pytest.fail("compared a missing text"))
+    assert policy.skip_reason("你好", None) is None
+    assert policy.report()["assessed"] == 1
@@ -0,0 +1,161 @@
+import asyncio
+import types
+
+import pytest
+
+from echo_journey.api.proto.upward_pb2 import AudioChunkMessage
+from echo_journey.audio.streaming import PcmRingBuffer
+from echo_journey.data.class_status import ClassStatus
+from echo_journey.services import exercise_service, talk_practise_service
+
+
+class FakeUtterance:
+    def __init__(self, expected_text=None, status=None):
+        self.expected_text = expected_text
+        self.status = status
+        self.next_sequence = 0
+        self.chunks = []
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakeAsr:
+    """Stands in for ASR: a chunk b"bad" fails to decode, the transcript is the joined chunks."""
+
+    def __init__(self):
+        self.utterances = []
+
+    def start_utterance(self, platform="web", expected_text=None, status=None):
+        utterance = FakeUtterance(expected_text, status)
+        self.utterances.append(utterance)
+        return utterance
+
+    async def feed_utterance(self, utterance, data):
+        if utterance is None:
+            return False
+        if data == b"bad":
+            utterance.cancel()
+            return False
+        utterance.next_sequence += 1
+        utterance.chunks.append(data)
+        return True
+
+    async def finish_utterance(self, utterance):
+        return b"".join(utterance.chunks).decode(), None
+
+
+class FakeHandler:
+    def __init__(self):
+        self.tutor_texts = []
+
+    async def send_tutor_message(self, text, **kwargs):
+        self.tutor_texts.append(text)
+
+
+def _fake_bot(*args, **kwargs):
+    return types.SimpleNamespace(prefetcher=types.SimpleNamespace(cancel=lambda: None), current_exercise="你好")
+
+
+def _build_talk_service(monkeypatch):
+    for name in ("LearnSituation", "SceneGenerateBot", "CorrectBot", "TalkPractiseBot"):
+        monkeypatch.setattr(talk_practise_service, name, _fake_bot)
+    monkeypatch.setattr(talk_practise_service, "ASR", FakeAsr)
+    service = talk_practise_service.TalkPractiseService(FakeHandler())
+    service.status = ClassStatus.SCENE_GEN
+    service.results = []
+
+    async def on_asr_result(asr_result, pron_result, platform):
+        service.results.append(asr_result)
+
+    service._on_asr_result = on_asr_result
+    return service
+
+
+def _build_exercise_service(monkeypatch):
+    for name in ("ExerciseBot", "CorrectBot", "HistoryLearnSituationBot"):
+        monkeypatch.setattr(exercise_service, name, _fake_bot)
+    monkeypatch.setattr(exercise_service, "ASR", FakeAsr)
+    service = exercise_service.ExerciseService(FakeHandler())
+    service.results = []
+
+    async def on_audio_at_practise(asr_result, pron_result, platform):
+        service.results.append(asr_result)
+
+    service._on_audio_at_practise = on_audio_at_practise
+    return service
+
+
+BUILDERS = [_build_talk_service, _build_exercise_service]
+
+
+def _chunk(sequence, data, end=False):
+    return AudioChunkMessage(sequence=sequence, audio_data=data, end_of_utterance=end)
+
+
+def _send(service, chunks):
+    async def run():
+        for chunk in chunks:
+            await service.process_audio_chunk(chunk, "web")
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("build", BUILDERS)
+def test_chunks_in_order_make_one_utterance(monkeypatch, build):
+    service = build(monkeypatch)
+    _send(service, [_chunk(0, b"a"), _chunk(1, b"b"), _chunk(2, b"c", end=True)])
+    assert service.results == ["abc"]
+    assert len(service.asr.utterances) == 1
+    assert service.utterance is None
+    assert service.ws_msg_handler.tutor_texts == []
+
+
+@pytest.mark.parametrize("build", BUILDERS)
+def test_consecutive_utterances(monkeypatch, build):
+    service = build(monkeypatch)
+    _send(service, [_chunk(0, b"a"), _chunk(1, b"b", end=True), _chunk(0, b"c", end=True)])
+    assert service.results == ["ab", "c"]
+
+
+@pytest.mark.parametrize("build", BUILDERS)
+def test_sequence_gap_drops_utterance(monkeypatch, build):
+    service = build(monkeypatch)
+    _send(service, [_chunk(0, b"a"), _chunk(2, b"c"), _chunk(3, b"d", end=True), _chunk(0, b"e", end=True)])
+    assert service.asr.utterances[0].cancelled
+    assert len(service.ws_msg_handler.tutor_texts) == 1
+    # the rest of the broken utterance is ignored, the next one starts clean
+    assert service.results == ["e"]
+
+
+@pytest.mark.parametrize("build", BUILDERS)
+def test_restart_drops_unfinished_utterance(monkeypatch, build):
+    service = build(monkeypatch)
+    _send(service, [_chunk(0, b"a"), _chunk(1, b"b"), _chunk(0, b"c", end=True)])
+    assert service.asr.utterances[0].cancelled
+    assert service.results == ["c"]
+    assert service.ws_msg_handler.tutor_texts == []
+
+
+@pytest.mark.parametrize("build", BUILDERS)
+def test_undecodable_chunk_asks_again(monkeypatch, build):
+    service = build(monkeypatch)
+    _send(service, [_chunk(0, b"a"), _chunk(1, b"bad"), _chunk(2, b"c", end=True)])
+    assert service.results == []
+    assert service.utterance is None
+    assert len(service.ws_msg_handler.tutor_texts) == 1
+
+
+def test_ring_buffer_flags_overflow(caplog):
+    ring_buffer = PcmRingBuffer(capacity=8)
+    ring_buffer.write(b"0123")
+    ring_buffer.write(b"4567")
+    assert not ring_buffer.overflowed
+    ring_buffer.write(b"89")
+    ring_buffer.write(b"ab")
+    assert ring_buffer.overflowed
+    assert ring_buffer.snapshot() == b"456789ab"
+    assert len([record for record in caplog.records if "overflowed" in record.getMessage()]) == 1
+    ring_buffer.reset()
+    assert not ring_buffer.overflowed
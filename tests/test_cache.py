@@ -0,0 +1,194 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from echo_journey.common import cache as cache_module
+from echo_journey.common.cache import LruCache, SingleFlight
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(cache_module.time, "time", fake_clock)
+    return fake_clock
+
+
+def test_lru_cache_ttl(clock):
+    cache = LruCache("ttl", ttl=10)
+    cache.put("a", 1)
+    clock.now += 5
+    assert cache.get("a") == 1
+    clock.now += 6
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LruCache("entries", max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_lru_cache_evicts_by_bytes():
+    cache = LruCache("bytes", max_bytes=10, sizeof=len)
+    cache.put("a", b"x" * 6)
+    cache.put("b", b"x" * 6)
+    assert cache.get("a") is None
+    assert cache.get("b") == b"x" * 6
+    assert cache.report()["bytes"] == 6
+    # a single entry above the budget is still kept
+    cache.put("c", b"x" * 20)
+    assert cache.get("c") == b"x" * 20
+    assert len(cache) == 1
+
+
+def test_lru_cache_promotes_disk_hits(tmp_path):
+    LruCache("disk", disk_dir=str(tmp_path)).put("a", {"text": "你好"})
+    cache = LruCache("disk", disk_dir=str(tmp_path))
+    assert len(cache) == 0
+    assert cache.get("a") == {"text": "你好"}
+    assert len(cache) == 1
+    assert cache.stats.disk_hits == 1
+    assert cache.get("a") == {"text": "你好"}
+    assert cache.stats.disk_hits == 1
+
+
+def test_lru_cache_promoted_entry_keeps_file_age(tmp_path, clock):
+    LruCache("stale", ttl=10, disk_dir=str(tmp_path)).put("a", 1)
+    cache = LruCache("stale", ttl=10, disk_dir=str(tmp_path))
+    path = cache._disk_path("a")
+    os.utime(path, (clock.now - 8, clock.now - 8))
+    assert cache.get("a") == 1
+    clock.now += 3
+    assert cache.get("a") is None
+    assert not os.path.exists(path)
+
+
+def test_lru_cache_async_disk_tier(tmp_path):
+    async def run():
+        writer = LruCache("async", disk_dir=str(tmp_path))
+        writer.aput("a", b"audio")
+        assert await writer.aget("a") == b"audio"
+        await writer.flush()
+        reader = LruCache("async", disk_dir=str(tmp_path))
+        assert await reader.aget("a") == b"audio"
+        assert await reader.aget("missing", "default") == "default"
+        return reader.stats
+
+    stats = asyncio.run(run())
+    assert stats.disk_hits == 1
+    assert stats.misses == 1
+
+
+def _wait_for_disk_eviction(cache):
+    if cache._eviction_thread is not None:
+        cache._eviction_thread.join(timeout=5)
+
+
+def _disk_files(cache):
+    return sorted(file_name for file_name in os.listdir(cache.disk_dir) if file_name.endswith(".pkl"))
+
+
+def test_lru_cache_disk_budget_evicts_least_recently_read(tmp_path):
+    cache = LruCache("budget", disk_dir=str(tmp_path), disk_max_bytes=3000, disk_rescan_interval=3600)
+    for key in ("a", "b", "c"):
+        cache.put(key, b"x" * 900)
+    entry_size = cache.report()["disk_bytes"] // 3
+    cache.clear()
+    assert cache.get("a") == b"x" * 900
+    cache.put("d", b"x" * 900)
+    _wait_for_disk_eviction(cache)
+    cache.clear()
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.report()["disk_bytes"] == entry_size * len(_disk_files(cache))
+    assert cache.report()["disk_bytes"] <= 3000 * 0.9
+
+
+def test_lru_cache_disk_budget_tolerates_missing_files(tmp_path):
+    cache = LruCache("missing", disk_dir=str(tmp_path), disk_max_bytes=2000, disk_rescan_interval=3600)
+    cache.put("a", b"x" * 900)
+    cache.put("b", b"x" * 900)
+    os.remove(cache._disk_path("a"))
+    cache.put("c", b"x" * 900)
+    _wait_for_disk_eviction(cache)
+    assert not os.path.exists(cache._disk_path("b"))
+    assert os.path.exists(cache._disk_path("c"))
+    assert cache.report()["disk_bytes"] == os.path.getsize(cache._disk_path("c"))
+
+
+def test_lru_cache_disk_budget_sees_other_processes(tmp_path):
+    other = LruCache("shared", disk_dir=str(tmp_path))
+    cache = LruCache("shared", disk_dir=str(tmp_path), disk_max_bytes=2500, disk_rescan_interval=0)
+    other.put("a", b"x" * 900)
+    other.put("b", b"x" * 900)
+    cache.put("c", b"x" * 900)
+    _wait_for_disk_eviction(cache)
+    assert _disk_files(cache) == sorted(
+        os.path.basename(cache._disk_path(key)) for key in ("b", "c")
+    )
+
+
+def test_single_flight_collapses_concurrent_calls():
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(*[flight.run("key", factory) for _ in range(5)])
+        assert len(flight) == 0
+        return results
+
+    assert asyncio.run(run()) == ["result"] * 5
+    assert len(calls) == 1
+
+
+def test_single_flight_shares_exceptions():
+    async def factory():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        flight = SingleFlight()
+        return await asyncio.gather(*[flight.run("key", factory) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_single_flight_survives_cancelled_waiter():
+    async def factory():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def run():
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.run("key", factory))
+        second = asyncio.ensure_future(flight.run("key", factory))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(run()) == ("result", True)
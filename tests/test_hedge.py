@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from echo_journey.audio.speech_to_text import hedge as hedge_module
+from echo_journey.audio.speech_to_text.asr import ASR
+from echo_journey.audio.speech_to_text.hedge import AsrHedge
+
+HEDGE_DELAY = 0.05
+
+
+class FakeBackend:
+    """Answers `result` (or raises `error`) `latency` seconds after transcribe is called."""
+
+    def __init__(self, result=None, latency=0, error=None):
+        self.result = result
+        self.latency = latency
+        self.error = error
+        self.started_at = None
+        self.cancelled = False
+
+    async def transcribe(self, audio):
+        self.started_at = asyncio.get_running_loop().time()
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return self.result
+
+
+class Primary(FakeBackend):
+    pass
+
+
+class Backup(FakeBackend):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def hedge_config(monkeypatch):
+    monkeypatch.setattr(hedge_module.config, "default_delay", HEDGE_DELAY)
+    monkeypatch.setattr(hedge_module.config, "min_samples", 1000)
+
+
+def _build_asr(primary, backup):
+    asr = ASR.__new__(ASR)
+    asr.asr = primary
+    asr.asr_back = backup
+    asr.hedge = AsrHedge()
+    asr.hedge.enabled = True
+    return asr
+
+
+def _run(asr):
+    async def run():
+        start = asyncio.get_running_loop().time()
+        return await asr.do_asr(None), start
+
+    return asyncio.run(run())
+
+
+def test_fast_primary_is_not_hedged():
+    primary, backup = Primary("你好", latency=0.01), Backup("再见")
+    asr = _build_asr(primary, backup)
+    assert _run(asr)[0] == "你好"
+    assert backup.started_at is None
+    assert asr.hedge.hedges == 0
+    assert asr.hedge.report()["backends"] == {"Primary": {"wins": 1, "losses": 0, "errors": 0}}
+
+
+def test_backup_waits_for_hedge_delay():
+    primary, backup = Primary("你好", latency=1), Backup("再见", latency=0.01)
+    asr = _build_asr(primary, backup)
+    _, start = _run(asr)
+    assert backup.started_at - start >= HEDGE_DELAY * 0.9
+    assert asr.hedge.hedges == 1
+
+
+def test_first_result_wins_and_loser_is_cancelled():
+    primary, backup = Primary("你好", latency=1), Backup("再见", latency=0.01)
+    asr = _build_asr(primary, backup)
+    assert _run(asr)[0] == "再见"
+    assert primary.cancelled
+    assert asr.hedge.report()["backends"] == {
+        "Primary": {"wins": 0, "losses": 1, "errors": 0},
+        "Backup": {"wins": 1, "losses": 0, "errors": 0},
+    }
+
+
+def test_slow_primary_can_still_win_after_hedging():
+    primary, backup = Primary("你好", latency=HEDGE_DELAY + 0.02), Backup("再见", latency=1)
+    asr = _build_asr(primary, backup)
+    assert _run(asr)[0] == "你好"
+    assert backup.started_at is not None
+    assert backup.cancelled
+    assert asr.hedge.backend("Backup").losses == 1
+
+
+def test_primary_error_falls_through_to_backup():
+    primary, backup = Primary(error=RuntimeError("boom")), Backup("再见", latency=0.01)
+    asr = _build_asr(primary, backup)
+    result, start = _run(asr)
+    assert result == "再见"
+    # a failed primary hedges at once rather than after the delay
+    assert backup.started_at - start < HEDGE_DELAY
+    assert asr.hedge.backend("Primary").errors == 1
+    assert asr.hedge.backend("Backup").wins == 1
+
+
+def test_invalid_primary_result_falls_through_to_backup():
+    primary, backup = Primary(""), Backup("再见")
+    asr = _build_asr(primary, backup)
+    assert _run(asr)[0] == "再见"
+    assert asr.hedge.backend("Primary").losses == 1
+
+
+def test_both_backends_fail():
+    primary, backup = Primary(error=RuntimeError("boom")), Backup(error=RuntimeError("boom"))
+    asr = _build_asr(primary, backup)
+    assert _run(asr)[0] is None
+    assert asr.hedge.backend("Primary").errors == 1
+    assert asr.hedge.backend("Backup").errors == 1
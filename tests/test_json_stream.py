@@ -0,0 +1,79 @@
+import json
+
+from echo_journey.data.llms.json_stream import JsonFieldStream, JsonStringFieldStream
+
+REPLY = json.dumps(
+    {
+        "teacher_note": "not this one",
+        "scene": {"teacher": "nested, ignored", "words": ["a", "b\"c"]},
+        "teacher": "你好 \"同学\"\\n 😀 tab\there é / done",
+        "skip": False,
+        "new_practise": ["你好", "再见"],
+        "empty": "",
+    },
+    ensure_ascii=True,
+)
+
+
+def _feed_all(stream, chunks):
+    output = {}
+    for chunk in chunks:
+        for field, text in stream.feed(chunk).items():
+            output[field] = output.get(field, "") + text
+    return output
+
+
+def test_json_field_stream_whole_reply():
+    stream = JsonFieldStream(["teacher", "empty"])
+    output = _feed_all(stream, [REPLY])
+    assert output == {"teacher": json.loads(REPLY)["teacher"]}
+    assert stream.done_fields == {"teacher", "empty"}
+    assert stream.complete
+
+
+def test_json_field_stream_char_by_char():
+    stream = JsonStringFieldStream("teacher")
+    assert "".join(stream.feed(char) for char in REPLY) == json.loads(REPLY)["teacher"]
+    assert stream.done
+    assert stream.complete
+
+
+def test_json_field_stream_every_two_way_split():
+    # escapes, \u escapes and surrogate pairs split across tokens at every position
+    expected = json.loads(REPLY)["teacher"]
+    for index in range(len(REPLY) + 1):
+        stream = JsonStringFieldStream("teacher")
+        text = stream.feed(REPLY[:index]) + stream.feed(REPLY[index:])
+        assert text == expected, index
+
+
+def test_json_field_stream_surrogate_pair_split_between_escapes():
+    stream = JsonStringFieldStream("teacher")
+    chunks = ['{"teacher": "a', "\\ud8", "3d", "\\u", "de00", 'b"}']
+    assert [stream.feed(chunk) for chunk in chunks] == ["a", "", "", "", "😀", "b"]
+
+
+def test_json_field_stream_key_split_and_prefix():
+    stream = JsonStringFieldStream("teacher")
+    chunks = ['{"teach', 'er_x": "no", "tea', 'cher"', " :", ' "yes', '"}']
+    assert "".join(stream.feed(chunk) for chunk in chunks) == "yes"
+
+
+def test_json_field_stream_first_value_wins():
+    stream = JsonStringFieldStream("teacher")
+    assert stream.feed('{"teacher": "one", "teacher": "two"}') == "one"
+
+
+def test_json_field_stream_ignores_non_string_values():
+    stream = JsonFieldStream(["skip", "teacher"])
+    output = _feed_all(stream, ['{"skip": true, "teacher": {"text": "x"}}'])
+    assert output == {}
+    assert stream.done_fields == set()
+    assert stream.complete
+
+
+def test_json_field_stream_incomplete_reply():
+    stream = JsonStringFieldStream("teacher")
+    assert stream.feed('{"teacher": "half a sen') == "half a sen"
+    assert not stream.done
+    assert not stream.complete
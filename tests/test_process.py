@@ -6,10 +6,16 @@ from echo_journey.api.proto.downward_message_wrapper import (
     unwrap_downward_message_from_bytes,
 )
 
-from echo_journey.api.proto.downward_pb2 import SentenceCorrectMessage, TutorMessage
+from echo_journey.api.proto.downward_pb2 import (
+    SentenceCorrectMessage,
+    TutorAudioMessage,
+    TutorMessage,
+    TutorPartialTextMessage,
+    TutorSpeechMessage,
+)
 from echo_journey.api.proto.upward_message_wrapper import wrap_upward_message
 
-from echo_journey.api.proto.upward_pb2 import AudioMessage, StudentMessage
+from echo_journey.api.proto.upward_pb2 import AudioChunkMessage, AudioMessage, StudentMessage
 from echo_journey.main import app
 from pydub import AudioSegment
 import io
@@ -22,6 +28,21 @@ def convert_wav_file_to_pcm_bytes(audio_file_path):
     webm_data = webm_io.getvalue()
     return webm_data
 
+def receive_practise_message(websocket, student_text="去喝咖啡", max_turns=3):
+    """Talk until the tutor starts a practise, the only reply that carries synthesized audio."""
+    for _ in range(max_turns):
+        student_text_message = StudentMessage()
+        student_text_message.text = student_text
+        websocket.send_bytes(
+            wrap_upward_message(student_text_message).SerializeToString()
+        )
+        response_data_bytes = websocket.receive_bytes()
+        downward_message = unwrap_downward_message_from_bytes(response_data_bytes)
+        assert isinstance(downward_message, TutorMessage)
+        if downward_message.expected_messages:
+            return downward_message
+    raise AssertionError(f"no practise started after {max_turns} student messages")
+
 def test_websocket():
     client = TestClient(app)  # app is fastapi instance
     fake_session_id = "fake_session_id"
@@ -56,4 +77,139 @@ def test_websocket():
 
         response_data_bytes = websocket.receive_bytes()
         downward_message = unwrap_downward_message_from_bytes(response_data_bytes)
-        assert isinstance(downward_message, TutorMessage)
\ No newline at end of file
+        assert isinstance(downward_message, TutorMessage)
+
+def test_websocket_audio_chunks():
+    client = TestClient(app)  # app is fastapi instance
+    fake_session_id = "fake_session_id"
+    with client.websocket_connect(
+        f"/ws/talk/{fake_session_id}"
+    ) as websocket:
+        response_data_bytes = websocket.receive_bytes()
+        downward_message = unwrap_downward_message_from_bytes(response_data_bytes)
+        assert isinstance(downward_message, TutorMessage)
+
+        audio_data = convert_wav_file_to_pcm_bytes("tests/data/test.wav")
+        chunk_size = 4096
+        offsets = list(range(0, len(audio_data), chunk_size))
+        for sequence, offset in enumerate(offsets):
+            chunk_message = AudioChunkMessage()
+            chunk_message.audio_data = audio_data[offset:offset + chunk_size]
+            chunk_message.sequence = sequence
+            chunk_message.end_of_utterance = sequence == len(offsets) - 1
+            websocket.send_bytes(
+                wrap_upward_message(chunk_message).SerializeToString()
+            )
+
+        response_data_bytes = websocket.receive_bytes()
+        downward_message = unwrap_downward_message_from_bytes(response_data_bytes)
+        assert isinstance(downward_message, TutorMessage)
+
+def test_websocket_stream_speech():
+    client = TestClient(app)  # app is fastapi instance
+    fake_session_id = "fake_session_id"
+    with client.websocket_connect(
+        f"/ws/talk/{fake_session_id}?streamSpeech=true"
+    ) as websocket:
+        response_data_bytes = websocket.receive_bytes()
+        downward_message = unwrap_downward_message_from_bytes(response_data_bytes)
+        assert isinstance(downward_message, TutorMessage)
+
+        student_text_message = StudentMessage()  # send student message
+        student_text_message.text = "去喝咖啡"
+        websocket.send_bytes(
+            wrap_upward_message(student_text_message).SerializeToString()
+        )
+
+        indexes = []
+        while True:
+            response_data_bytes = websocket.receive_bytes()
+            downward_message = unwrap_downward_message_from_bytes(response_data_bytes)
+            assert isinstance(downward_message, TutorSpeechMessage)
+            indexes.append(downward_message.index)
+            if downward_message.is_last:
+                break
+        assert indexes == list(range(len(indexes)))
+
+        response_data_bytes = websocket.receive_bytes()
+        downward_message = unwrap_downward_message_from_bytes(response_data_bytes)
+        assert isinstance(downward_message, TutorMessage)
+
+def test_websocket_opus_audio():
+    client = TestClient(app)  # app is fastapi instance
+    fake_session_id = "fake_session_id"
+    with client.websocket_connect(
+        f"/ws/talk/{fake_session_id}?opusBitrate=20"
+    ) as websocket:
+        response_data_bytes = websocket.receive_bytes()
+        downward_message = unwrap_downward_message_from_bytes(response_data_bytes)
+        assert isinstance(downward_message, TutorMessage)
+
+        downward_message = receive_practise_message(websocket)
+        assert downward_message.audio
+        # 20 kbps is snapped down to the 16 kbps step
+        assert downward_message.audio_format == "opus-16k"
+        assert downward_message.audio.startswith(b"OggS")
+        assert b"OpusHead" in downward_message.audio[:64]
+
+def test_websocket_text_first():
+    client = TestClient(app)  # app is fastapi instance
+    fake_session_id = "fake_session_id"
+    with client.websocket_connect(
+        f"/ws/talk/{fake_session_id}?textFirst=true"
+    ) as websocket:
+        response_data_bytes = websocket.receive_bytes()
+        downward_message = unwrap_downward_message_from_bytes(response_data_bytes)
+        assert isinstance(downward_message, TutorMessage)
+
+        downward_message = receive_practise_message(websocket)
+        assert downward_message.audio_pending
+        assert downward_message.message_id
+        assert not downward_message.audio
+
+        # the audio follows the text, after it and never before
+        chunk_indexes = []
+        audio_bytes = b""
+        while True:
+            response_data_bytes = websocket.receive_bytes()
+            audio_message = unwrap_downward_message_from_bytes(response_data_bytes)
+            assert isinstance(audio_message, TutorAudioMessage)
+            assert audio_message.message_id == downward_message.message_id
+            chunk_indexes.append(audio_message.chunk_index)
+            audio_bytes += audio_message.audio
+            if audio_message.is_last:
+                break
+        assert chunk_indexes == list(range(len(chunk_indexes)))
+        assert audio_bytes
+
+def test_websocket_stream_text():
+    client = TestClient(app)  # app is fastapi instance
+    fake_session_id = "fake_session_id"
+    with client.websocket_connect(
+        f"/ws/talk/{fake_session_id}?streamText=true"
+    ) as websocket:
+        response_data_bytes = websocket.receive_bytes()
+        downward_message = unwrap_downward_message_from_bytes(response_data_bytes)
+        assert isinstance(downward_message, TutorMessage)
+
+        student_text_message = StudentMessage()  # send student message
+        student_text_message.text = "去喝咖啡"
+        websocket.send_bytes(
+            wrap_upward_message(student_text_message).SerializeToString()
+        )
+
+        streamed_text = ""
+        while True:
+            response_data_bytes = websocket.receive_bytes()
+            downward_message = unwrap_downward_message_from_bytes(response_data_bytes)
+            assert isinstance(downward_message, TutorPartialTextMessage)
+            streamed_text += downward_message.text
+            message_id = downward_message.message_id
+            if downward_message.is_last:
+                break
+
+        response_data_bytes = websocket.receive_bytes()
+        downward_message = unwrap_downward_message_from_bytes(response_data_bytes)
+        assert isinstance(downward_message, TutorMessage)
+        assert downward_message.message_id == message_id
+        assert downward_message.text == streamed_text
@@ -0,0 +1,26 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from echo_journey.api.restful_routes import router
+from echo_journey.audio.text_to_speech.huoshan_tts import HuoshanTTS
+
+
+def test_stats_reports_counters():
+    app = FastAPI()
+    app.include_router(router)
+    stats = TestClient(app).get("/stats").json()
+    assert set(stats["asr_cache"]) == {"asr", "pronunciation"}
+    assert "hit_rate" in stats["asr_cache"]["asr"]
+    assert "hedges" in stats["asr_hedge"]
+    assert "assessed" in stats["assessment_policy"]
+    assert isinstance(stats["tts"], dict)
+    assert "max_queued" in stats["transcode_pool"]
+    assert isinstance(stats["llm_cache"], dict)
+
+
+def test_stats_reports_used_tts_providers():
+    app = FastAPI()
+    app.include_router(router)
+    HuoshanTTS.get_instance()
+    tts_stats = TestClient(app).get("/stats").json()["tts"]
+    assert set(tts_stats["huoshan"]) == {"speech", "audio"}
@@ -0,0 +1,84 @@
+import asyncio
+
+from echo_journey.services.teacher_reply import TeacherReplyStream
+
+
+class FakeHandler:
+    def __init__(self, stream_text=True, stream_speech=False, send_delay=0):
+        self.stream_text = stream_text
+        self.stream_speech = stream_speech
+        self.send_delay = send_delay
+        self.sent = []
+
+    async def send_tutor_partial_text_message(self, message_id, index, text, is_last=False):
+        if self.send_delay:
+            await asyncio.sleep(self.send_delay)
+        self.sent.append((message_id, index, text, is_last))
+
+
+def test_for_handler_without_streaming():
+    assert TeacherReplyStream.for_handler(None, FakeHandler(stream_text=False)) is None
+
+
+def test_teacher_reply_stream_coalesces_pending_texts():
+    handler = FakeHandler()
+
+    async def run():
+        reply = TeacherReplyStream(None, handler)
+        for chunk in ['{"teach', 'er": "你', "好", '，同学', '"', ', "skip": false}']:
+            reply.on_delta(chunk)
+        await reply.finish()
+        return reply.message_id
+
+    message_id = asyncio.run(run())
+    assert handler.sent == [
+        (message_id, 0, "你好，同学", False),
+        (message_id, 1, "", True),
+    ]
+
+
+def test_teacher_reply_stream_coalesces_while_sending():
+    handler = FakeHandler(send_delay=0.01)
+
+    async def run():
+        reply = TeacherReplyStream(None, handler)
+        reply.on_delta('{"teacher": "a')
+        await asyncio.sleep(0.005)
+        # the first send is still in flight, these go out together
+        reply.on_delta("b")
+        reply.on_delta("c")
+        await reply.finish()
+
+    asyncio.run(run())
+    assert [(index, text, is_last) for _, index, text, is_last in handler.sent] == [
+        (0, "a", False),
+        (1, "bc", False),
+        (2, "", True),
+    ]
+
+
+def test_teacher_reply_stream_without_teacher_text():
+    handler = FakeHandler()
+
+    async def run():
+        reply = TeacherReplyStream(None, handler)
+        reply.on_delta('{"skip": true}')
+        await reply.finish()
+
+    asyncio.run(run())
+    assert [(index, text, is_last) for _, index, text, is_last in handler.sent] == [(0, "", True)]
+
+
+def test_teacher_reply_stream_cancel():
+    handler = FakeHandler(send_delay=0.01)
+
+    async def run():
+        reply = TeacherReplyStream(None, handler)
+        reply.on_delta('{"teacher": "a')
+        await asyncio.sleep(0)
+        reply.cancel()
+        await asyncio.sleep(0.02)
+        return reply.sender.cancelled()
+
+    assert asyncio.run(run())
+    assert all(not is_last for *_, is_last in handler.sent)
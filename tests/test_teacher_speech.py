@@ -0,0 +1,60 @@
+from echo_journey.services.teacher_speech import SentenceChunker
+
+
+def _feed_all(chunker, chunks):
+    sentences = []
+    for chunk in chunks:
+        sentences.extend(chunker.feed(chunk))
+    return sentences
+
+
+def test_chinese_punctuation():
+    chunker = SentenceChunker(min_chars=4, max_chars=40)
+    sentences = _feed_all(chunker, ["你好同学。今天", "我们练习点咖啡！你想", "喝什么？"])
+    assert sentences == ["你好同学。", "今天我们练习点咖啡！", "你想喝什么？"]
+    assert chunker.flush() == ""
+
+
+def test_ascii_punctuation():
+    chunker = SentenceChunker(min_chars=4, max_chars=40)
+    sentences = _feed_all(chunker, ["Hello there! How are", " you? Fine; thanks.\n"])
+    # a full stop may be an abbreviation, only the newline ends the last sentence
+    assert sentences == ["Hello there!", "How are you?", "Fine;", "thanks."]
+    assert chunker.flush() == ""
+
+
+def test_short_sentence_waits_for_min_chars():
+    chunker = SentenceChunker(min_chars=4, max_chars=40)
+    assert chunker.feed("好。") == []
+    assert chunker.feed("我们开始吧。") == ["好。我们开始吧。"]
+
+
+def test_trailing_fragment_flushed_at_end_of_stream():
+    chunker = SentenceChunker(min_chars=4, max_chars=40)
+    assert chunker.feed("请跟我读：你好") == []
+    assert chunker.flush() == "请跟我读：你好"
+    assert chunker.flush() == ""
+
+
+def test_long_sentence_cut_at_clause_punctuation():
+    chunker = SentenceChunker(min_chars=4, max_chars=10)
+    sentences = chunker.feed("我们先去咖啡店，然后再去书店买书")
+    assert sentences == ["我们先去咖啡店，"]
+    assert chunker.flush() == "然后再去书店买书"
+
+
+def test_long_sentence_without_punctuation():
+    chunker = SentenceChunker(min_chars=4, max_chars=10)
+    text = "我们今天一起练习在咖啡店里点一杯热拿铁"
+    sentences = chunker.feed(text)
+    assert sentences == [text[:10]]
+    assert all(len(sentence) <= 10 for sentence in sentences)
+    assert "".join(sentences) + chunker.flush() == text
+
+
+def test_long_ascii_sentence_cut_at_space():
+    chunker = SentenceChunker(min_chars=4, max_chars=16)
+    sentences = chunker.feed("let us order a hot latte at the cafe")
+    # a word that may still be growing is never split
+    assert sentences == ["let us order a", "hot latte at"]
+    assert chunker.flush() == "the cafe"
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from echo_journey.audio import vad as vad_module
+from echo_journey.audio.pcm_audio import SAMPLE_RATE, PcmAudio
+from echo_journey.audio.vad import trim_silence
+
+FRAME = SAMPLE_RATE * 30 // 1000
+PADDING_FRAMES = 200 // 30
+
+
+@pytest.fixture(autouse=True)
+def vad_config(monkeypatch):
+    monkeypatch.setattr(vad_module.config, "enabled", True)
+    monkeypatch.setattr(vad_module.config, "frame_ms", 30)
+    monkeypatch.setattr(vad_module.config, "energy_threshold_dbfs", -45)
+    monkeypatch.setattr(vad_module.config, "relative_threshold_db", 30)
+    monkeypatch.setattr(vad_module.config, "min_speech_ms", 150)
+    monkeypatch.setattr(vad_module.config, "padding_ms", 200)
+
+
+def _silence(frames, amplitude=0):
+    rng = np.random.default_rng(0)
+    return rng.integers(-amplitude, amplitude + 1, frames * FRAME) if amplitude else np.zeros(frames * FRAME)
+
+
+def _tone(frames, amplitude=10000):
+    return amplitude * np.sin(2 * np.pi * 440 * np.arange(frames * FRAME) / SAMPLE_RATE)
+
+
+def _audio(*parts):
+    return PcmAudio(np.concatenate(parts).astype("<i2").tobytes())
+
+
+def test_trims_leading_and_trailing_silence_with_padding():
+    audio = _audio(_silence(30, amplitude=20), _tone(20), _silence(30, amplitude=20))
+    trimmed = trim_silence(audio)
+    start, end = (30 - PADDING_FRAMES) * FRAME, (50 + PADDING_FRAMES) * FRAME
+    assert trimmed.pcm == audio.pcm[start * 2:end * 2]
+    assert trimmed.duration == pytest.approx((20 + 2 * PADDING_FRAMES) * 0.03)
+
+
+def test_padding_is_clamped_to_the_clip():
+    audio = _audio(_silence(2), _tone(20), _silence(2))
+    assert trim_silence(audio) is audio
+
+
+def test_keeps_partial_frame_tail_after_speech():
+    audio = _audio(_silence(30), _tone(20), _tone(1)[:FRAME // 2])
+    trimmed = trim_silence(audio)
+    assert trimmed.pcm == audio.pcm[(30 - PADDING_FRAMES) * FRAME * 2:]
+
+
+def test_all_silence_is_dropped():
+    assert trim_silence(_audio(_silence(50))) is None
+    # background hiss below the absolute floor is not speech either
+    assert trim_silence(_audio(_silence(50, amplitude=100))) is None
+
+
+def test_minimum_speech_duration():
+    # 150 ms is five 30 ms frames
+    assert trim_silence(_audio(_silence(30), _tone(4), _silence(30))) is None
+    trimmed = trim_silence(_audio(_silence(30), _tone(5), _silence(30)))
+    assert trimmed.duration == pytest.approx((5 + 2 * PADDING_FRAMES) * 0.03)
+
+
+def test_shorter_than_one_frame_is_dropped():
+    assert trim_silence(_audio(_tone(1)[:FRAME - 1])) is None
+
+
+def test_disabled_returns_audio_untouched(monkeypatch):
+    monkeypatch.setattr(vad_module.config, "enabled", False)
+    audio = _audio(_silence(50))
+    assert trim_silence(audio) is audio
@@ -0,0 +1,105 @@
+import pytest
+
+from echo_journey.data import whole_context as whole_context_module
+from echo_journey.data.assistant_content import AssistantContent
+from echo_journey.data.assistant_meta import AssistantMeta
+from echo_journey.data.llms.tokens import cached_token_count
+from echo_journey.data.whole_context import WholeContext
+
+
+@pytest.fixture
+def build_context(monkeypatch):
+    # trimming never talks to the model
+    monkeypatch.setattr(whole_context_module, "create_llm", lambda config_name: None)
+
+    def build(chat_history, max_prompt_tokens=None, prefix_messages="[]"):
+        content = AssistantContent(
+            {"system_prompt": "system", "prefix_messages": prefix_messages, "max_prompt_tokens": max_prompt_tokens}
+        )
+        return WholeContext.build_from(AssistantMeta(assistant_name="test", content=content), chat_history)
+
+    return build
+
+
+def _history(rounds, first_role="user"):
+    second_role = "assistant" if first_role == "user" else "user"
+    history = []
+    for index in range(rounds):
+        history.append({"role": first_role, "content": f"{first_role} {index} " * 10})
+        history.append({"role": second_role, "content": f"{second_role} {index} " * 10})
+    return history
+
+
+def _contents(messages):
+    return [msg["content"] for msg in messages]
+
+
+def _tokens(context, messages):
+    return context.cur_visible_assistant.content.prompt_token_count() + sum(
+        cached_token_count(msg) for msg in messages
+    )
+
+
+def test_trim_keeps_history_within_budget(build_context):
+    history = _history(5)
+    context = build_context(history)
+    budget = _tokens(context, history[4:])
+    context = build_context(history, max_prompt_tokens=budget)
+    assert _contents(context.trim_to_token_budget(context.cur_chat_history)) == _contents(history[4:])
+
+
+def test_trim_cuts_at_round_boundaries(build_context):
+    history = _history(5)
+    context = build_context(history)
+    # one token short of the last three rounds: a whole round goes, never half of one
+    budget = _tokens(context, history[4:]) - 1
+    context = build_context(history, max_prompt_tokens=budget)
+    trimmed = context.trim_to_token_budget(context.cur_chat_history)
+    assert _contents(trimmed) == _contents(history[6:])
+    assert trimmed[0]["role"] == "user"
+
+
+def test_trim_keeps_newest_round_over_budget(build_context):
+    history = _history(3)
+    context = build_context(history, max_prompt_tokens=1)
+    assert _contents(context.trim_to_token_budget(context.cur_chat_history)) == _contents(history[4:])
+
+
+def test_trim_disabled_with_zero_budget(build_context):
+    history = _history(50)
+    context = build_context(history, max_prompt_tokens=0)
+    assert _contents(context.trim_to_token_budget(context.cur_chat_history)) == _contents(history)
+
+
+def test_trim_uses_env_default(build_context, monkeypatch):
+    history = _history(3)
+    monkeypatch.setattr(whole_context_module.config, "max_prompt_tokens", 1)
+    context = build_context(history)
+    assert _contents(context.trim_to_token_budget(context.cur_chat_history)) == _contents(history[4:])
+    monkeypatch.setattr(whole_context_module.config, "max_prompt_tokens", 0)
+    assert _contents(context.trim_to_token_budget(context.cur_chat_history)) == _contents(history)
+
+
+def test_trim_history_starting_with_assistant(build_context):
+    history = _history(3, first_role="assistant")
+    context = build_context(history)
+    # the leading assistant message is a round of its own
+    budget = _tokens(context, history[1:])
+    context = build_context(history, max_prompt_tokens=budget)
+    assert _contents(context.trim_to_token_budget(context.cur_chat_history)) == _contents(history[1:])
+    context = build_context(history, max_prompt_tokens=1)
+    assert _contents(context.trim_to_token_budget(context.cur_chat_history)) == _contents(history[5:])
+
+
+def test_submittable_msgs_keep_system_and_prefix(build_context):
+    history = _history(5)
+    prefix_messages = "- role: user\n  content: example\n- role: assistant\n  content: answer\n"
+    context = build_context(history, max_prompt_tokens=1, prefix_messages=prefix_messages)
+    msgs = context.submittable_msgs_view()
+    # the prefix is never trimmed, even when it alone is over budget
+    assert msgs[:3] == [
+        {"role": "system", "content": "system"},
+        {"role": "user", "content": "example"},
+        {"role": "assistant", "content": "answer"},
+    ]
+    assert msgs[3:] == [{"role": msg["role"], "content": msg["content"]} for msg in history[8:]]